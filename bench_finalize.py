@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Finalize Benchmark
+Times finalize_lead end to end (save the lead, move its session photos,
+read the lead back and queue the admin lead card, in one transaction) for
+1, 10 and 50 photos, with two photo transfers:
+
+- row-by-row: the old transfer (SELECT, one INSERT per photo, DELETE,
+  then re-reading the lead's photos)
+- set-based: the current move_session_photos_to_lead
+
+Runs against a throwaway database:
+    BOT_TOKEN=x python bench_finalize.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+from unittest.mock import patch
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import models
+from database.models import init_db, get_db_connection
+
+ROUNDS = 200
+WARMUP = 20
+PHOTO_COUNTS = (1, 10, 50)
+
+
+def legacy_move(user_id, session_id, lead_id):
+    """The pre-set-based implementation, kept here as the baseline"""
+    models.flush_session_photos()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT file_id FROM car_photos WHERE user_id = ? AND session_id = ? ORDER BY created_at",
+            (user_id, session_id)
+        )
+        for (file_id,) in cursor.fetchall():
+            cursor.execute("INSERT INTO photos (lead_id, file_id) VALUES (?, ?)", (lead_id, file_id))
+        cursor.execute("DELETE FROM car_photos WHERE user_id = ? AND session_id = ?", (user_id, session_id))
+    return models.get_lead_photos(lead_id)
+
+
+USER_DATA = {
+    'plate_number': 'BENCH',
+    'owner_name': 'Bench',
+    'curb_weight': 1000,
+    'language': 'en',
+    'phone_number': '+37255500000',
+}
+
+
+def run(move, photo_count):
+    timings = []
+    with patch.object(models, "move_session_photos_to_lead", move):
+        for _ in range(WARMUP + ROUNDS):
+            session_id = uuid.uuid4().hex
+            for i in range(photo_count):
+                models.save_session_photo(1, session_id, f"bench_{i}")
+            models.flush_session_photos()
+
+            started = time.perf_counter()
+            lead, photos = models.finalize_lead(dict(USER_DATA), 1, "bench", session_id)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert len(photos) == photo_count
+            models.delete_lead_by_id(lead["id"])
+    timings = sorted(timings[WARMUP:])
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)]
+
+
+def main():
+    init_db()
+    print(f"finalize_lead latency, {ROUNDS} rounds per row")
+    print(f"{'photos':>6} | {'row-by-row p50/p95 (ms)':>24} | {'set-based p50/p95 (ms)':>23} | speedup")
+    print("-" * 72)
+    for count in PHOTO_COUNTS:
+        old_p50, old_p95 = run(legacy_move, count)
+        new_p50, new_p95 = run(models.move_session_photos_to_lead, count)
+        print(
+            f"{count:>6} | {old_p50:>11.3f} / {old_p95:<10.3f} | {new_p50:>10.3f} / {new_p95:<10.3f} | "
+            f"{old_p50 / new_p50:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Webhook vs Polling Benchmark
+Runs a python-telegram-bot Application against a local fake Bot API server
+and compares, for polling and webhook ingestion:
+
+- end-to-end latency: update handed to the bot -> reply received by the server
+- webhook acknowledgement time (HTTP 200 to the fake Telegram)
+- CPU time of the bot process per update
+
+The fake server runs in a child process so its CPU is not counted. Each
+update is sent after the previous reply arrived (closed loop), to a trivial
+echo handler, so the numbers reflect ingestion overhead only.
+
+    python bench_webhook.py
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+TOKEN = "123456:bench"
+SECRET = "bench-secret"
+UPDATES = 300
+WARMUP = 20
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _decode(value: bytes):
+    text = value.decode()
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+# Fake Bot API server (child process)
+
+def run_fake_server(port: int) -> None:
+    asyncio.run(_serve(port))
+
+
+async def _serve(port: int) -> None:
+    import tornado.web
+    from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+
+    client = AsyncHTTPClient()
+    queue = asyncio.Queue()
+    state = {"webhook": None, "secret": None, "next_id": 0}
+    replies = {}
+
+    def make_update(update_id: int) -> dict:
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": 1000 + update_id % 50, "type": "private"},
+                "from": {"id": 1000 + update_id % 50, "is_bot": False, "first_name": "Bench"},
+                "text": f"ping {update_id}",
+            },
+        }
+
+    async def post_webhook(update: dict, secret: str) -> float:
+        started = time.perf_counter()
+        await client.fetch(HTTPRequest(
+            state["webhook"],
+            method="POST",
+            body=json.dumps(update),
+            headers={"Content-Type": "application/json", "X-Telegram-Bot-Api-Secret-Token": secret},
+        ))
+        return (time.perf_counter() - started) * 1000
+
+    async def api(method: str, params: dict):
+        if method == "getMe":
+            return {"id": 123456, "is_bot": True, "first_name": "Bench", "username": "bench_bot"}
+        if method == "setWebhook":
+            state["webhook"], state["secret"] = params["url"], params.get("secret_token")
+            return True
+        if method == "deleteWebhook":
+            state["webhook"] = None
+            return True
+        if method == "getUpdates":
+            updates = []
+            try:
+                updates.append(await asyncio.wait_for(queue.get(), float(params.get("timeout") or 0)))
+            except asyncio.TimeoutError:
+                pass
+            while not queue.empty():
+                updates.append(queue.get_nowait())
+            return updates
+        if method == "sendMessage":
+            update_id = int(str(params["text"]).split()[-1])
+            future = replies.pop(update_id, None)
+            if future is not None and not future.done():
+                future.set_result(time.perf_counter())
+            return {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": int(params["chat_id"]), "type": "private"},
+                "text": str(params["text"]),
+            }
+        return True
+
+    class BotApiHandler(tornado.web.RequestHandler):
+        async def post(self, method):
+            if self.request.headers.get("Content-Type", "").startswith("application/json"):
+                params = json.loads(self.request.body or b"{}")
+            else:
+                params = {key: _decode(values[0]) for key, values in self.request.body_arguments.items()}
+            self.write({"ok": True, "result": await api(method, params)})
+
+    class RunHandler(tornado.web.RequestHandler):
+        async def post(self):
+            mode = self.get_argument("mode")
+            count = int(self.get_argument("n"))
+            latencies, acks = [], []
+            for _ in range(count):
+                state["next_id"] += 1
+                update_id = state["next_id"]
+                future = asyncio.get_running_loop().create_future()
+                replies[update_id] = future
+                started = time.perf_counter()
+                if mode == "webhook":
+                    acks.append(await post_webhook(make_update(update_id), state["secret"]))
+                else:
+                    queue.put_nowait(make_update(update_id))
+                done = await asyncio.wait_for(future, 10)
+                latencies.append((done - started) * 1000)
+            self.write({"latencies": latencies, "acks": acks})
+
+    class SecretCheckHandler(tornado.web.RequestHandler):
+        async def post(self):
+            state["next_id"] += 1
+            try:
+                await post_webhook(make_update(state["next_id"]), "wrong-secret")
+                self.write({"status": 200})
+            except HTTPClientError as exc:
+                self.write({"status": exc.code})
+
+    app = tornado.web.Application([
+        (r"/bot[^/]+/(\w+)", BotApiHandler),
+        (r"/control/run", RunHandler),
+        (r"/control/wrong_secret", SecretCheckHandler),
+    ])
+    app.listen(port, address="127.0.0.1")
+    await asyncio.Event().wait()
+
+
+# Bot side (this process)
+
+async def bench(mode: str, server_port: int) -> dict:
+    import httpx
+    from telegram import Update
+    from telegram.ext import Application, ContextTypes, MessageHandler, filters
+
+    from handlers.updates import ChatOrderedUpdateProcessor
+
+    async def echo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.message.reply_text(f"pong {update.update_id}")
+
+    application = (
+        Application.builder()
+        .token(TOKEN)
+        .base_url(f"http://127.0.0.1:{server_port}/bot")
+        .concurrent_updates(ChatOrderedUpdateProcessor(16, 256))
+        .build()
+    )
+    application.add_handler(MessageHandler(filters.TEXT, echo))
+
+    await application.initialize()
+    if mode == "webhook":
+        port = _free_port()
+        await application.updater.start_webhook(
+            listen="127.0.0.1",
+            port=port,
+            url_path="telegram",
+            secret_token=SECRET,
+            webhook_url=f"http://127.0.0.1:{port}/telegram",
+        )
+    else:
+        await application.updater.start_polling(poll_interval=0, timeout=10)
+    await application.start()
+
+    control = f"http://127.0.0.1:{server_port}/control"
+    async with httpx.AsyncClient(timeout=120) as client:
+        await client.post(f"{control}/run", params={"mode": mode, "n": WARMUP})
+        cpu_started = time.process_time()
+        result = (await client.post(f"{control}/run", params={"mode": mode, "n": UPDATES})).json()
+        result["cpu_ms"] = (time.process_time() - cpu_started) * 1000 / UPDATES
+        if mode == "webhook":
+            result["wrong_secret_status"] = (await client.post(f"{control}/wrong_secret")).json()["status"]
+
+    await application.updater.stop()
+    await application.stop()
+    await application.shutdown()
+    return result
+
+
+def _wait_for_port(port: int, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("fake Bot API server did not start")
+
+
+def main():
+    server_port = _free_port()
+    server = multiprocessing.get_context("spawn").Process(target=run_fake_server, args=(server_port,), daemon=True)
+    server.start()
+    try:
+        _wait_for_port(server_port)
+        print(f"{UPDATES} updates per mode, closed loop, echo handler")
+        print(f"{'mode':>8} | {'p50 (ms)':>8} | {'p95 (ms)':>8} | {'ack p50 (ms)':>12} | CPU/update (ms)")
+        print("-" * 64)
+        for mode in ("polling", "webhook"):
+            result = asyncio.run(bench(mode, server_port))
+            latencies = result["latencies"]
+            ack = f"{_percentile(result['acks'], 0.5):.2f}" if result["acks"] else "-"
+            print(
+                f"{mode:>8} | {_percentile(latencies, 0.5):>8.2f} | {_percentile(latencies, 0.95):>8.2f} | "
+                f"{ack:>12} | {result['cpu_ms']:.2f}"
+            )
+            if mode == "webhook":
+                print(f"\nWebhook request with a wrong secret token answered with HTTP {result['wrong_secret_status']}")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
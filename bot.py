@@ -1,38 +1,58 @@
 #!/usr/bin/env python3
 
 import logging
+import secrets
 import signal
 import sys
 
-from telegram import BotCommand, BotCommandScopeAllPrivateChats, BotCommandScopeChat, Update
+from telegram import BotCommandScopeAllPrivateChats, BotCommandScopeChat, Update
 from telegram.ext import (
     Application,
-    CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
     ConversationHandler,
     MessageHandler,
-    PicklePersistence,
+    TypeHandler,
     filters,
 )
 
-from config import BOT_TOKEN, ADMIN_TELEGRAM_USER_ID
+from config import (
+    BOT_TOKEN, ADMIN_TELEGRAM_USER_ID,
+    CONVERSATION_IDLE_TTL_HOURS, SWEEP_INTERVAL_MINUTES, SWEEP_BATCH_SIZE, OUTBOX_POLL_SECONDS,
+    RATE_LIMIT_GLOBAL, RATE_LIMIT_PER_CHAT, RATE_LIMIT_CHAT_BURST, RATE_LIMIT_MAX_RETRIES,
+    UPDATE_CONCURRENCY, UPDATE_MAX_PENDING,
+    BOT_MODE, WEBHOOK_URL, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_SECRET_TOKEN,
+)
 from handlers.start import start, language_selection, welcome_continue
 from handlers.admin import (
     leads_command,
+    leads_page_callback,
+    dbstats_command,
     admin_lead_action_callback,
     offer_response_callback,
     offer_counter_callback,
     counter_offer_message,
+    awaiting_counter_offer,
     admin_price_message,
     admin_archive_callback,
     admin_delete_callback,
+    deliver_admin_message,
 )
 from handlers.vehicle import plate_validation, owner_name, owner_confirm, curb_weight
 from handlers.photos import photo_collection, photo_text
 from handlers.logistics import logistics_selection, location_received
-from handlers.finalize import phone_number
-from database.models import init_db
+from handlers.finalize import phone_number, deliver_lead_card
+from handlers.catalog import DEFAULT_LANGUAGE
+from handlers.commands import bot_commands, command_registry
+from handlers.router import callback_router
+from handlers.sweeper import IdleSweeper
+from handlers.tasks import task_pipeline
+from handlers.outbox import outbox
+from handlers.ratelimit import PriorityRateLimiter
+from handlers.updates import ChatOrderedUpdateProcessor
+from database.models import init_db, close_pool, flush_session_photos, get_counter_offer_waits
+from database.executor import shutdown_executor
+from database.persistence import SQLitePersistence, import_pickle_persistence
 from states import *
 
 logging.basicConfig(
@@ -56,43 +76,74 @@ async def error_handler(update: object, context: ContextTypes.DEFAULT_TYPE) -> N
 
 def main():
     init_db()
+    awaiting_counter_offer.load(get_counter_offer_waits())
+
+    import_pickle_persistence("bot_data.pkl")
+    persistence = SQLitePersistence()
 
-    persistence = PicklePersistence(
-        filepath="bot_data.pkl",
+    rate_limiter = PriorityRateLimiter(
+        overall_rate=RATE_LIMIT_GLOBAL,
+        chat_rate=RATE_LIMIT_PER_CHAT,
+        chat_burst=RATE_LIMIT_CHAT_BURST,
+        max_retries=RATE_LIMIT_MAX_RETRIES,
+        admin_chat_id=ADMIN_TELEGRAM_USER_ID,
     )
 
-    application = Application.builder().token(BOT_TOKEN).persistence(persistence).build()
+    application = (
+        Application.builder()
+        .token(BOT_TOKEN)
+        .persistence(persistence)
+        .rate_limiter(rate_limiter)
+        .concurrent_updates(ChatOrderedUpdateProcessor(UPDATE_CONCURRENCY, UPDATE_MAX_PENDING))
+        .build()
+    )
     application.add_error_handler(error_handler)
 
     async def post_init(app: Application):
-        await app.bot.set_my_commands(
-            [
-                BotCommand("start", "Start"),
-                BotCommand("new", "New inquiry"),
-            ],
-            scope=BotCommandScopeAllPrivateChats(),
+        await task_pipeline.start()
+
+        await command_registry.set_commands(
+            app.bot,
+            bot_commands(DEFAULT_LANGUAGE),
+            BotCommandScopeAllPrivateChats(),
         )
 
         if ADMIN_TELEGRAM_USER_ID:
-            await app.bot.set_my_commands(
-                [
-                    BotCommand("start", "Start"),
-                    BotCommand("new", "New inquiry"),
-                    BotCommand("leads", "Admin leads"),
-                ],
-                scope=BotCommandScopeChat(ADMIN_TELEGRAM_USER_ID),
+            await command_registry.set_commands(
+                app.bot,
+                bot_commands(DEFAULT_LANGUAGE, admin=True),
+                BotCommandScopeChat(ADMIN_TELEGRAM_USER_ID),
             )
 
-    application.post_init = post_init
+    async def post_stop(app: Application):
+        # Deliver queued admin notifications while the bot can still send
+        await task_pipeline.stop()
+
+    async def post_shutdown(app: Application):
+        shutdown_executor()
+        flush_session_photos()
+        close_pool()
 
-    application.add_handler(CallbackQueryHandler(offer_response_callback, pattern=r"^offer_"))
-    application.add_handler(CallbackQueryHandler(offer_counter_callback, pattern=r"^offer_counter"))
-    application.add_handler(CallbackQueryHandler(admin_lead_action_callback, pattern=r"^admin_reply"))
-    application.add_handler(CallbackQueryHandler(admin_archive_callback, pattern=r"^admin_archive"))
-    application.add_handler(CallbackQueryHandler(admin_delete_callback, pattern=r"^admin_delete"))
+    application.post_init = post_init
+    application.post_stop = post_stop
+    application.post_shutdown = post_shutdown
+
+    outbox.register("lead_card", deliver_lead_card)
+    outbox.register("counter_offer", deliver_admin_message)
+    outbox.register("offer_response", deliver_admin_message)
+
+    callback_router.register("offer_accept", offer_response_callback)
+    callback_router.register("offer_reject", offer_response_callback)
+    callback_router.register("offer_counter", offer_counter_callback)
+    callback_router.register("admin_reply", admin_lead_action_callback)
+    callback_router.register("admin_archive", admin_archive_callback)
+    callback_router.register("admin_delete", admin_delete_callback)
+    callback_router.register("leads_page", leads_page_callback)
+    application.add_handler(callback_router.handler())
 
     if ADMIN_TELEGRAM_USER_ID:
         application.add_handler(CommandHandler("leads", leads_command))
+        application.add_handler(CommandHandler("dbstats", dbstats_command))
         application.add_handler(
             MessageHandler(
                 filters.Chat(chat_id=ADMIN_TELEGRAM_USER_ID) & filters.REPLY & filters.TEXT & ~filters.COMMAND,
@@ -102,7 +153,7 @@ def main():
         )
 
     application.add_handler(
-        MessageHandler(filters.TEXT & ~filters.COMMAND, counter_offer_message),
+        MessageHandler(filters.TEXT & ~filters.COMMAND & awaiting_counter_offer, counter_offer_message),
         group=1,
     )
 
@@ -138,6 +189,29 @@ def main():
 
     application.add_handler(conv, group=2)
 
+    sweeper = IdleSweeper(
+        conv,
+        ttl=CONVERSATION_IDLE_TTL_HOURS * 3600,
+        batch_size=SWEEP_BATCH_SIZE,
+        exempt_ids=[ADMIN_TELEGRAM_USER_ID],
+        expirers=[awaiting_counter_offer.expire, command_registry.expire],
+    )
+    application.add_handler(TypeHandler(Update, sweeper.touch), group=-1)
+    application.job_queue.run_repeating(
+        sweeper.sweep,
+        interval=SWEEP_INTERVAL_MINUTES * 60,
+        first=SWEEP_INTERVAL_MINUTES * 60,
+        name="idle_sweeper",
+        data=sweeper,
+    )
+    # Picks up retries and notifications left pending by a restart
+    application.job_queue.run_repeating(
+        outbox.drain,
+        interval=OUTBOX_POLL_SECONDS,
+        first=1,
+        name="outbox",
+    )
+
     def shutdown(*_):
         logger.warning("Received shutdown signal")
         try:
@@ -149,6 +223,23 @@ def main():
     signal.signal(signal.SIGTERM, shutdown)
     signal.signal(signal.SIGINT, shutdown)
 
+    if BOT_MODE == "webhook":
+        if not WEBHOOK_URL:
+            raise RuntimeError("BOT_MODE=webhook needs WEBHOOK_URL")
+        # The listener answers 200 as soon as an update is queued and rejects
+        # requests whose X-Telegram-Bot-Api-Secret-Token does not match (403)
+        logger.info("BOOT: starting webhook on %s:%d/%s", WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH)
+        application.run_webhook(
+            listen=WEBHOOK_LISTEN,
+            port=WEBHOOK_PORT,
+            url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL}/{WEBHOOK_PATH}",
+            secret_token=WEBHOOK_SECRET_TOKEN or secrets.token_urlsafe(32),
+            drop_pending_updates=True,
+            allowed_updates=Update.ALL_TYPES,
+        )
+        return
+
     logger.info("BOOT: starting polling")
     application.run_polling(
         drop_pending_updates=True,
@@ -10,7 +10,65 @@ if not BOT_TOKEN:
     raise RuntimeError("BOT_TOKEN is missing")
 
 # Database settings
-DATABASE_URL = "sqlite:///romupunkt.db"
+DATABASE_URL = os.getenv("DATABASE_URL") or "sqlite:///romupunkt.db"
+DATABASE_PATH = DATABASE_URL[len("sqlite:///"):]
+
+# Connection pool settings (see database/pool.py)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE") or "5")
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT") or "10")
+DB_HEALTH_CHECK_INTERVAL = float(os.getenv("DB_HEALTH_CHECK_INTERVAL") or "30")
+
+# Pragma profile applied to every pooled connection (journal_mode must stay first).
+# WAL lets /leads reads run while a lead is being committed. The lock wait is not
+# set here: sqlite3.connect(timeout=DB_POOL_TIMEOUT) sets busy_timeout itself.
+DB_PRAGMAS = {
+    "journal_mode": os.getenv("DB_JOURNAL_MODE") or "WAL",
+    "synchronous": os.getenv("DB_SYNCHRONOUS") or "NORMAL",
+    "cache_size": int(os.getenv("DB_CACHE_SIZE") or "-16000"),  # negative = KiB
+    "mmap_size": int(os.getenv("DB_MMAP_SIZE") or str(64 * 1024 * 1024)),
+    "temp_store": os.getenv("DB_TEMP_STORE") or "MEMORY",
+}
+
+# In-process lead/offer row cache (see database/cache.py)
+ROW_CACHE_SIZE = int(os.getenv("ROW_CACHE_SIZE") or "256")
+ROW_CACHE_TTL = float(os.getenv("ROW_CACHE_TTL") or "30")
+
+# Abandoned conversations: state and session photos idle this long are evicted
+CONVERSATION_IDLE_TTL_HOURS = float(os.getenv("CONVERSATION_IDLE_TTL_HOURS") or "72")
+SWEEP_INTERVAL_MINUTES = float(os.getenv("SWEEP_INTERVAL_MINUTES") or "30")
+SWEEP_BATCH_SIZE = int(os.getenv("SWEEP_BATCH_SIZE") or "500")
+# A customer asked for a counter-offer price who has not answered by then is no longer waited on
+COUNTER_OFFER_WAIT_TTL_HOURS = float(os.getenv("COUNTER_OFFER_WAIT_TTL_HOURS") or "24")
+
+# Background workers for post-finalize side effects (admin lead card, ...)
+TASK_WORKERS = int(os.getenv("TASK_WORKERS") or "4")
+TASK_QUEUE_SIZE = int(os.getenv("TASK_QUEUE_SIZE") or "1000")
+
+# Outbox of admin notifications: poll interval and retry backoff (seconds)
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS") or "10")
+OUTBOX_BASE_DELAY = float(os.getenv("OUTBOX_BASE_DELAY") or "5")
+OUTBOX_MAX_DELAY = float(os.getenv("OUTBOX_MAX_DELAY") or "900")
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS") or "15")
+
+# Outbound Bot API throttling (messages per second), see handlers/ratelimit.py
+RATE_LIMIT_GLOBAL = float(os.getenv("RATE_LIMIT_GLOBAL") or "30")
+RATE_LIMIT_PER_CHAT = float(os.getenv("RATE_LIMIT_PER_CHAT") or "1")
+RATE_LIMIT_CHAT_BURST = float(os.getenv("RATE_LIMIT_CHAT_BURST") or "3")
+RATE_LIMIT_MAX_RETRIES = int(os.getenv("RATE_LIMIT_MAX_RETRIES") or "1")
+
+# Updates of different chats run concurrently (one at a time per chat)
+UPDATE_CONCURRENCY = int(os.getenv("UPDATE_CONCURRENCY") or "16")
+UPDATE_MAX_PENDING = int(os.getenv("UPDATE_MAX_PENDING") or "256")
+
+# Update ingestion: "polling" (default) or "webhook". Webhook mode listens on
+# WEBHOOK_LISTEN:WEBHOOK_PORT/WEBHOOK_PATH and registers WEBHOOK_URL/WEBHOOK_PATH
+# with Telegram; without WEBHOOK_SECRET_TOKEN a random secret is used per start.
+BOT_MODE = (os.getenv("BOT_MODE") or "polling").strip().lower()
+WEBHOOK_URL = (os.getenv("WEBHOOK_URL") or "").rstrip("/")
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN") or "0.0.0.0"
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT") or os.getenv("PORT") or "8443")
+WEBHOOK_PATH = (os.getenv("WEBHOOK_PATH") or "telegram").strip("/")
+WEBHOOK_SECRET_TOKEN = os.getenv("WEBHOOK_SECRET_TOKEN") or None
 
 # Estonian Transport Administration API (if available)
 TRANSPORDIAMET_API_KEY = None
@@ -18,6 +76,8 @@ TRANSPORDIAMET_API_KEY = None
 # Photo settings
 MAX_PHOTOS = 4
 PHOTO_QUALITY = 80
+# Session photos arriving within this window are committed together
+PHOTO_WRITE_WINDOW_MS = int(os.getenv("PHOTO_WRITE_WINDOW_MS") or "50")
 
 # Supported languages
 SUPPORTED_LANGUAGES = ['ee', 'en', 'ru']
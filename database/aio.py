@@ -0,0 +1,75 @@
+"""
+Async facade over database/models.py
+
+Every function here has the same signature as its counterpart in
+database/models.py but is awaitable: the call is handed to the database
+executor thread so slow commits never block the bot's event loop. The
+exception is save_session_photo, which only appends to the in-memory
+photo buffer and runs inline.
+"""
+
+import functools
+
+from database import models
+from database.executor import get_executor
+
+
+def _reader(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await get_executor().submit(fn, *args, **kwargs)
+    return wrapper
+
+
+def _writer(fn):
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await get_executor().submit(fn, *args, write=True, **kwargs)
+    return wrapper
+
+
+# Reads
+get_lead_by_id = _reader(models.get_lead_by_id)
+get_offer_by_id = _reader(models.get_offer_by_id)
+get_lead_photos = _reader(models.get_lead_photos)
+get_latest_leads = _reader(models.get_latest_leads)
+get_lead_summaries = _reader(models.get_lead_summaries)
+get_lead_by_user_id = _reader(models.get_lead_by_user_id)
+get_lead_id_by_session = _reader(models.get_lead_id_by_session)
+get_db_diagnostics = _reader(models.get_db_diagnostics)
+get_persistence_rows = _reader(models.get_persistence_rows)
+get_persistence_last_seen = _reader(models.get_persistence_last_seen)
+get_media_file_id = _reader(models.get_media_file_id)
+get_command_digest = _reader(models.get_command_digest)
+get_due_notifications = _reader(models.get_due_notifications)
+get_outbox_counts = _reader(models.get_outbox_counts)
+
+# Writes
+save_lead = _writer(models.save_lead)
+finalize_lead = _writer(models.finalize_lead)
+create_offer = _writer(models.create_offer)
+update_offer_status = _writer(models.update_offer_status)
+update_lead_status = _writer(models.update_lead_status)
+# Flushes the photo buffer before reading, so it is batched with the writes
+get_session_photos = _writer(models.get_session_photos)
+move_session_photos_to_lead = _writer(models.move_session_photos_to_lead)
+save_photo_file_id = _writer(models.save_photo_file_id)
+delete_lead_by_id = _writer(models.delete_lead_by_id)
+set_counter_offer_wait = _writer(models.set_counter_offer_wait)
+clear_counter_offer_wait = _writer(models.clear_counter_offer_wait)
+delete_expired_counter_offer_waits = _writer(models.delete_expired_counter_offer_waits)
+save_persistence_rows = _writer(models.save_persistence_rows)
+delete_persistence_row = _writer(models.delete_persistence_row)
+delete_stale_session_photos = _writer(models.delete_stale_session_photos)
+set_media_file_id = _writer(models.set_media_file_id)
+delete_media_file_id = _writer(models.delete_media_file_id)
+set_command_digest = _writer(models.set_command_digest)
+delete_stale_command_scopes = _writer(models.delete_stale_command_scopes)
+enqueue_notification = _writer(models.enqueue_notification)
+mark_notification_sent = _writer(models.mark_notification_sent)
+reschedule_notification = _writer(models.reschedule_notification)
+
+
+async def save_session_photo(user_id: int, session_id: str, file_id: str) -> None:
+    # PhotoWriteBuffer has its own lock; its timer queues the insert on the executor
+    models.save_session_photo(user_id, session_id, file_id)
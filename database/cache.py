@@ -0,0 +1,68 @@
+"""
+Bounded in-process LRU cache with per-entry TTL for hot row lookups
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class RowCache:
+    """A thread-safe LRU mapping of key -> row dict whose entries expire.
+
+    At most ``maxsize`` entries are kept; the least recently used one is
+    evicted first. Entries older than ``ttl`` seconds are treated as misses,
+    which bounds how stale a row can get if an invalidation is ever missed.
+    Rows are copied on the way in and out so callers may mutate them.
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 30.0):
+        self.maxsize = max(1, int(maxsize))
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, key):
+        """Return a copy of the cached row, or None on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            row, stored_at = entry
+            if now - stored_at > self.ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(row)
+
+    def put(self, key, row: dict) -> None:
+        with self._lock:
+            self._entries[key] = (dict(row), time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, key) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._entries)
+            snapshot["maxsize"] = self.maxsize
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_ratio"] = snapshot["hits"] / lookups if lookups else 0.0
+        return snapshot
@@ -0,0 +1,182 @@
+"""
+Dedicated database thread that runs models.py calls off the asyncio event loop
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+
+from database.models import get_db_connection
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _Job:
+    __slots__ = ("fn", "args", "kwargs", "write", "future", "loop", "queued_at")
+
+    def __init__(self, fn, args, kwargs, write, future, loop):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.write = write
+        self.future = future
+        self.loop = loop
+        self.queued_at = time.perf_counter()
+
+
+def _set_future(future: asyncio.Future, result, exc) -> None:
+    if future.cancelled():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class DatabaseExecutor:
+    """Serializes database work onto one thread fed by a request queue.
+
+    Reads run one at a time. Writes that are already queued behind each
+    other are drained together (up to ``max_batch``) and executed inside a
+    single transaction, each in its own savepoint so one failing write does
+    not take the others down. Awaiters are only resolved after the commit.
+    """
+
+    def __init__(self, max_batch: int = 64, name: str = "db-executor"):
+        self.max_batch = max(1, int(max_batch))
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "jobs": 0,
+            "failed": 0,
+            "batches": 0,
+            "batched_writes": 0,
+            "max_batch": 0,
+            "queue_ms_total": 0.0,
+            "run_ms_total": 0.0,
+        }
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._worker, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued work and stop the worker thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    async def submit(self, fn, *args, write: bool = False, **kwargs):
+        """Run ``fn(*args, **kwargs)`` on the database thread and await its result"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_Job(fn, args, kwargs, write, future, loop))
+        return await future
+
+    def post(self, fn, *args, write: bool = False, **kwargs) -> None:
+        """Queue ``fn(*args, **kwargs)`` on the database thread without waiting.
+
+        For callers outside the event loop (timer threads); an exception
+        raised by ``fn`` is logged.
+        """
+        self.start()
+        self._queue.put(_Job(fn, args, kwargs, write, None, None))
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["queue_depth"] = self._queue.qsize()
+        return snapshot
+
+    def _worker(self) -> None:
+        pending = None
+        while True:
+            job = pending if pending is not None else self._queue.get()
+            pending = None
+            if job is _STOP:
+                break
+
+            batch = [job]
+            if job.write:
+                while len(batch) < self.max_batch:
+                    try:
+                        nxt = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if nxt is _STOP or not nxt.write:
+                        pending = nxt
+                        break
+                    batch.append(nxt)
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        started = time.perf_counter()
+        outcomes = []
+        try:
+            with get_db_connection():
+                for job in batch:
+                    try:
+                        with get_db_connection():
+                            outcomes.append((job, job.fn(*job.args, **job.kwargs), None))
+                    except Exception as exc:
+                        outcomes.append((job, None, exc))
+        except Exception as exc:
+            logger.exception("Database batch of %d job(s) failed to commit", len(batch))
+            outcomes = [(job, None, exc) for job in batch]
+        finished = time.perf_counter()
+
+        with self._lock:
+            self._stats["jobs"] += len(batch)
+            self._stats["failed"] += sum(1 for _, _, exc in outcomes if exc is not None)
+            self._stats["run_ms_total"] += (finished - started) * 1000
+            self._stats["queue_ms_total"] += sum((started - job.queued_at) * 1000 for job in batch)
+            if batch[0].write:
+                self._stats["batches"] += 1
+                self._stats["batched_writes"] += len(batch)
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(batch))
+
+        for job, result, exc in outcomes:
+            if job.future is None:
+                if exc is not None:
+                    logger.error("Database job %s failed", getattr(job.fn, "__qualname__", job.fn), exc_info=exc)
+                continue
+            try:
+                job.loop.call_soon_threadsafe(_set_future, job.future, result, exc)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> DatabaseExecutor:
+    """Return the process-wide database executor"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = DatabaseExecutor()
+    return _executor
+
+
+def shutdown_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.stop()
+            _executor = None
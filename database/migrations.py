@@ -0,0 +1,228 @@
+"""
+Versioned schema migrations keyed on PRAGMA user_version
+"""
+
+import logging
+import sqlite3
+from collections import namedtuple
+
+logger = logging.getLogger(__name__)
+
+# A migration is an ordered list of steps; each step is either a SQL string
+# or a callable taking the connection. All steps of one migration run in a
+# single transaction together with the user_version bump.
+Migration = namedtuple("Migration", ["version", "description", "steps"])
+
+
+def _add_column(table: str, column: str, decl: str):
+    """Step that adds a column only if the table does not have it yet"""
+    def step(conn: sqlite3.Connection) -> None:
+        columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        if column not in columns:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    return step
+
+
+def _create_index(name: str, table: str, columns: str, unique: bool = False):
+    """Step that creates an index if it does not exist yet"""
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    return f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({columns})"
+
+
+MIGRATIONS = [
+    Migration(1, "baseline schema", [
+        '''
+        CREATE TABLE IF NOT EXISTS leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            telegram_username TEXT,
+            language TEXT NOT NULL,
+            plate_number TEXT NOT NULL,
+            owner_name TEXT NOT NULL,
+            is_owner INTEGER,
+            curb_weight INTEGER NOT NULL,
+            completeness TEXT,
+            missing_parts TEXT,
+            transport_method TEXT,
+            needs_tow BOOLEAN,
+            tow_address TEXT,
+            location_latitude REAL,
+            location_longitude REAL,
+            photos TEXT,
+            phone_number TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+        # Databases created before these columns existed
+        _add_column("leads", "is_owner", "INTEGER"),
+        _add_column("leads", "missing_parts", "TEXT"),
+        _add_column("leads", "tow_address", "TEXT"),
+        # Session-based photo storage
+        '''
+        CREATE TABLE IF NOT EXISTS car_photos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            session_id TEXT NOT NULL,
+            file_id TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(user_id, session_id, file_id)
+        )
+        ''',
+        # Permanent photo storage per lead
+        '''
+        CREATE TABLE IF NOT EXISTS photos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER NOT NULL,
+            file_id TEXT NOT NULL,
+            file_path TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (lead_id) REFERENCES leads (id)
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS offers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            lead_id INTEGER NOT NULL,
+            offer_amount REAL,
+            transport_cost REAL,
+            total_amount REAL,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (lead_id) REFERENCES leads (id)
+        )
+        ''',
+    ]),
+    Migration(2, "indexes for hot lookup paths", [
+        # save_lead duplicate check
+        _create_index("idx_leads_user_plate_phone", "leads", "user_id, plate_number, phone_number"),
+        # get_lead_photos, delete_lead_by_id
+        _create_index("idx_photos_lead_id", "photos", "lead_id, created_at"),
+        # get_session_photos, move_session_photos_to_lead
+        _create_index("idx_car_photos_session", "car_photos", "user_id, session_id, created_at"),
+        # delete_lead_by_id, per-lead offer lookups
+        _create_index("idx_offers_lead_id", "offers", "lead_id"),
+    ]),
+    Migration(3, "keyset pagination indexes for leads", [
+        # get_latest_leads / get_lead_summaries filtered by status
+        _create_index("idx_leads_status_id", "leads", "status, id"),
+        # created_at range -> id bound translation
+        _create_index("idx_leads_created_at", "leads", "created_at"),
+    ]),
+    Migration(4, "conversation session_id as lead idempotency key", [
+        _add_column("leads", "session_id", "TEXT"),
+        # save_lead upserts on this; legacy leads without a session stay NULL
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_leads_session_id ON leads (session_id) "
+        "WHERE session_id IS NOT NULL",
+    ]),
+    Migration(5, "chats awaiting a counter-offer", [
+        '''
+        CREATE TABLE IF NOT EXISTS counter_offer_waits (
+            chat_id INTEGER PRIMARY KEY,
+            offer_id INTEGER NOT NULL,
+            lead_id INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    Migration(6, "per-record bot persistence", [
+        # One pickled record per user/chat/conversation key (database/persistence.py)
+        '''
+        CREATE TABLE IF NOT EXISTS bot_persistence (
+            namespace TEXT NOT NULL,
+            key TEXT NOT NULL,
+            data BLOB NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (namespace, key)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    Migration(7, "telegram file_id cache for static media", [
+        '''
+        CREATE TABLE IF NOT EXISTS media_cache (
+            sha256 TEXT PRIMARY KEY,
+            path TEXT NOT NULL,
+            file_id TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    Migration(8, "applied bot command sets per scope", [
+        '''
+        CREATE TABLE IF NOT EXISTS bot_command_scopes (
+            scope TEXT PRIMARY KEY,
+            digest TEXT NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        ''',
+    ]),
+    Migration(9, "outbox of pending admin notifications", [
+        # dedupe_key (e.g. "lead_card:<lead_id>") makes enqueueing idempotent
+        '''
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            dedupe_key TEXT NOT NULL UNIQUE,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            sent_at TIMESTAMP
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (next_attempt_at) WHERE status = 'pending'",
+    ]),
+    Migration(10, "drop the save_lead duplicate-check index", [
+        # save_lead upserts on idx_leads_session_id since migration 4
+        "DROP INDEX IF EXISTS idx_leads_user_plate_phone",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """Apply pending migrations and return the resulting schema version.
+
+    ``conn`` must be in autocommit mode (as handed out by the pool). When
+    the schema is already current this costs a single pragma read.
+    """
+    current = get_schema_version(conn)
+    if current >= LATEST_VERSION:
+        return current
+
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have migrated while we waited for the lock
+            current = get_schema_version(conn)
+            if migration.version <= current:
+                conn.rollback()
+                continue
+
+            for step in migration.steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(migration.version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            logger.exception("Migration %d (%s) failed", migration.version, migration.description)
+            raise
+
+        current = migration.version
+        logger.info("Applied migration %d: %s", migration.version, migration.description)
+
+    return current
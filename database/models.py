@@ -2,405 +2,928 @@
 Database models for storing vehicle dismantling leads
 """
 
-import sqlite3
+import json
+import logging
 import threading
+import time
 from datetime import datetime
 from contextlib import contextmanager
-from config import DATABASE_URL
+from config import (
+    DATABASE_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_HEALTH_CHECK_INTERVAL, DB_PRAGMAS,
+    PHOTO_WRITE_WINDOW_MS, ROW_CACHE_SIZE, ROW_CACHE_TTL,
+)
+from database.cache import RowCache
+from database.pool import ConnectionPool
+from database.migrations import migrate, get_schema_version
 
-# Thread-local storage for database connections
-_local = threading.local()
+logger = logging.getLogger(__name__)
 
-@contextmanager
-def get_db_connection():
-    """Get a thread-safe database connection"""
-    if not hasattr(_local, 'connection'):
-        _local.connection = sqlite3.connect('romupunkt.db', check_same_thread=False)
-        _local.connection.row_factory = sqlite3.Row
-    try:
-        yield _local.connection
-    except Exception:
-        _local.connection.rollback()
-        raise
-    finally:
-        pass  # Keep connection open for thread reuse
-
-def init_db():
-    """Initialize the database and create tables"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS leads (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                telegram_username TEXT,
-                language TEXT NOT NULL,
-                plate_number TEXT NOT NULL,
-                owner_name TEXT NOT NULL,
-                is_owner INTEGER,
-                curb_weight INTEGER NOT NULL,
-                completeness TEXT,
-                missing_parts TEXT,
-                transport_method TEXT,
-                needs_tow BOOLEAN,
-                tow_address TEXT,
-                location_latitude REAL,
-                location_longitude REAL,
-                photos TEXT,
-                phone_number TEXT,
-                status TEXT DEFAULT 'pending',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+_pool = None
+_pool_lock = threading.Lock()
 
-        try:
-            cursor.execute("ALTER TABLE leads ADD COLUMN is_owner INTEGER")
-        except sqlite3.OperationalError:
-            pass
+# Thread-local transaction scope (connection + savepoint depth)
+_local = threading.local()
 
+# Read-through caches for single lead / offer rows, keyed by id
+_lead_cache = RowCache(ROW_CACHE_SIZE, ROW_CACHE_TTL)
+_offer_cache = RowCache(ROW_CACHE_SIZE, ROW_CACHE_TTL)
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide connection pool, creating it on first use"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DATABASE_PATH,
+                    size=DB_POOL_SIZE,
+                    pragmas=DB_PRAGMAS,
+                    timeout=DB_POOL_TIMEOUT,
+                    health_check_interval=DB_HEALTH_CHECK_INTERVAL,
+                )
+    return _pool
+
+
+def close_pool() -> None:
+    """Close all pooled connections (used on shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
+def get_pool_stats() -> dict:
+    """Checkout metrics of the connection pool"""
+    return get_pool().stats()
+
+
+def get_db_diagnostics() -> dict:
+    """Active pragma values, schema version and pool metrics"""
+    with get_pool().connection() as conn:
+        pragmas = {
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in (*DB_PRAGMAS, "busy_timeout")
+        }
+        schema_version = get_schema_version(conn)
+    expected = DB_PRAGMAS.get("journal_mode")
+    if expected is not None and str(pragmas["journal_mode"]).lower() != str(expected).lower():
+        logger.warning("Database journal_mode is %s, expected %s", pragmas["journal_mode"], expected)
+    return {
+        "path": DATABASE_PATH,
+        "schema_version": schema_version,
+        "pragmas": pragmas,
+        "pool": get_pool_stats(),
+        "photo_writes": get_photo_write_stats(),
+        "cache": get_cache_stats(),
+    }
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters of the lead and offer row caches"""
+    return {"leads": _lead_cache.stats(), "offers": _offer_cache.stats()}
+
+
+def _invalidate(cache: RowCache, key) -> None:
+    """Drop a cached row now and again when the current transaction commits.
+
+    The second pass covers another thread re-caching the old committed row
+    in between. Until then reads of ``key`` on this thread bypass the cache,
+    so rows written by an uncommitted transaction are never cached.
+    """
+    cache.invalidate(key)
+    pending = getattr(_local, 'invalidated', None)
+    if pending is not None:
+        pending.add((cache, key))
+
+
+def _on_rollback(callback) -> None:
+    """Run ``callback`` if the enclosing transaction scope is rolled back.
+
+    Outside a transaction the work is already committed and nothing is
+    registered. A savepoint rollback runs the callbacks registered inside
+    it; a released savepoint hands its callbacks to the enclosing scope,
+    and a commit of the outermost scope discards them.
+    """
+    hooks = getattr(_local, 'rollback_hooks', None)
+    if hooks is not None:
+        hooks.append((_local.depth, callback))
+
+
+def _run_rollback_hooks(depth: int) -> None:
+    hooks = _local.rollback_hooks
+    undone = [callback for hook_depth, callback in hooks if hook_depth >= depth]
+    hooks[:] = [hook for hook in hooks if hook[0] < depth]
+    for callback in reversed(undone):
         try:
-            cursor.execute("ALTER TABLE leads ADD COLUMN missing_parts TEXT")
-        except sqlite3.OperationalError:
-            pass
+            callback()
+        except Exception:
+            logger.exception("Rollback hook failed")
 
+
+def _cacheable(cache: RowCache, key) -> bool:
+    pending = getattr(_local, 'invalidated', None)
+    return not pending or (cache, key) not in pending
+
+
+@contextmanager
+def get_db_connection():
+    """Open a transaction on a pooled connection.
+
+    The outermost scope checks a connection out of the pool, commits on
+    success and rolls back on error. Nested scopes on the same thread reuse
+    that connection inside a SAVEPOINT, so helpers can call each other
+    without opening a second connection.
+    """
+    conn = getattr(_local, 'connection', None)
+    if conn is not None:
+        _local.depth += 1
+        savepoint = f"sp_{_local.depth}"
+        conn.execute(f"SAVEPOINT {savepoint}")
         try:
-            cursor.execute("ALTER TABLE leads ADD COLUMN tow_address TEXT")
-        except sqlite3.OperationalError:
-            pass
-        
-        # Create car_photos table for session-based photo storage
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS car_photos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                session_id TEXT NOT NULL,
-                file_id TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(user_id, session_id, file_id)
-            )
-        ''')
-        
-        # Create photos table for file_id storage
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS photos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                lead_id INTEGER NOT NULL,
-                file_id TEXT NOT NULL,
-                file_path TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (lead_id) REFERENCES leads (id)
-            )
-        ''')
-        
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS offers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                lead_id INTEGER NOT NULL,
-                offer_amount REAL,
-                transport_cost REAL,
-                total_amount REAL,
-                status TEXT DEFAULT 'pending',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (lead_id) REFERENCES leads (id)
-            )
-        ''')
-        
-        conn.commit()
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+            _run_rollback_hooks(_local.depth)
+            raise
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+            # The work is now part of the enclosing scope: undo it only if that one rolls back
+            depth = _local.depth
+            _local.rollback_hooks[:] = [
+                (depth - 1 if hook_depth == depth else hook_depth, callback)
+                for hook_depth, callback in _local.rollback_hooks
+            ]
+        finally:
+            _local.depth -= 1
+        return
+
+    with get_pool().connection() as conn:
+        _local.connection = conn
+        _local.depth = 0
+        _local.invalidated = set()
+        _local.rollback_hooks = []
+        try:
+            conn.execute("BEGIN")
+            yield conn
+            conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            _run_rollback_hooks(0)
+            raise
+        else:
+            for cache, key in _local.invalidated:
+                cache.invalidate(key)
+        finally:
+            _local.connection = None
+            _local.invalidated = None
+            _local.rollback_hooks = None
+
+def init_db() -> int:
+    """Initialize the database and bring the schema up to date.
+
+    The pool applies the DB_PRAGMAS profile when it opens the connection,
+    so this also switches the database file to the configured journal mode.
+    """
+    with get_pool().connection() as conn:
+        return migrate(conn)
 
 
 def get_lead_by_id(lead_id: int):
-    conn = sqlite3.connect('romupunkt.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT
-            id,
-            created_at,
-            language,
-            plate_number,
-            owner_name,
-            is_owner,
-            curb_weight,
-            completeness,
-            missing_parts,
-            transport_method,
-            needs_tow,
-            tow_address,
-            location_latitude,
-            location_longitude,
-            photos,
-            phone_number,
-            telegram_username,
-            user_id
-        FROM leads
-        WHERE id = ?
-        LIMIT 1
-        """,
-        (int(lead_id),),
-    )
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    lead_id = int(lead_id)
+    cacheable = _cacheable(_lead_cache, lead_id)
+    if cacheable:
+        lead = _lead_cache.get(lead_id)
+        if lead is not None:
+            return lead
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT
+                id,
+                created_at,
+                language,
+                plate_number,
+                owner_name,
+                is_owner,
+                curb_weight,
+                completeness,
+                missing_parts,
+                transport_method,
+                needs_tow,
+                tow_address,
+                location_latitude,
+                location_longitude,
+                photos,
+                phone_number,
+                telegram_username,
+                user_id
+            FROM leads
+            WHERE id = ?
+            LIMIT 1
+            """,
+            (lead_id,),
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    lead = dict(row)
+    if cacheable:
+        _lead_cache.put(lead_id, lead)
+    return lead
 
 
 def create_offer(lead_id: int, offer_amount: float, status: str = "sent") -> int:
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        INSERT INTO offers (lead_id, offer_amount, transport_cost, total_amount, status)
-        VALUES (?, ?, ?, ?, ?)
-        """,
-        (int(lead_id), float(offer_amount), None, float(offer_amount), status),
-    )
-    offer_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            INSERT INTO offers (lead_id, offer_amount, transport_cost, total_amount, status)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (int(lead_id), float(offer_amount), None, float(offer_amount), status),
+        )
+        offer_id = cursor.lastrowid
+        _invalidate(_offer_cache, offer_id)
+        _invalidate(_lead_cache, int(lead_id))
     return offer_id
 
 
 def get_offer_by_id(offer_id: int):
-    conn = sqlite3.connect('romupunkt.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT id, lead_id, offer_amount, transport_cost, total_amount, status, created_at
-        FROM offers
-        WHERE id = ?
-        LIMIT 1
-        """,
-        (int(offer_id),),
-    )
-    row = cursor.fetchone()
-    conn.close()
-    return dict(row) if row else None
+    offer_id = int(offer_id)
+    cacheable = _cacheable(_offer_cache, offer_id)
+    if cacheable:
+        offer = _offer_cache.get(offer_id)
+        if offer is not None:
+            return offer
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            """
+            SELECT id, lead_id, offer_amount, transport_cost, total_amount, status, created_at
+            FROM offers
+            WHERE id = ?
+            LIMIT 1
+            """,
+            (offer_id,),
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    offer = dict(row)
+    if cacheable:
+        _offer_cache.put(offer_id, offer)
+    return offer
 
 
 def update_offer_status(offer_id: int, status: str) -> None:
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE offers SET status = ? WHERE id = ?",
-        (status, int(offer_id)),
-    )
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE offers SET status = ? WHERE id = ?",
+            (status, int(offer_id)),
+        )
+        _invalidate(_offer_cache, int(offer_id))
 
 
 def update_lead_status(lead_id: int, status: str) -> None:
     """Update the status of a lead (pending, replied, accepted, rejected, archived)"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    cursor.execute("UPDATE leads SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (status, lead_id))
-    conn.commit()
-    conn.close()
-
-
-def save_session_photo(user_id: int, session_id: str, file_id: str) -> None:
-    """Save a photo to session storage with thread safety"""
     with get_db_connection() as conn:
-        cursor = conn.cursor()
+        conn.execute("UPDATE leads SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (status, lead_id))
+        _invalidate(_lead_cache, int(lead_id))
+
+
+class PhotoWriteBuffer:
+    """Write-behind queue that group-commits car_photos inserts.
+
+    Photos arriving within ``window`` seconds of the first buffered one are
+    inserted in a single transaction, queued on the database executor by a
+    timer so the insert runs on the same thread as every other write. Rows
+    stay in the buffer until their insert has run, and readers call
+    ``flush()`` first, so a session's photos are always visible to
+    get_session_photos and move_session_photos_to_lead. When ``flush()``
+    runs inside a caller's transaction, rows it wrote are put back into the
+    buffer if that transaction rolls back. Inserts are INSERT OR IGNORE on
+    the (user_id, session_id, file_id) key, so a row flushed twice is
+    harmless.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._rows = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._stats = {"buffered": 0, "flushes": 0, "rows_flushed": 0, "max_batch": 0, "restored": 0}
+
+    def add(self, user_id: int, session_id: str, file_id: str) -> None:
+        with self._lock:
+            self._rows[(user_id, session_id, file_id)] = None
+            self._stats["buffered"] += 1
+            self._arm()
+
+    def _arm(self) -> None:
+        # Caller holds self._lock
+        if self._timer is None:
+            self._timer = threading.Timer(self.window, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self) -> None:
+        from database.executor import get_executor
+
+        with self._lock:
+            self._timer = None
+        get_executor().post(self._timed_flush, write=True)
+
+    def _timed_flush(self) -> None:
         try:
-            cursor.execute(
+            self.flush()
+        except Exception:
+            logger.exception("Group commit of session photos failed; rows stay buffered")
+            with self._lock:
+                if self._rows:
+                    self._arm()
+
+    def _restore(self, rows: list) -> None:
+        """Put rows back after the transaction that inserted them rolled back"""
+        with self._lock:
+            for row in rows:
+                self._rows[row] = None
+            self._stats["restored"] += len(rows)
+            self._arm()
+
+    def flush(self) -> int:
+        """Insert every buffered row now; returns the number of rows written"""
+        with self._lock:
+            rows = list(self._rows)
+        if not rows:
+            return 0
+
+        with get_db_connection() as conn:
+            conn.executemany(
                 "INSERT OR IGNORE INTO car_photos (user_id, session_id, file_id) VALUES (?, ?, ?)",
-                (user_id, session_id, file_id)
+                rows,
             )
-            conn.commit()
-        except sqlite3.IntegrityError:
-            pass  # Photo already saved
+            with self._lock:
+                for row in rows:
+                    self._rows.pop(row, None)
+                self._stats["flushes"] += 1
+                self._stats["rows_flushed"] += len(rows)
+                self._stats["max_batch"] = max(self._stats["max_batch"], len(rows))
+            _on_rollback(lambda: self._restore(rows))
+        return len(rows)
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["pending"] = len(self._rows)
+        return snapshot
+
+
+_photo_buffer = PhotoWriteBuffer(PHOTO_WRITE_WINDOW_MS / 1000)
+
+
+def flush_session_photos() -> int:
+    """Commit buffered session photos immediately"""
+    return _photo_buffer.flush()
+
+
+def get_photo_write_stats() -> dict:
+    return _photo_buffer.stats()
+
+
+def save_session_photo(user_id: int, session_id: str, file_id: str) -> None:
+    """Queue a photo for session storage; it is committed with the rest of its burst"""
+    _photo_buffer.add(user_id, session_id, file_id)
 
 def get_session_photos(user_id: int, session_id: str) -> list:
     """Get all photos for a user session with thread safety"""
+    flush_session_photos()
     with get_db_connection() as conn:
         cursor = conn.cursor()
         cursor.execute(
-            "SELECT file_id FROM car_photos WHERE user_id = ? AND session_id = ? ORDER BY created_at",
+            "SELECT file_id FROM car_photos WHERE user_id = ? AND session_id = ? ORDER BY created_at, id",
             (user_id, session_id)
         )
         rows = cursor.fetchall()
         return [row[0] for row in rows]
 
-def move_session_photos_to_lead(user_id: int, session_id: str, lead_id: int) -> None:
-    """Move photos from session to permanent lead storage with thread safety"""
+def move_session_photos_to_lead(user_id: int, session_id: str, lead_id: int) -> list:
+    """Move a session's photos to a lead and return the moved rows.
+
+    The transfer is set-based: one INSERT ... SELECT copies the rows in
+    upload order and one DELETE clears the session, both in the same
+    transaction. Returns ``[{"file_id", "file_path"}, ...]`` in the same
+    shape and order as get_lead_photos, so callers need not re-read them.
+    """
+    flush_session_photos()
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        
-        # Get session photos
-        cursor.execute(
-            "SELECT file_id FROM car_photos WHERE user_id = ? AND session_id = ? ORDER BY created_at",
+        moved = conn.execute(
+            """
+            INSERT INTO photos (lead_id, file_id)
+            SELECT ?, file_id
+            FROM car_photos
+            WHERE user_id = ? AND session_id = ?
+            ORDER BY created_at, id
+            RETURNING id, file_id, file_path
+            """,
+            (lead_id, user_id, session_id)
+        ).fetchall()
+
+        conn.execute(
+            "DELETE FROM car_photos WHERE user_id = ? AND session_id = ?",
             (user_id, session_id)
         )
-        photos = cursor.fetchall()
-        
-        # Move to photos table
-        for (file_id,) in photos:
-            cursor.execute(
-                "INSERT INTO photos (lead_id, file_id) VALUES (?, ?)",
-                (lead_id, file_id)
+
+    # RETURNING order is unspecified; ids follow the SELECT order
+    moved.sort(key=lambda row: row[0])
+    return [{"file_id": row[1], "file_path": row[2]} for row in moved]
+
+def delete_stale_session_photos(max_age_seconds: float, limit: int) -> int:
+    """Delete up to ``limit`` car_photos rows of sessions idle for ``max_age_seconds``.
+
+    A session is idle when its newest photo is older than the cutoff, so an
+    active session never loses its early photos. Returns the rows deleted.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.execute(
+            """
+            DELETE FROM car_photos WHERE id IN (
+                SELECT c.id
+                FROM car_photos c
+                JOIN (
+                    SELECT user_id, session_id
+                    FROM car_photos
+                    GROUP BY user_id, session_id
+                    HAVING MAX(created_at) < datetime('now', ?)
+                ) idle USING (user_id, session_id)
+                LIMIT ?
             )
-        
-        # Clear session photos
-        cursor.execute(
-            "DELETE FROM car_photos WHERE user_id = ? AND session_id = ?",
-            (user_id, session_id)
+            """,
+            (f"-{int(max_age_seconds)} seconds", int(limit)),
         )
-        
-        conn.commit()
+        return cursor.rowcount
 
 def save_photo_file_id(lead_id: int, file_id: str, file_path: str = None) -> None:
     """Save a photo file_id for a lead"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO photos (lead_id, file_id, file_path) VALUES (?, ?, ?)",
-        (lead_id, file_id, file_path)
-    )
-    conn.commit()
-    conn.close()
+    with get_db_connection() as conn:
+        conn.execute(
+            "INSERT INTO photos (lead_id, file_id, file_path) VALUES (?, ?, ?)",
+            (lead_id, file_id, file_path)
+        )
 
 def get_lead_photos(lead_id: int) -> list:
     """Get all photo file_ids for a lead"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    cursor.execute(
-        "SELECT file_id, file_path FROM photos WHERE lead_id = ? ORDER BY created_at",
-        (lead_id,)
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT file_id, file_path FROM photos WHERE lead_id = ? ORDER BY created_at, id",
+            (lead_id,)
+        )
+        rows = cursor.fetchall()
     return [{"file_id": row[0], "file_path": row[1]} for row in rows]
 
 def delete_lead_by_id(lead_id: int) -> None:
     """Delete a lead and its associated offers and photos by ID"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM photos WHERE lead_id = ?", (lead_id,))
-    cursor.execute("DELETE FROM offers WHERE lead_id = ?", (lead_id,))
-    cursor.execute("DELETE FROM leads WHERE id = ?", (lead_id,))
-    conn.commit()
-    conn.close()
-
-def get_latest_leads(limit: int = 10):
-    conn = sqlite3.connect('romupunkt.db')
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT
-            id,
-            created_at,
-            language,
-            plate_number,
-            owner_name,
-            is_owner,
-            curb_weight,
-            completeness,
-            missing_parts,
-            transport_method,
-            needs_tow,
-            tow_address,
-            location_latitude,
-            location_longitude,
-            photos,
-            phone_number,
-            telegram_username,
-            user_id,
-            status
-        FROM leads
-        ORDER BY id DESC
-        LIMIT ?
-        """,
-        (int(limit),),
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM photos WHERE lead_id = ?", (lead_id,))
+        offer_ids = cursor.execute("DELETE FROM offers WHERE lead_id = ? RETURNING id", (lead_id,)).fetchall()
+        cursor.execute("DELETE FROM leads WHERE id = ?", (lead_id,))
+        for (offer_id,) in offer_ids:
+            _invalidate(_offer_cache, offer_id)
+        _invalidate(_lead_cache, int(lead_id))
+
+def _lead_page_filter(alias: str, before_id=None, after_id=None, status=None, created_from=None, created_to=None):
+    """Build the keyset WHERE clause shared by the lead listing queries.
+
+    Returns ``(where_sql, params, order)``. Date bounds are translated into
+    id bounds through idx_leads_created_at (ids grow with created_at), so
+    every filter combination stays an index range on leads.id or
+    (status, id) instead of an OFFSET scan. ``created_to`` is exclusive.
+    """
+    where = []
+    params = []
+    if before_id is not None:
+        where.append(f"{alias}.id < ?")
+        params.append(int(before_id))
+    if after_id is not None:
+        where.append(f"{alias}.id > ?")
+        params.append(int(after_id))
+    if status:
+        where.append(f"{alias}.status = ?")
+        params.append(status)
+    if created_from is not None:
+        where.append(
+            f"{alias}.id >= (SELECT id FROM leads WHERE created_at >= ? ORDER BY created_at, id LIMIT 1)"
+        )
+        params.append(str(created_from))
+    if created_to is not None:
+        where.append(
+            f"{alias}.id <= (SELECT id FROM leads WHERE created_at < ? ORDER BY created_at DESC, id DESC LIMIT 1)"
+        )
+        params.append(str(created_to))
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+    order = "ASC" if after_id is not None and before_id is None else "DESC"
+    return where_sql, params, order
+
+
+def get_latest_leads(limit: int = 10, before_id: int = None, after_id: int = None,
+                     status: str = None, created_from=None, created_to=None):
+    """Page through leads newest first using keyset pagination on id.
+
+    ``before_id`` / ``after_id`` are the cursors of the neighbouring pages,
+    ``status`` filters on lead status and ``created_from`` / ``created_to``
+    bound created_at (e.g. '2026-01-01' or a datetime, upper bound exclusive).
+    """
+    where_sql, params, order = _lead_page_filter(
+        "leads", before_id, after_id, status, created_from, created_to
+    )
+    params.append(int(limit))
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT
+                id,
+                created_at,
+                language,
+                plate_number,
+                owner_name,
+                is_owner,
+                curb_weight,
+                completeness,
+                missing_parts,
+                transport_method,
+                needs_tow,
+                tow_address,
+                location_latitude,
+                location_longitude,
+                photos,
+                phone_number,
+                telegram_username,
+                user_id,
+                status
+            FROM leads
+            {where_sql}
+            ORDER BY id {order}
+            LIMIT ?
+            """,
+            params,
+        )
+        rows = [dict(r) for r in cursor.fetchall()]
+    if order == "ASC":
+        rows.reverse()
+    return rows
+
+def get_lead_summaries(limit: int = 10, before_id: int = None, after_id: int = None, status: str = None,
+                       created_from=None, created_to=None):
+    """Latest leads with their photo count and latest offer in one statement.
+
+    Takes the same keyset cursors and filters as get_latest_leads. Rows
+    always come back newest first.
+    """
+    where_sql, params, order = _lead_page_filter(
+        "l", before_id, after_id, status, created_from, created_to
     )
+    params.append(int(limit))
 
-    rows = cursor.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
-
-def save_lead(user_data, user_id, username=None):
-    """Save a new lead to the database"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-
-    try:
-        plate = user_data.get('plate_number')
-        phone = user_data.get('phone_number')
-        if plate and phone:
-            cursor.execute(
-                """
-                SELECT id, created_at
-                FROM leads
-                WHERE user_id = ? AND plate_number = ? AND phone_number = ?
-                ORDER BY id DESC
-                LIMIT 1
-                """,
-                (user_id, plate, phone),
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            f"""
+            SELECT
+                l.id,
+                l.created_at,
+                l.language,
+                l.plate_number,
+                l.owner_name,
+                l.is_owner,
+                l.curb_weight,
+                l.completeness,
+                l.missing_parts,
+                l.transport_method,
+                l.needs_tow,
+                l.tow_address,
+                l.location_latitude,
+                l.location_longitude,
+                l.phone_number,
+                l.telegram_username,
+                l.user_id,
+                l.status,
+                (SELECT COUNT(*) FROM photos p WHERE p.lead_id = l.id) AS photo_count,
+                o.id AS offer_id,
+                o.offer_amount,
+                o.status AS offer_status
+            FROM leads l
+            LEFT JOIN offers o ON o.id = (
+                SELECT MAX(id) FROM offers WHERE lead_id = l.id
             )
-            row = cursor.fetchone()
-            if row:
-                lead_id_existing, created_at = row
-                cursor.execute(
-                    "SELECT (strftime('%s','now') - strftime('%s', ?))",
-                    (created_at,),
-                )
-                age_seconds = cursor.fetchone()[0]
-                if age_seconds is not None and int(age_seconds) < 120:
-                    conn.close()
-                    return lead_id_existing
-    except Exception:
-        pass
-    
-    cursor.execute('''
-        INSERT INTO leads (
-            user_id, telegram_username, language, plate_number, owner_name,
-            is_owner, curb_weight, completeness, missing_parts, transport_method, needs_tow,
-            tow_address, location_latitude, location_longitude, photos, phone_number
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        user_id,
-        username,
-        user_data.get('language'),
-        user_data.get('plate_number'),
-        user_data.get('owner_name'),
-        1 if user_data.get('is_owner') else 0 if user_data.get('is_owner') is not None else None,
-        user_data.get('curb_weight'),
-        user_data.get('completeness'),
-        user_data.get('missing_parts'),
-        user_data.get('transport_method'),
-        user_data.get('needs_tow'),
-        user_data.get('tow_address'),
-        user_data.get('location', {}).get('latitude'),
-        user_data.get('location', {}).get('longitude'),
-        ','.join(user_data.get('photos', [])),
-        user_data.get('phone_number')
-    ))
-    
-    lead_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
-    
-    return lead_id
+            {where_sql}
+            ORDER BY l.id {order}
+            LIMIT ?
+            """,
+            params,
+        )
+        rows = [dict(r) for r in cursor.fetchall()]
+    if order == "ASC":
+        rows.reverse()
+    return rows
+
+def save_lead(user_data, user_id, username=None, session_id=None):
+    """Save a new lead to the database.
+
+    ``session_id`` is the conversation's idempotency key: saving the same
+    session again (e.g. a redelivered phone-number update) returns the id
+    of the lead already created for it instead of inserting a duplicate.
+    """
+    with get_db_connection() as conn:
+        row = conn.execute('''
+            INSERT INTO leads (
+                user_id, telegram_username, language, plate_number, owner_name,
+                is_owner, curb_weight, completeness, missing_parts, transport_method, needs_tow,
+                tow_address, location_latitude, location_longitude, photos, phone_number, session_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (session_id) WHERE session_id IS NOT NULL
+            DO UPDATE SET session_id = excluded.session_id
+            RETURNING id
+        ''', (
+            user_id,
+            username,
+            user_data.get('language'),
+            user_data.get('plate_number'),
+            user_data.get('owner_name'),
+            1 if user_data.get('is_owner') else 0 if user_data.get('is_owner') is not None else None,
+            user_data.get('curb_weight'),
+            user_data.get('completeness'),
+            user_data.get('missing_parts'),
+            user_data.get('transport_method'),
+            user_data.get('needs_tow'),
+            user_data.get('tow_address'),
+            user_data.get('location', {}).get('latitude'),
+            user_data.get('location', {}).get('longitude'),
+            ','.join(user_data.get('photos', [])),
+            user_data.get('phone_number'),
+            session_id,
+        )).fetchone()
+        # The row is uncommitted until the scope exits; keep it out of the cache
+        _invalidate(_lead_cache, row[0])
+
+    return row[0]
+
+# Lead columns the admin lead card shows; copied into its outbox payload
+LEAD_CARD_FIELDS = (
+    "language", "plate_number", "owner_name", "phone_number", "curb_weight",
+    "is_owner", "completeness", "transport_method",
+)
+
+def finalize_lead(user_data, user_id, username=None, session_id=None):
+    """Create a lead from a finished conversation in one transaction.
+
+    Inserts the lead (idempotent per ``session_id``), moves the session's
+    photos onto it, reads back the stored row and queues the admin lead
+    card in the outbox, all on one connection. The outbox payload carries
+    the card's lead fields and photo file_ids, so delivering it needs no
+    further reads. Returns ``(lead, photos)`` where ``lead`` is the
+    get_lead_by_id row and ``photos`` the get_lead_photos list, so callers
+    need not re-query.
+    """
+    with get_db_connection():
+        lead_id = save_lead(user_data, user_id, username, session_id)
+        photos = move_session_photos_to_lead(user_id, session_id, lead_id) if session_id else []
+        if not photos:
+            # Duplicate submission: the session was already moved to this lead
+            photos = get_lead_photos(lead_id)
+        lead = get_lead_by_id(lead_id)
+        enqueue_notification(
+            "lead_card",
+            f"lead_card:{lead_id}",
+            {
+                "lead_id": lead_id,
+                "phone_number": user_data.get("phone_number") or lead.get("phone_number"),
+                "lead": {field: lead.get(field) for field in LEAD_CARD_FIELDS},
+                "photos": [{"file_id": photo["file_id"], "file_path": photo["file_path"]} for photo in photos],
+            },
+        )
+    return lead, photos
 
-def get_lead_photos_legacy_from_leads_column(lead_id: int) -> list[dict]:
-    """Legacy helper: reads comma-separated file_ids from leads.photos."""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
+def enqueue_notification(kind: str, dedupe_key: str, payload: dict) -> bool:
+    """Add an outbound notification to the outbox, due immediately.
 
-    cursor.execute(
-        "SELECT photos FROM leads WHERE id = ?",
-        (lead_id,)
-    )
+    A notification whose ``dedupe_key`` is already in the outbox (pending,
+    sent or failed) is not added again; returns False in that case.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.execute(
+            """
+            INSERT INTO outbox (kind, dedupe_key, payload, next_attempt_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT (dedupe_key) DO NOTHING
+            """,
+            (kind, dedupe_key, json.dumps(payload, ensure_ascii=False), time.time()),
+        )
+        return cursor.rowcount == 1
+
+def get_due_notifications(limit: int = 20) -> list[dict]:
+    """Pending outbox rows whose next attempt is due, oldest first"""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT id, kind, dedupe_key, payload, attempts FROM outbox
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY next_attempt_at, id
+            LIMIT ?
+            """,
+            (time.time(), int(limit)),
+        ).fetchall()
+    return [
+        {"id": row[0], "kind": row[1], "dedupe_key": row[2], "payload": json.loads(row[3]), "attempts": row[4]}
+        for row in rows
+    ]
+
+def mark_notification_sent(notification_id: int) -> None:
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE outbox SET status = 'sent', attempts = attempts + 1, sent_at = CURRENT_TIMESTAMP, last_error = NULL WHERE id = ?",
+            (int(notification_id),),
+        )
+
+def reschedule_notification(notification_id: int, delay: float, error: str, count_attempt: bool = True,
+                            give_up: bool = False) -> None:
+    """Retry a notification after ``delay`` seconds, or mark it failed when ``give_up``"""
+    with get_db_connection() as conn:
+        conn.execute(
+            """
+            UPDATE outbox SET
+                status = ?,
+                attempts = attempts + ?,
+                next_attempt_at = ?,
+                last_error = ?
+            WHERE id = ?
+            """,
+            ("failed" if give_up else "pending", 1 if count_attempt else 0, time.time() + delay, error, int(notification_id)),
+        )
+
+def get_outbox_counts() -> dict:
+    """Number of outbox rows per status"""
+    with get_db_connection() as conn:
+        rows = conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+    return {row[0]: row[1] for row in rows}
+
+def set_counter_offer_wait(chat_id: int, offer_id: int, lead_id: int) -> None:
+    """Record that ``chat_id`` is expected to answer ``offer_id`` with a price"""
+    with get_db_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO counter_offer_waits (chat_id, offer_id, lead_id) VALUES (?, ?, ?)
+            ON CONFLICT (chat_id) DO UPDATE SET
+                offer_id = excluded.offer_id,
+                lead_id = excluded.lead_id,
+                created_at = CURRENT_TIMESTAMP
+            """,
+            (int(chat_id), int(offer_id), int(lead_id)),
+        )
+
+def clear_counter_offer_wait(chat_id: int) -> None:
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM counter_offer_waits WHERE chat_id = ?", (int(chat_id),))
+
+def get_counter_offer_waits() -> dict:
+    """All pending counter-offer waits as ``{chat_id: (offer_id, lead_id, created_at)}`` (unix time)"""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT chat_id, offer_id, lead_id, CAST(strftime('%s', created_at) AS INTEGER) FROM counter_offer_waits"
+        ).fetchall()
+    return {row[0]: (row[1], row[2], row[3]) for row in rows}
+
+def delete_expired_counter_offer_waits(max_age_seconds: float) -> list:
+    """Delete counter-offer waits older than ``max_age_seconds``; returns their chat ids"""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "DELETE FROM counter_offer_waits WHERE created_at < datetime('now', ?) RETURNING chat_id",
+            (f"-{int(max_age_seconds)} seconds",),
+        ).fetchall()
+    return [row[0] for row in rows]
+
+def get_persistence_rows(namespace: str) -> dict:
+    """Pickled bot persistence records of one namespace as ``{key: bytes}``"""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT key, data FROM bot_persistence WHERE namespace = ?", (namespace,)
+        ).fetchall()
+    return {row[0]: bytes(row[1]) for row in rows}
+
+def save_persistence_rows(rows: list) -> None:
+    """Upsert ``(namespace, key, data)`` bot persistence records"""
+    with get_db_connection() as conn:
+        conn.executemany(
+            """
+            INSERT INTO bot_persistence (namespace, key, data) VALUES (?, ?, ?)
+            ON CONFLICT (namespace, key) DO UPDATE SET
+                data = excluded.data,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            rows,
+        )
+
+def get_persistence_last_seen() -> dict:
+    """Newest ``updated_at`` (unix time) of each user's persistence records.
+
+    user_data and chat_data rows are keyed by the user (private chat) id,
+    conversation rows by a JSON ``[chat_id, user_id]`` key. Records are only
+    rewritten when they change, so this is a lower bound on last activity.
+    """
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT namespace, key, CAST(strftime('%s', updated_at) AS INTEGER)
+            FROM bot_persistence
+            WHERE namespace IN ('user_data', 'chat_data') OR namespace LIKE 'conversation:%'
+            """
+        ).fetchall()
+    last_seen = {}
+    for namespace, key, updated_at in rows:
+        try:
+            user_id = int(json.loads(key)[-1]) if namespace.startswith("conversation:") else int(key)
+        except (ValueError, TypeError, IndexError):
+            continue
+        last_seen[user_id] = max(last_seen.get(user_id, 0), updated_at or 0)
+    return last_seen
+
+def delete_persistence_row(namespace: str, key: str) -> None:
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM bot_persistence WHERE namespace = ? AND key = ?", (namespace, key))
+
+def count_persistence_rows() -> int:
+    with get_db_connection() as conn:
+        return conn.execute("SELECT COUNT(*) FROM bot_persistence").fetchone()[0]
+
+def get_media_file_id(sha256: str):
+    """Telegram file_id of a previously uploaded static asset, by content hash"""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT file_id FROM media_cache WHERE sha256 = ?", (sha256,)).fetchone()
+    return row[0] if row else None
+
+def set_media_file_id(sha256: str, path: str, file_id: str) -> None:
+    with get_db_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO media_cache (sha256, path, file_id) VALUES (?, ?, ?)
+            ON CONFLICT (sha256) DO UPDATE SET
+                path = excluded.path,
+                file_id = excluded.file_id,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            (sha256, path, file_id),
+        )
+
+def delete_media_file_id(sha256: str) -> None:
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM media_cache WHERE sha256 = ?", (sha256,))
 
-    row = cursor.fetchone()
-    conn.close()
+def get_command_digest(scope: str):
+    """Digest of the command list last applied to a set_my_commands scope"""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT digest FROM bot_command_scopes WHERE scope = ?", (scope,)).fetchone()
+    return row[0] if row else None
+
+def set_command_digest(scope: str, digest: str) -> None:
+    with get_db_connection() as conn:
+        conn.execute(
+            """
+            INSERT INTO bot_command_scopes (scope, digest) VALUES (?, ?)
+            ON CONFLICT (scope) DO UPDATE SET digest = excluded.digest, updated_at = CURRENT_TIMESTAMP
+            """,
+            (scope, digest),
+        )
+
+def delete_stale_command_scopes(max_age_seconds: float) -> list:
+    """Delete per-chat command scopes unchanged for ``max_age_seconds``; returns their keys"""
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            """
+            DELETE FROM bot_command_scopes
+            WHERE scope LIKE '{"chat_id":%' AND updated_at < datetime('now', ?)
+            RETURNING scope
+            """,
+            (f"-{int(max_age_seconds)} seconds",),
+        ).fetchall()
+    return [row[0] for row in rows]
+
+def get_lead_photos_legacy_from_leads_column(lead_id: int) -> list[dict]:
+    """Legacy helper: reads comma-separated file_ids from leads.photos."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT photos FROM leads WHERE id = ?",
+            (lead_id,)
+        )
+        row = cursor.fetchone()
 
     if not row or not row[0]:
         return []
@@ -409,16 +932,20 @@ def get_lead_photos_legacy_from_leads_column(lead_id: int) -> list[dict]:
     return [{"file_id": file_id.strip()} for file_id in photo_file_ids if file_id.strip()]
 
 
+def get_lead_id_by_session(session_id: str):
+    """Id of the lead already created for a conversation session, or None"""
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT id FROM leads WHERE session_id = ?", (session_id,)).fetchone()
+    return row[0] if row else None
+
+
 def get_lead_by_user_id(user_id):
     """Get leads for a specific user"""
-    conn = sqlite3.connect('romupunkt.db')
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        SELECT * FROM leads WHERE user_id = ? ORDER BY created_at DESC
-    ''', (user_id,))
-    
-    lead = cursor.fetchone()
-    conn.close()
-    
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT * FROM leads WHERE user_id = ? ORDER BY created_at DESC
+        ''', (user_id,))
+        lead = cursor.fetchone()
+
     return lead
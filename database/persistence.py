@@ -0,0 +1,181 @@
+"""
+python-telegram-bot persistence stored per record in romupunkt.db
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+from database import models
+from database.aio import get_persistence_rows, save_persistence_rows, delete_persistence_row
+
+logger = logging.getLogger(__name__)
+
+_USER_DATA = "user_data"
+_CHAT_DATA = "chat_data"
+_BOT_DATA = "bot_data"
+_CALLBACK_DATA = "callback_data"
+_CONVERSATION = "conversation:"
+
+
+def _digest(blob: bytes) -> bytes:
+    return hashlib.blake2b(blob, digest_size=16).digest()
+
+
+def _conversation_key(key: tuple) -> str:
+    return json.dumps(list(key))
+
+
+class SQLitePersistence(BasePersistence):
+    """BasePersistence that keeps one pickled row per user, chat and conversation.
+
+    Unlike PicklePersistence, which rewrites the whole file for every change,
+    only records whose pickle differs from what was last stored are written.
+    The application hands us all dirty records of one persistence run at
+    once; they go through the database executor concurrently and so are
+    committed as one batch. Write counts and timings are available from
+    ``stats()`` and are logged on ``flush()``.
+
+    PTB reads every record during ``Application.initialize``, so records are
+    loaded once at startup rather than on first access.
+    """
+
+    def __init__(self, store_data: PersistenceInput = None, update_interval: float = 60):
+        super().__init__(store_data=store_data, update_interval=update_interval)
+        # Digest of the stored pickle per (namespace, key), to skip unchanged records
+        self._digests = {}
+        self._stats = {
+            "loaded": 0,
+            "written": 0,
+            "unchanged": 0,
+            "deleted": 0,
+            "write_ms_total": 0.0,
+            "write_ms_max": 0.0,
+        }
+
+    async def _load(self, namespace: str) -> dict:
+        rows = await get_persistence_rows(namespace)
+        records = {}
+        for key, blob in rows.items():
+            self._digests[(namespace, key)] = _digest(blob)
+            records[key] = pickle.loads(blob)
+        self._stats["loaded"] += len(records)
+        return records
+
+    async def _store(self, namespace: str, key: str, data) -> None:
+        blob = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        digest = _digest(blob)
+        if self._digests.get((namespace, key)) == digest:
+            self._stats["unchanged"] += 1
+            return
+
+        started = time.perf_counter()
+        await save_persistence_rows([(namespace, key, blob)])
+        elapsed = (time.perf_counter() - started) * 1000
+        self._digests[(namespace, key)] = digest
+        self._stats["written"] += 1
+        self._stats["write_ms_total"] += elapsed
+        self._stats["write_ms_max"] = max(self._stats["write_ms_max"], elapsed)
+
+    async def _drop(self, namespace: str, key: str) -> None:
+        if self._digests.pop((namespace, key), None) is None:
+            return
+        await delete_persistence_row(namespace, key)
+        self._stats["deleted"] += 1
+
+    async def get_user_data(self) -> dict:
+        return {int(key): data for key, data in (await self._load(_USER_DATA)).items()}
+
+    async def get_chat_data(self) -> dict:
+        return {int(key): data for key, data in (await self._load(_CHAT_DATA)).items()}
+
+    async def get_bot_data(self) -> dict:
+        return (await self._load(_BOT_DATA)).get("", {})
+
+    async def get_callback_data(self):
+        return (await self._load(_CALLBACK_DATA)).get("")
+
+    async def get_conversations(self, name: str) -> dict:
+        records = await self._load(_CONVERSATION + name)
+        return {tuple(json.loads(key)): state for key, state in records.items()}
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        await self._store(_USER_DATA, str(user_id), data)
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        await self._store(_CHAT_DATA, str(chat_id), data)
+
+    async def update_bot_data(self, data: dict) -> None:
+        await self._store(_BOT_DATA, "", data)
+
+    async def update_callback_data(self, data) -> None:
+        await self._store(_CALLBACK_DATA, "", data)
+
+    async def update_conversation(self, name: str, key: tuple, new_state) -> None:
+        if new_state is None:
+            await self._drop(_CONVERSATION + name, _conversation_key(key))
+        else:
+            await self._store(_CONVERSATION + name, _conversation_key(key), new_state)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        await self._drop(_USER_DATA, str(user_id))
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        await self._drop(_CHAT_DATA, str(chat_id))
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        pass
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        pass
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        pass
+
+    async def flush(self) -> None:
+        # Records are written as they are updated; just report what was done
+        logger.info("Persistence flushed: %s", self.stats())
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot["records"] = len(self._digests)
+        return snapshot
+
+
+def import_pickle_persistence(path: str) -> int:
+    """Copy a single-file PicklePersistence into bot_persistence once.
+
+    Runs only while the table is empty; the pickle file is renamed to
+    ``<path>.migrated`` afterwards. Returns the number of records imported.
+    """
+    if not os.path.exists(path) or models.count_persistence_rows():
+        return 0
+
+    try:
+        with open(path, "rb") as fh:
+            data = pickle.load(fh)
+    except Exception:
+        logger.exception("Could not read %s; starting with empty persistence", path)
+        return 0
+
+    rows = []
+    for namespace in (_USER_DATA, _CHAT_DATA):
+        for key, record in (data.get(namespace) or {}).items():
+            rows.append((namespace, str(key), pickle.dumps(record, pickle.HIGHEST_PROTOCOL)))
+    if data.get(_BOT_DATA):
+        rows.append((_BOT_DATA, "", pickle.dumps(data[_BOT_DATA], pickle.HIGHEST_PROTOCOL)))
+    if data.get(_CALLBACK_DATA):
+        rows.append((_CALLBACK_DATA, "", pickle.dumps(data[_CALLBACK_DATA], pickle.HIGHEST_PROTOCOL)))
+    for name, conversations in (data.get("conversations") or {}).items():
+        for key, state in conversations.items():
+            rows.append((_CONVERSATION + name, _conversation_key(key), pickle.dumps(state, pickle.HIGHEST_PROTOCOL)))
+
+    models.save_persistence_rows(rows)
+    os.replace(path, path + ".migrated")
+    logger.info("Imported %d persistence records from %s", len(rows), path)
+    return len(rows)
@@ -0,0 +1,176 @@
+"""
+Bounded SQLite connection pool shared by every helper in database/models.py
+"""
+
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the pool timeout"""
+
+
+class ConnectionPool:
+    """A fixed-size pool of reusable SQLite connections.
+
+    Connections are opened lazily up to ``size``, configured once with the
+    given pragmas and handed out in autocommit mode; transaction scoping is
+    left to the caller (see ``database.models.get_db_connection``). A
+    connection that has been idle longer than ``health_check_interval`` is
+    probed with ``SELECT 1`` on checkout and replaced if the probe fails.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        size: int = 5,
+        pragmas: dict | None = None,
+        timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+    ):
+        self.path = path
+        self.size = max(1, int(size))
+        self.pragmas = dict(pragmas or {})
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+        self._stats = {
+            "checkouts": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "created": 0,
+            "discarded": 0,
+            "health_checks": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=self.timeout,
+        )
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        with self._lock:
+            self._stats["created"] += 1
+        return conn
+
+    def _is_healthy(self, conn: sqlite3.Connection) -> bool:
+        with self._lock:
+            self._stats["health_checks"] += 1
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._opened -= 1
+            self._stats["discarded"] += 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+
+        try:
+            conn, idle_since = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._opened -= 1
+                    raise
+
+            started = time.perf_counter()
+            try:
+                conn, idle_since = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._stats["timeouts"] += 1
+                raise PoolTimeout(f"No database connection available after {self.timeout}s")
+            waited_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats["waits"] += 1
+                self._stats["wait_ms_total"] += waited_ms
+                self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], waited_ms)
+
+        if time.monotonic() - idle_since > self.health_check_interval and not self._is_healthy(conn):
+            logger.warning("Discarding unhealthy database connection")
+            self._discard(conn)
+            with self._lock:
+                self._opened += 1
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        if self._closed:
+            self._discard(conn)
+            return
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self):
+        """Check a connection out of the pool for the duration of the block"""
+        conn = self._acquire()
+        with self._lock:
+            self._stats["checkouts"] += 1
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage counters"""
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self.size
+            snapshot["open"] = self._opened
+        snapshot["idle"] = self._idle.qsize()
+        snapshot["in_use"] = snapshot["open"] - snapshot["idle"]
+        return snapshot
+
+    def close(self) -> None:
+        """Close every idle connection; busy ones are closed on release"""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
@@ -1,19 +1,113 @@
 import re
 import logging
+import time
 
-from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram import Message, Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
+from telegram.ext.filters import MessageFilter
 
-from config import ADMIN_TELEGRAM_USER_ID
-from database.models import (
-    get_latest_leads, get_lead_by_id, create_offer, get_offer_by_id, 
-    update_offer_status, update_lead_status, delete_lead_by_id, get_lead_photos
+from config import ADMIN_TELEGRAM_USER_ID, COUNTER_OFFER_WAIT_TTL_HOURS
+from database.aio import (
+    get_lead_summaries, get_lead_by_id, create_offer, get_offer_by_id,
+    update_offer_status, update_lead_status, delete_lead_by_id, get_db_diagnostics,
+    set_counter_offer_wait, clear_counter_offer_wait, delete_expired_counter_offer_waits, get_outbox_counts,
 )
+from database.executor import get_executor
+from handlers.catalog import catalog
+from handlers.outbox import outbox
+from handlers.ratelimit import PRIORITY_BULK, priority_kwargs
+from handlers.router import callback_router
+from handlers.tasks import task_pipeline
 
 logger = logging.getLogger(__name__)
 
+LEADS_PAGE_SIZE = 10
+_STATUS_EMOJI = {"pending": "🔵", "replied": "💬", "accepted": "✅", "rejected": "❌", "archived": "🗑️"}
+_STATUS_FILTERS = ("all", "pending", "replied", "accepted", "rejected", "archived")
+
+
+class CounterOfferWaits(MessageFilter):
+    """Filter matching messages from chats that owe us a counter-offer price.
+
+    Holds ``{chat_id: (offer_id, lead_id, created_at)}`` in memory so the
+    check is a dict lookup; the counter_offer_waits table keeps it across
+    restarts (see ``load``). Mutate it only through _await_counter_offer and
+    _clear_counter_offer so memory and database stay in step.
+
+    A wait older than ``ttl`` seconds no longer matches, so a customer who
+    never sends a price is not answered "please send a number" forever.
+    ``expire`` (run by the idle sweeper) deletes such waits from memory and
+    from the table.
+    """
+
+    def __init__(self, ttl: float):
+        super().__init__(name="CounterOfferWaits")
+        self.ttl = ttl
+        self._waits = {}
+
+    def _live(self, entry, now: float) -> bool:
+        return entry[2] >= now - self.ttl
+
+    def load(self, waits: dict) -> None:
+        now = time.time()
+        self._waits = {chat_id: entry for chat_id, entry in waits.items() if self._live(entry, now)}
+
+    def get(self, chat_id: int):
+        entry = self._waits.get(chat_id)
+        if entry is None or not self._live(entry, time.time()):
+            return None
+        return entry[0], entry[1]
+
+    def set(self, chat_id: int, offer_id: int, lead_id: int) -> None:
+        self._waits[chat_id] = (offer_id, lead_id, time.time())
+
+    def discard(self, chat_id: int) -> None:
+        self._waits.pop(chat_id, None)
+
+    async def expire(self) -> int:
+        """Drop waits older than ``ttl``; returns how many were dropped"""
+        now = time.time()
+        expired = {chat_id for chat_id, entry in self._waits.items() if not self._live(entry, now)}
+        expired.update(await delete_expired_counter_offer_waits(self.ttl))
+        for chat_id in expired:
+            self._waits.pop(chat_id, None)
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._waits)
+
+    def filter(self, message: Message) -> bool:
+        return self.get(message.chat_id) is not None
+
+
+awaiting_counter_offer = CounterOfferWaits(COUNTER_OFFER_WAIT_TTL_HOURS * 3600)
+
+
+async def _await_counter_offer(chat_id: int, offer_id: int, lead_id: int) -> None:
+    awaiting_counter_offer.set(int(chat_id), int(offer_id), int(lead_id))
+    await set_counter_offer_wait(chat_id, offer_id, lead_id)
+
+
+async def _clear_counter_offer(chat_id: int) -> None:
+    if awaiting_counter_offer.get(int(chat_id)) is None:
+        return
+    awaiting_counter_offer.discard(int(chat_id))
+    await clear_counter_offer_wait(chat_id)
+
+
+async def deliver_admin_message(context: ContextTypes.DEFAULT_TYPE, payload: dict) -> None:
+    """Outbox sender for plain admin alerts (counter-offers, offer responses)"""
+    reply_markup = payload.get("reply_markup")
+    await context.bot.send_message(
+        chat_id=payload["chat_id"],
+        text=payload["text"],
+        reply_markup=InlineKeyboardMarkup.de_json(reply_markup, context.bot) if reply_markup else None,
+    )
+
 
 def _format_lead(lead: dict, compact: bool = False) -> str:
+    """Render a lead row from get_lead_summaries (photo_count comes with the row)"""
     lead_id = lead.get("id")
     created_at = lead.get("created_at")
     plate = lead.get("plate_number")
@@ -30,22 +124,20 @@ def _format_lead(lead: dict, compact: bool = False) -> str:
     lat = lead.get("location_latitude")
     lon = lead.get("location_longitude")
     
-    # Get photos from the photos table, not the leads table
-    try:
-        photos = get_lead_photos(lead_id)
-        photos_count = len(photos)
-    except Exception:
-        photos_count = 0
-    
+    photos_count = lead.get("photo_count") or 0
     status = lead.get("status", "pending")
 
     # Status badge
-    status_emoji = {"pending": "🔵", "replied": "💬", "accepted": "✅", "rejected": "❌", "archived": "🗑️"}
-    badge = status_emoji.get(status, "🔵")
+    badge = _STATUS_EMOJI.get(status, "🔵")
 
     if compact:
         # One-line summary for quick scanning
-        return f"{badge} #{lead_id} {plate} · {name} · {phone} ({photos_count}📷)"
+        summary = f"{badge} #{lead_id} {plate} · {name} · {phone} ({photos_count}📷)"
+        offer_amount = lead.get("offer_amount")
+        if offer_amount is not None:
+            amount_txt = f"{int(offer_amount)}" if float(offer_amount).is_integer() else f"{offer_amount}"
+            summary += f" · {amount_txt}€ {lead.get('offer_status')}"
+        return summary
 
     if completeness in ("complete", "missing"):
         if lang == "ee":
@@ -132,7 +224,96 @@ def _format_lead(lead: dict, compact: bool = False) -> str:
     return "\n".join(lines)
 
 
+async def _load_leads_page(state: dict) -> tuple[list, bool, bool]:
+    """Fetch one browser page (newest first) plus whether older/newer pages exist"""
+    size = state["page_size"]
+    status = None if state["status"] == "all" else state["status"]
+    before_id = state.get("before_id")
+    after_id = state.get("after_id")
+
+    leads = await get_lead_summaries(size + 1, before_id=before_id, after_id=after_id, status=status)
+    if after_id is not None:
+        has_newer = len(leads) > size
+        leads = leads[-size:]
+        has_older = True
+    else:
+        has_older = len(leads) > size
+        leads = leads[:size]
+        has_newer = before_id is not None
+    return leads, has_older, has_newer
+
+
+def _leads_page_text(leads: list, status: str) -> str:
+    title = "📋 Päringud" if status == "all" else f"📋 Päringud: {_STATUS_EMOJI.get(status, '')} {status}"
+    if not leads:
+        return f"{title}\n\nNo leads yet."
+    # Newest at bottom
+    lines = [_format_lead(lead, compact=True) for lead in reversed(leads)]
+    return f"{title} (#{leads[-1]['id']}–#{leads[0]['id']})\n\n" + "\n".join(lines)
+
+
+def _leads_page_keyboard(leads: list, status: str, has_older: bool, has_newer: bool) -> InlineKeyboardMarkup:
+    rows = []
+    for lead in reversed(leads):
+        lead_id = lead.get("id")
+        rows.append([
+            InlineKeyboardButton(f"💬 #{lead_id}", callback_data=f"admin_reply:{lead_id}"),
+            InlineKeyboardButton(f"🗑️ #{lead_id}", callback_data=f"admin_archive:{lead_id}"),
+            InlineKeyboardButton(f"❌ #{lead_id}", callback_data=f"admin_delete:{lead_id}"),
+        ])
+
+    nav = []
+    if has_older and leads:
+        nav.append(InlineKeyboardButton("⬅️ Vanemad", callback_data=f"leads_page:{status}:o{leads[-1]['id']}"))
+    if has_newer and leads:
+        nav.append(InlineKeyboardButton("Uuemad ➡️", callback_data=f"leads_page:{status}:n{leads[0]['id']}"))
+    elif has_newer:
+        nav.append(InlineKeyboardButton("🔄 Uusimad", callback_data=f"leads_page:{status}:0"))
+    if nav:
+        rows.append(nav)
+
+    filters_row = []
+    for value in _STATUS_FILTERS:
+        label = "Kõik" if value == "all" else _STATUS_EMOJI[value]
+        if value == status:
+            label = f"• {label}"
+        filters_row.append(InlineKeyboardButton(label, callback_data=f"leads_page:{value}:0"))
+    rows.append(filters_row)
+    return InlineKeyboardMarkup(rows)
+
+
+async def _render_leads_page(state: dict) -> tuple[str, InlineKeyboardMarkup]:
+    leads, has_older, has_newer = await _load_leads_page(state)
+    return (
+        _leads_page_text(leads, state["status"]),
+        _leads_page_keyboard(leads, state["status"], has_older, has_newer),
+    )
+
+
+def _is_leads_browser_message(context: ContextTypes.DEFAULT_TYPE, message) -> bool:
+    state = context.chat_data.get("leads_browser")
+    return bool(state and message is not None and state.get("message_id") == message.message_id)
+
+
+async def _refresh_leads_browser(q, context: ContextTypes.DEFAULT_TYPE) -> None:
+    if q.message is None:
+        return
+    text, reply_markup = await _render_leads_page(context.chat_data["leads_browser"])
+    try:
+        await context.bot.edit_message_text(
+            chat_id=q.message.chat_id,
+            message_id=q.message.message_id,
+            text=text,
+            reply_markup=reply_markup,
+            **priority_kwargs(context.bot, PRIORITY_BULK),
+        )
+    except BadRequest as exc:
+        if "message is not modified" not in str(exc).lower():
+            raise
+
+
 async def leads_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Open the paginated lead browser: /leads [page size] [status]"""
     user = update.effective_user
     if ADMIN_TELEGRAM_USER_ID <= 0:
         await update.message.reply_text("ADMIN_TELEGRAM_USER_ID is not set on the server.")
@@ -145,44 +326,115 @@ async def leads_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     chat = update.effective_chat
     chat_type = getattr(chat, "type", None)
 
-    limit = 10
-    if context.args:
+    page_size = LEADS_PAGE_SIZE
+    status = "all"
+    for arg in context.args or []:
+        if arg in _STATUS_FILTERS:
+            status = arg
+            continue
         try:
-            limit = int(context.args[0])
+            page_size = int(arg)
         except ValueError:
-            limit = 10
+            page_size = LEADS_PAGE_SIZE
+
+    if page_size < 1:
+        page_size = 1
+    if page_size > 30:
+        page_size = 30
+
+    state = {"page_size": page_size, "status": status, "before_id": None, "after_id": None}
+    text, reply_markup = await _render_leads_page(state)
+    message = await context.bot.send_message(
+        chat_id=update.message.chat_id,
+        text=text,
+        reply_markup=reply_markup,
+        **priority_kwargs(context.bot, PRIORITY_BULK),
+    )
+    state["message_id"] = message.message_id
+    context.chat_data["leads_browser"] = state
+
+    if chat_type is not None and chat_type != "private":
+        await update.message.reply_text("Saadan privaatsõnumisse.")
+    return
 
-    if limit < 1:
-        limit = 1
-    if limit > 30:
-        limit = 30
 
-    leads = get_latest_leads(limit)
-    if not leads:
-        await update.message.reply_text("No leads yet.")
+async def leads_page_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Flip pages / change the status filter of the lead browser in place"""
+    q = update.callback_query
+    if q is None:
+        return
+
+    user = update.effective_user
+    if user is None or ADMIN_TELEGRAM_USER_ID <= 0 or user.id != ADMIN_TELEGRAM_USER_ID:
+        await q.answer("Not authorized.", show_alert=True)
         return
 
-    # Reverse order: newest at bottom
-    leads = list(reversed(leads))
+    data = q.data or ""
+    try:
+        _, status, cursor = data.split(":", 2)
+        if status not in _STATUS_FILTERS:
+            raise ValueError(status)
+        before_id = int(cursor[1:]) if cursor.startswith("o") else None
+        after_id = int(cursor[1:]) if cursor.startswith("n") else None
+    except ValueError:
+        await q.answer("Error", show_alert=True)
+        return
 
-    for lead in leads:
-        lead_id = lead.get("id")
-        status = lead.get("status", "pending")
-        status_emoji = {"pending": "🔵", "replied": "💬", "accepted": "✅", "rejected": "❌", "archived": "🗑️"}
-        badge = status_emoji.get(status, "🔵")
-        text = f"{badge} #{lead_id} {lead.get('plate_number')} · {lead.get('owner_name')} · {lead.get('phone_number')}"
-        reply_markup = InlineKeyboardMarkup([
-            [
-                InlineKeyboardButton("💬 Vasta", callback_data=f"admin_reply:{lead_id}"),
-                InlineKeyboardButton("🗑️ Arhiveeri", callback_data=f"admin_archive:{lead_id}"),
-                InlineKeyboardButton("🗑️ Kustuta", callback_data=f"admin_delete:{lead_id}"),
-            ]
-        ])
-        await update.message.reply_text(text, reply_markup=reply_markup)
+    state = context.chat_data.get("leads_browser") or {"page_size": LEADS_PAGE_SIZE}
+    state.update(status=status, before_id=before_id, after_id=after_id)
+    if q.message is not None:
+        state["message_id"] = q.message.message_id
+    context.chat_data["leads_browser"] = state
+
+    await q.answer()
+    await _refresh_leads_browser(q, context)
 
-    if chat_type is not None and chat_type != "private":
-        await update.message.reply_text("Saadan privaatsõnumisse.")
-    return
+
+def _fmt_stats(stats: dict, digits: int = 1) -> str:
+    """Render a stats dict as ``k=v, ...`` with floats rounded to ``digits``"""
+    return ", ".join(f"{k}={v:.{digits}f}" if isinstance(v, float) else f"{k}={v}" for k, v in stats.items())
+
+
+async def dbstats_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Admin diagnostics: active SQLite pragmas, schema version, pool, executor and callback metrics"""
+    user = update.effective_user
+    if user is None or ADMIN_TELEGRAM_USER_ID <= 0 or user.id != ADMIN_TELEGRAM_USER_ID:
+        await update.message.reply_text("Not authorized.")
+        return
+
+    diag = await get_db_diagnostics()
+    lines = [f"🗄 {diag['path']} (schema v{diag['schema_version']})", ""]
+    lines += [f"{name}: {value}" for name, value in diag["pragmas"].items()]
+    lines.append("")
+    lines.append("Pool: " + _fmt_stats(diag["pool"]))
+    lines.append("Photo writes: " + _fmt_stats(diag["photo_writes"]))
+    for name, stats in diag["cache"].items():
+        lines.append(f"Cache {name}: " + _fmt_stats(stats, digits=2))
+    lines.append(f"Counter-offer waits: {len(awaiting_counter_offer)}")
+    for job in context.job_queue.get_jobs_by_name("idle_sweeper") if context.job_queue else ():
+        lines.append("Idle sweeper: " + _fmt_stats(job.data.stats()))
+    persistence = context.application.persistence
+    if persistence is not None and hasattr(persistence, "stats"):
+        lines.append("Persistence: " + _fmt_stats(persistence.stats()))
+    outbox_parts = [_fmt_stats(await get_outbox_counts()), _fmt_stats(outbox.stats())]
+    lines.append("Outbox: " + ", ".join(part for part in outbox_parts if part))
+    rate_limiter = getattr(context.bot, "rate_limiter", None)
+    if rate_limiter is not None and hasattr(rate_limiter, "stats"):
+        for name, stats in rate_limiter.stats().items():
+            lines.append(f"Send {name}: " + _fmt_stats(stats))
+    update_processor = context.application.update_processor
+    if hasattr(update_processor, "stats"):
+        lines.append("Updates: " + _fmt_stats(update_processor.stats()))
+    lines.append(f"Background tasks queued: {task_pipeline.queued()}")
+    for name, stats in task_pipeline.stats().items():
+        lines.append(f"Task {name}: " + _fmt_stats(stats))
+    for action, stats in callback_router.stats().items():
+        lines.append(
+            f"Callback {action}: calls={stats['calls']}, errors={stats['errors']}, "
+            f"avg_ms={stats['ms_total'] / stats['calls']:.1f}, max_ms={stats['ms_max']:.1f}"
+        )
+    lines.append("Executor: " + _fmt_stats(get_executor().stats()))
+    await update.message.reply_text("\n".join(lines))
 
 
 def _parse_price(text: str) -> float | None:
@@ -205,38 +457,11 @@ def _parse_price(text: str) -> float | None:
 def _offer_text(lang: str, amount: float) -> str:
     """Clean, official offer message"""
     amount_txt = f"{int(amount)}" if float(amount).is_integer() else f"{amount:.2f}".rstrip("0").rstrip(".")
-    if lang == "ee":
-        return f"🏁 ROMUPUNKT\n\nAmetlik pakkumine: {amount_txt}€\n\nSisaldab lammutusteenust ja lammutustõendit."
-    if lang == "ru":
-        return f"🏁 ROMUPUNKT\n\nОфициальное предложение: {amount_txt}€\n\nВключает утилизацию и справку о ликвидации."
-    return f"🏁 ROMUPUNKT\n\nOfficial offer: {amount_txt}€\n\nIncludes dismantling service and destruction certificate."
+    return catalog.text("offer_text", lang, amount=amount_txt)
 
 
 def _offer_keyboard(lang: str, offer_id: int) -> InlineKeyboardMarkup:
-    if lang == "ee":
-        yes = "✅ JAH"
-        no = "❌ EI"
-        counter = "💬 Teen oma pakkumise"
-    elif lang == "ru":
-        yes = "✅ ДА"
-        no = "❌ НЕТ"
-        counter = "💬 Моя цена"
-    else:
-        yes = "✅ YES"
-        no = "❌ NO"
-        counter = "💬 Counter offer"
-
-    return InlineKeyboardMarkup(
-        [
-            [
-                InlineKeyboardButton(yes, callback_data=f"offer_accept:{offer_id}"),
-                InlineKeyboardButton(no, callback_data=f"offer_reject:{offer_id}"),
-            ],
-            [
-                InlineKeyboardButton(counter, callback_data=f"offer_counter:{offer_id}"),
-            ],
-        ]
-    )
+    return catalog.inline_keyboard("offer", lang, offer_id=offer_id)
 
 
 async def offer_counter_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -255,12 +480,12 @@ async def offer_counter_callback(update: Update, context: ContextTypes.DEFAULT_T
         await q.answer("Error", show_alert=True)
         return
 
-    offer = get_offer_by_id(offer_id)
+    offer = await get_offer_by_id(offer_id)
     if not offer:
         await q.answer("Offer not found", show_alert=True)
         return
 
-    lead = get_lead_by_id(int(offer.get("lead_id")))
+    lead = await get_lead_by_id(int(offer.get("lead_id")))
     if not lead:
         await q.answer("Lead not found", show_alert=True)
         return
@@ -276,21 +501,10 @@ async def offer_counter_callback(update: Update, context: ContextTypes.DEFAULT_T
         offer_id,
         lead.get("id"),
     )
-    awaiting_offer_id = int(offer_id)
-    awaiting_lead_id = int(lead.get("id"))
-    context.user_data["awaiting_counter_offer_offer_id"] = awaiting_offer_id
-    context.user_data["awaiting_counter_offer_lead_id"] = awaiting_lead_id
-    context.chat_data["awaiting_counter_offer_offer_id"] = awaiting_offer_id
-    context.chat_data["awaiting_counter_offer_lead_id"] = awaiting_lead_id
+    await _await_counter_offer(int(lead.get("user_id")), int(offer_id), int(lead.get("id")))
     await q.answer()
 
-    lang = lead.get("language")
-    if lang == "ee":
-        prompt = "Palun kirjuta oma hind (näiteks 250 või 250€)."
-    elif lang == "ru":
-        prompt = "Напишите вашу цену (например 250 или 250€)."
-    else:
-        prompt = "Type your price (e.g. 250 or 250€)."
+    prompt = catalog.text("counter_offer_prompt", lead.get("language"))
 
     from telegram import ForceReply
     await context.bot.send_message(
@@ -301,18 +515,21 @@ async def offer_counter_callback(update: Update, context: ContextTypes.DEFAULT_T
 
 
 async def counter_offer_message(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Forward a user's counter-offer price to the admin.
+
+    Registered behind the ``awaiting_counter_offer`` filter, so it only
+    runs for chats that were actually asked for a price.
+    """
     # If admin is currently replying with a price offer, do not let counter-offer logic
     # intercept the admin's numeric message (common when admin is also the testing user).
     if context.chat_data.get("awaiting_price_lead_id"):
         return
 
-    offer_id = context.user_data.get("awaiting_counter_offer_offer_id")
-    lead_id = context.user_data.get("awaiting_counter_offer_lead_id")
-    if not offer_id or not lead_id:
-        offer_id = context.chat_data.get("awaiting_counter_offer_offer_id")
-        lead_id = context.chat_data.get("awaiting_counter_offer_lead_id")
-    if not offer_id or not lead_id:
+    chat_id = update.effective_chat.id
+    wait = awaiting_counter_offer.get(chat_id)
+    if wait is None:
         return
+    offer_id, lead_id = wait
 
     user = update.effective_user
     logger.info(
@@ -325,12 +542,9 @@ async def counter_offer_message(update: Update, context: ContextTypes.DEFAULT_TY
     if user is None:
         return
 
-    lead = get_lead_by_id(int(lead_id))
+    lead = await get_lead_by_id(int(lead_id))
     if not lead:
-        context.user_data.pop("awaiting_counter_offer_offer_id", None)
-        context.user_data.pop("awaiting_counter_offer_lead_id", None)
-        context.chat_data.pop("awaiting_counter_offer_offer_id", None)
-        context.chat_data.pop("awaiting_counter_offer_lead_id", None)
+        await _clear_counter_offer(chat_id)
         return
 
     if int(user.id) != int(lead.get("user_id")):
@@ -346,19 +560,10 @@ async def counter_offer_message(update: Update, context: ContextTypes.DEFAULT_TY
 
     lang = lead.get("language")
     if amount is None or amount <= 0:
-        if lang == "ee":
-            msg = "Palun sisesta number (näiteks 250)."
-        elif lang == "ru":
-            msg = "Пожалуйста, введите число (например 250)."
-        else:
-            msg = "Please send a number (e.g. 250)."
-        await update.message.reply_text(msg)
+        await update.message.reply_text(catalog.text("counter_offer_invalid", lang))
         return
 
-    context.user_data.pop("awaiting_counter_offer_offer_id", None)
-    context.user_data.pop("awaiting_counter_offer_lead_id", None)
-    context.chat_data.pop("awaiting_counter_offer_offer_id", None)
-    context.chat_data.pop("awaiting_counter_offer_lead_id", None)
+    await _clear_counter_offer(chat_id)
 
     if ADMIN_TELEGRAM_USER_ID and ADMIN_TELEGRAM_USER_ID > 0:
         plate = lead.get("plate_number")
@@ -378,15 +583,14 @@ async def counter_offer_message(update: Update, context: ContextTypes.DEFAULT_TY
             ADMIN_TELEGRAM_USER_ID,
             lead.get("id"),
         )
-        await context.bot.send_message(chat_id=ADMIN_TELEGRAM_USER_ID, text=admin_text, reply_markup=reply_markup)
+        await outbox.notify(
+            context,
+            "counter_offer",
+            f"counter_offer:{offer_id}:{update.message.message_id}",
+            {"chat_id": ADMIN_TELEGRAM_USER_ID, "text": admin_text, "reply_markup": reply_markup.to_dict()},
+        )
 
-    if lang == "ee":
-        ack = "Aitäh! Saatsime teie pakkumise üle."
-    elif lang == "ru":
-        ack = "Спасибо! Мы передали вашу цену."
-    else:
-        ack = "Thanks! We forwarded your price."
-    await update.message.reply_text(ack)
+    await update.message.reply_text(catalog.text("counter_offer_thanks", lang))
     return
 
 
@@ -411,8 +615,11 @@ async def admin_archive_callback(update: Update, context: ContextTypes.DEFAULT_T
         await q.answer("Error", show_alert=True)
         return
 
-    update_lead_status(lead_id, "archived")
+    await update_lead_status(lead_id, "archived")
     await q.answer("Arhiveeritud", show_alert=False)
+    if _is_leads_browser_message(context, q.message):
+        await _refresh_leads_browser(q, context)
+        return
     try:
         await q.edit_message_reply_markup(reply_markup=None)
     except Exception:
@@ -439,8 +646,11 @@ async def admin_delete_callback(update: Update, context: ContextTypes.DEFAULT_TY
         await q.answer("Error", show_alert=True)
         return
 
-    delete_lead_by_id(lead_id)
+    await delete_lead_by_id(lead_id)
     await q.answer("Kustutatud", show_alert=False)
+    if _is_leads_browser_message(context, q.message):
+        await _refresh_leads_browser(q, context)
+        return
     try:
         await q.edit_message_text(text="🗑️ Kustutatud", reply_markup=None)
     except Exception:
@@ -468,10 +678,7 @@ async def admin_lead_action_callback(update: Update, context: ContextTypes.DEFAU
         return
 
     # Ensure stale counter-offer state doesn't hijack the admin's next numeric reply.
-    context.user_data.pop("awaiting_counter_offer_offer_id", None)
-    context.user_data.pop("awaiting_counter_offer_lead_id", None)
-    context.chat_data.pop("awaiting_counter_offer_offer_id", None)
-    context.chat_data.pop("awaiting_counter_offer_lead_id", None)
+    await _clear_counter_offer(ADMIN_TELEGRAM_USER_ID)
 
     context.chat_data["awaiting_price_lead_id"] = str(lead_id)
     context.user_data["awaiting_price_lead_id"] = str(lead_id)
@@ -519,14 +726,14 @@ async def admin_price_message(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text("Palun sisesta kehtiv hind (näiteks 800€ või 200).")
         return
 
-    lead = get_lead_by_id(int(lead_id))
+    lead = await get_lead_by_id(int(lead_id))
     if not lead:
         context.chat_data.pop("awaiting_price_lead_id", None)
         await update.message.reply_text("Päringut ei leitud.")
         return
 
-    offer_id = create_offer(int(lead_id), float(amount), status="sent")
-    update_lead_status(int(lead_id), "replied")
+    offer_id = await create_offer(int(lead_id), float(amount), status="sent")
+    await update_lead_status(int(lead_id), "replied")
     chat_id = lead.get("user_id")
     lang = lead.get("language")
     
@@ -568,12 +775,12 @@ async def offer_response_callback(update: Update, context: ContextTypes.DEFAULT_
         await q.answer("Error", show_alert=True)
         return
 
-    offer = get_offer_by_id(offer_id)
+    offer = await get_offer_by_id(offer_id)
     if not offer:
         await q.answer("Offer not found", show_alert=True)
         return
 
-    lead = get_lead_by_id(int(offer.get("lead_id")))
+    lead = await get_lead_by_id(int(offer.get("lead_id")))
     if not lead:
         await q.answer("Lead not found", show_alert=True)
         return
@@ -583,8 +790,8 @@ async def offer_response_callback(update: Update, context: ContextTypes.DEFAULT_
         await q.answer("Not allowed", show_alert=True)
         return
 
-    update_offer_status(offer_id, "accepted" if accepted else "rejected")
-    update_lead_status(int(lead.get("id")), "accepted" if accepted else "rejected")
+    await update_offer_status(offer_id, "accepted" if accepted else "rejected")
+    await update_lead_status(int(lead.get("id")), "accepted" if accepted else "rejected")
     await q.answer("OK")
 
     try:
@@ -593,20 +800,7 @@ async def offer_response_callback(update: Update, context: ContextTypes.DEFAULT_
         pass
 
     lang = lead.get("language")
-    if accepted:
-        if lang == "ee":
-            user_msg = "Aitäh! Võtame teiega kohe ühendust."
-        elif lang == "ru":
-            user_msg = "Спасибо! Мы сейчас свяжемся с вами."
-        else:
-            user_msg = "Thank you! We will contact you shortly."
-    else:
-        if lang == "ee":
-            user_msg = "Selge! Aitäh vastuse eest."
-        elif lang == "ru":
-            user_msg = "Понятно! Спасибо за ответ."
-        else:
-            user_msg = "Got it. Thank you for your response."
+    user_msg = catalog.text("offer_accepted_reply" if accepted else "offer_rejected_reply", lang)
 
     if q.message is not None:
         try:
@@ -615,19 +809,9 @@ async def offer_response_callback(update: Update, context: ContextTypes.DEFAULT_
             pass
 
     if not accepted:
-        awaiting_offer_id = int(offer_id)
-        awaiting_lead_id = int(lead.get("id"))
-        context.user_data["awaiting_counter_offer_offer_id"] = awaiting_offer_id
-        context.user_data["awaiting_counter_offer_lead_id"] = awaiting_lead_id
-        context.chat_data["awaiting_counter_offer_offer_id"] = awaiting_offer_id
-        context.chat_data["awaiting_counter_offer_lead_id"] = awaiting_lead_id
+        await _await_counter_offer(int(lead.get("user_id")), int(offer_id), int(lead.get("id")))
 
-        if lang == "ee":
-            prompt = "Kui soovite, kirjutage oma hind (näiteks 250 või 250€)."
-        elif lang == "ru":
-            prompt = "Если хотите, напишите вашу цену (например 250 или 250€)."
-        else:
-            prompt = "If you want, type your price (e.g. 250 or 250€)."
+        prompt = catalog.text("counter_offer_optional_prompt", lang)
 
         from telegram import ForceReply
         try:
@@ -664,10 +848,12 @@ async def offer_response_callback(update: Update, context: ContextTypes.DEFAULT_
             else:
                 status_txt = "REJECTED"
                 pre = "Response to offer"
-        try:
-            await context.bot.send_message(
-                chat_id=ADMIN_TELEGRAM_USER_ID,
-                text=f"{pre} #{offer_id} (päring #{lead.get('id')}): {status_txt}\nNumber: {plate}\nTelefon: {phone}\nPakkumine: {amount}€",
-            )
-        except Exception:
-            pass
+        await outbox.notify(
+            context,
+            "offer_response",
+            f"offer_response:{offer_id}:{'accepted' if accepted else 'rejected'}",
+            {
+                "chat_id": ADMIN_TELEGRAM_USER_ID,
+                "text": f"{pre} #{offer_id} (päring #{lead.get('id')}): {status_txt}\nNumber: {plate}\nTelefon: {phone}\nPakkumine: {amount}€",
+            },
+        )
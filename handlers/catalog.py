@@ -0,0 +1,112 @@
+"""
+Per-language message and keyboard catalog compiled once from locale/*.json
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+_LOCALE_DIR = Path(__file__).resolve().parent.parent / "locale"
+
+LANGUAGES = ("ee", "en", "ru")
+DEFAULT_LANGUAGE = "en"
+
+# Reply keyboards as rows of locale keys, plus ReplyKeyboardMarkup options
+_KEYBOARDS = {
+    "begin": ([["begin_button"]], {"is_persistent": True}),
+    "done": ([["done_button"]], {"is_persistent": False}),
+    "yes_no": ([["yes_button", "no_button"]], {"is_persistent": False}),
+    "logistics": ([["bring_self_button"], ["need_tow_button"]], {"is_persistent": False}),
+    "new_inquiry": ([["new_inquiry_button"]], {"is_persistent": True}),
+    "share": ([["share_button"]], {"is_persistent": True}),
+}
+
+# Language independent keyboards, shared by every language
+_STATIC_KEYBOARDS = {
+    "language": ([["🇪🇪 Eesti", "🇬🇧 English", "🇷🇺 Русский"]], {"is_persistent": True}),
+    "language_list": ([["🇪🇪 Eesti"], ["🇷🇺 Русский"], ["🇬🇧 English"]], {"is_persistent": True}),
+    "country_code": (
+        [["🇪🇪 +372", "🇫🇮 +358", "🇱🇻 +371"], ["🇷🇺 +7", "🇱🇹 +370", "🇸🇪 +46"]],
+        {"is_persistent": True},
+    ),
+}
+
+# Inline keyboards as rows of (locale key, callback_data template)
+_INLINE_KEYBOARDS = {
+    "offer": [
+        [("offer_accept_button", "offer_accept:{offer_id}"), ("offer_reject_button", "offer_reject:{offer_id}")],
+        [("offer_counter_button", "offer_counter:{offer_id}")],
+    ],
+}
+
+
+def _markup(rows: list, options: dict) -> ReplyKeyboardMarkup:
+    return ReplyKeyboardMarkup(
+        [[KeyboardButton(text) for text in row] for row in rows],
+        resize_keyboard=True,
+        **options,
+    )
+
+
+class Catalog:
+    """Strings and reply keyboards looked up by ``(key, lang)``.
+
+    Keyboards are built once when the catalog is loaded. PTB markup objects
+    are immutable, so the same instance is safely sent to every chat.
+    Inline keyboards carry per-message callback data, so only their labels
+    are resolved up front. Unknown languages fall back to DEFAULT_LANGUAGE.
+    """
+
+    def __init__(self, translations: dict):
+        self._texts = translations
+        self._keyboards = {}
+        self._inline_rows = {}
+        for lang, texts in translations.items():
+            for name, (rows, options) in _KEYBOARDS.items():
+                self._keyboards[(name, lang)] = _markup([[texts[key] for key in row] for row in rows], options)
+        for name, (rows, options) in _STATIC_KEYBOARDS.items():
+            markup = _markup(rows, options)
+            for lang in translations:
+                self._keyboards[(name, lang)] = markup
+        for lang, texts in translations.items():
+            for name, rows in _INLINE_KEYBOARDS.items():
+                self._inline_rows[(name, lang)] = [[(texts[key], data) for key, data in row] for row in rows]
+
+    def _lang(self, lang) -> str:
+        return lang if lang in self._texts else DEFAULT_LANGUAGE
+
+    def translations(self, lang) -> dict:
+        return self._texts[self._lang(lang)]
+
+    def text(self, key: str, lang, **fmt) -> str:
+        value = self._texts[self._lang(lang)][key]
+        return value.format(**fmt) if fmt else value
+
+    def texts(self, key: str) -> frozenset:
+        """The value of ``key`` in every language (e.g. to match button presses)"""
+        return frozenset(texts[key] for texts in self._texts.values() if key in texts)
+
+    def keyboard(self, name: str, lang) -> ReplyKeyboardMarkup:
+        return self._keyboards[(name, self._lang(lang))]
+
+    def inline_keyboard(self, name: str, lang, **fmt) -> InlineKeyboardMarkup:
+        """Inline keyboard ``name`` with ``fmt`` filled into its callback data"""
+        rows = self._inline_rows[(name, self._lang(lang))]
+        return InlineKeyboardMarkup(
+            [[InlineKeyboardButton(label, callback_data=data.format(**fmt)) for label, data in row] for row in rows]
+        )
+
+
+def load_catalog(locale_dir: Path = _LOCALE_DIR) -> Catalog:
+    translations = {}
+    for lang in LANGUAGES:
+        with open(locale_dir / f"{lang}.json", "r", encoding="utf-8") as fh:
+            translations[lang] = json.load(fh)
+    return Catalog(translations)
+
+
+catalog = load_catalog()
@@ -0,0 +1,91 @@
+"""
+Memoized set_my_commands: only call the Bot API when a scope's command list changes
+"""
+
+import hashlib
+import json
+import logging
+
+from telegram import Bot, BotCommand, BotCommandScope
+
+from config import CONVERSATION_IDLE_TTL_HOURS
+from database.aio import get_command_digest, set_command_digest, delete_stale_command_scopes
+from database.cache import RowCache
+from handlers.catalog import catalog
+
+logger = logging.getLogger(__name__)
+
+USER_COMMANDS = ("start", "new")
+ADMIN_COMMANDS = USER_COMMANDS + ("leads", "dbstats")
+
+
+def bot_commands(lang, admin: bool = False) -> list:
+    """Command menu for ``lang``, with the admin-only commands if ``admin``"""
+    names = ADMIN_COMMANDS if admin else USER_COMMANDS
+    return [BotCommand(name, catalog.text(f"{name}_command", lang)) for name in names]
+
+
+def _scope_key(scope: BotCommandScope, language_code: str = None) -> str:
+    key = json.dumps(scope.to_dict(), sort_keys=True, separators=(",", ":"))
+    return f"{key}|{language_code}" if language_code else key
+
+
+def _commands_digest(commands: list) -> str:
+    payload = json.dumps([[c.command, c.description] for c in commands], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CommandRegistry:
+    """Remember which command list is applied to each scope.
+
+    The digest of the last list sent for a scope is kept in the
+    bot_command_scopes table, so repeated language selections and restarts
+    skip ``set_my_commands`` when nothing changed. The ``maxsize`` most
+    recently used digests are also cached in memory. ``expire`` (run by the
+    idle sweeper) deletes per-chat scopes unchanged for ``ttl`` seconds;
+    such a chat just gets one extra API call if it comes back. Lists edited
+    outside the bot (e.g. in BotFather) are not noticed; ``forget`` a
+    scope to force the next call through.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 72 * 3600):
+        self.ttl = ttl
+        self._digests = RowCache(maxsize, ttl)
+        self._stats = {"applied": 0, "skipped": 0, "expired": 0}
+
+    async def set_commands(self, bot: Bot, commands: list, scope: BotCommandScope, language_code: str = None) -> bool:
+        """Apply ``commands`` to ``scope`` unless already applied; returns True if the API was called"""
+        key = _scope_key(scope, language_code)
+        digest = _commands_digest(commands)
+        cached = self._digests.get(key)
+        if cached is None:
+            cached = {"digest": await get_command_digest(key)}
+            self._digests.put(key, cached)
+        if cached["digest"] == digest:
+            self._stats["skipped"] += 1
+            return False
+
+        await bot.set_my_commands(commands, scope=scope, language_code=language_code)
+        self._digests.put(key, {"digest": digest})
+        await set_command_digest(key, digest)
+        self._stats["applied"] += 1
+        return True
+
+    def forget(self, scope: BotCommandScope, language_code: str = None) -> None:
+        self._digests.put(_scope_key(scope, language_code), {"digest": None})
+
+    async def expire(self) -> int:
+        """Delete stale per-chat scopes; returns how many were deleted"""
+        scopes = await delete_stale_command_scopes(self.ttl)
+        for key in scopes:
+            self._digests.invalidate(key)
+        self._stats["expired"] += len(scopes)
+        return len(scopes)
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot["cached"] = self._digests.stats()["size"]
+        return snapshot
+
+
+command_registry = CommandRegistry(ttl=CONVERSATION_IDLE_TTL_HOURS * 3600)
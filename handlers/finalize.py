@@ -5,12 +5,15 @@ import re
 from typing import Optional
 from pathlib import Path
 from telegram import Update, InputMediaPhoto
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes, ConversationHandler
-from telegram import ReplyKeyboardMarkup, KeyboardButton
+from telegram import ReplyKeyboardMarkup
 from telegram import InlineKeyboardMarkup, InlineKeyboardButton
 
 from config import ADMIN_TELEGRAM_USER_ID
-from database.models import save_lead, get_lead_photos, get_lead_by_id, move_session_photos_to_lead
+from database.aio import finalize_lead, get_lead_photos, get_lead_by_id, get_lead_id_by_session, get_session_photos
+from handlers.catalog import catalog
+from handlers.outbox import outbox
 from states import PHONE, PHOTOS
 
 
@@ -35,13 +38,7 @@ def _thank_you_message(lang: str) -> str:
     )
 
 def _share_keyboard(lang: str) -> ReplyKeyboardMarkup:
-    if lang == "ee":
-        share_text = "🔗 Jaga sõbraga, kellel on romu hoovis"
-    elif lang == "ru":
-        share_text = "🔗 Поделись с другом, у которого машина на разборку"
-    else:
-        share_text = "🔗 Share with a friend who's scrapping a car"
-    return ReplyKeyboardMarkup([[KeyboardButton(share_text)]], resize_keyboard=True, is_persistent=True)
+    return catalog.keyboard("share", lang)
 
 
 def _display_completeness(lang: str, completeness: Optional[str]) -> Optional[str]:
@@ -69,13 +66,7 @@ def _yes_no(lang: str, val: Optional[bool]) -> Optional[str]:
 
 
 def _new_inquiry_keyboard(lang: str) -> ReplyKeyboardMarkup:
-    if lang == "ee":
-        text = "🔄 Uus päring"
-    elif lang == "ru":
-        text = "🔄 Новая заявка"
-    else:
-        text = "🔄 New inquiry"
-    return ReplyKeyboardMarkup([[KeyboardButton(text)]], resize_keyboard=True, is_persistent=True)
+    return catalog.keyboard("new_inquiry", lang)
 
 
 def _normalize_phone(phone_raw: str) -> Optional[str]:
@@ -97,15 +88,8 @@ async def handle_share_button(update: Update, context: ContextTypes.DEFAULT_TYPE
     # Remove @ if present
     bot_username = bot_username.lstrip('@')
     share_url = f"https://t.me/share?url=https://t.me/{bot_username}"
-    if lang == "ee":
-        msg = f"Teada sõpru, kellel on vana auto romu hoovis! Saada neile kiirelt link:\nhttps://t.me/{bot_username}"
-        btn_text = "🔗 Jagada Telegramis"
-    elif lang == "ru":
-        msg = f"Расскажи друзьям, у которых старая машина на разборку! Быстро отправь им ссылку:\nhttps://t.me/{bot_username}"
-        btn_text = "🔗 Поделиться в Telegram"
-    else:
-        msg = f"Tell friends who have an old car to scrap! Send them the link quick:\nhttps://t.me/{bot_username}"
-        btn_text = "🔗 Share on Telegram"
+    msg = catalog.text("share_message", lang, link=f"https://t.me/{bot_username}")
+    btn_text = catalog.text("share_link_button", lang)
     try:
         await update.message.reply_text(msg, reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton(btn_text, url=share_url)]]))
     except Exception:
@@ -113,25 +97,7 @@ async def handle_share_button(update: Update, context: ContextTypes.DEFAULT_TYPE
         await update.message.reply_text(msg)
 
 def _phone_keyboard(lang: str) -> ReplyKeyboardMarkup:
-    if lang == "ee":
-        keyboard = [
-            [KeyboardButton("🇪🇪 +372"), KeyboardButton("🇫🇮 +358"), KeyboardButton("🇱🇻 +371")],
-            [KeyboardButton("🇷🇺 +7"), KeyboardButton("🇱🇹 +370"), KeyboardButton("🇸🇪 +46")],
-        ]
-        prompt = "Vali riigi kood:"
-    elif lang == "ru":
-        keyboard = [
-            [KeyboardButton("🇪🇪 +372"), KeyboardButton("🇫🇮 +358"), KeyboardButton("🇱🇻 +371")],
-            [KeyboardButton("🇷🇺 +7"), KeyboardButton("🇱🇹 +370"), KeyboardButton("🇸🇪 +46")],
-        ]
-        prompt = "Выберите код страны:"
-    else:
-        keyboard = [
-            [KeyboardButton("🇪🇪 +372"), KeyboardButton("🇫🇮 +358"), KeyboardButton("🇱🇻 +371")],
-            [KeyboardButton("🇷🇺 +7"), KeyboardButton("🇱🇹 +370"), KeyboardButton("🇸🇪 +46")],
-        ]
-        prompt = "Choose country code:"
-    return ReplyKeyboardMarkup(keyboard, resize_keyboard=True, is_persistent=True), prompt
+    return catalog.keyboard("country_code", lang), catalog.text("country_code_prompt", lang)
 
 async def phone_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Accept direct phone number input without country code picker"""
@@ -143,12 +109,7 @@ async def phone_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     lang = context.user_data.get("language", "en")
 
     if phone_raw.startswith("✅"):
-        if lang == "ee":
-            await update.message.reply_text("📞 Palun sisesta oma telefoninumber (näiteks 51234567).")
-        elif lang == "ru":
-            await update.message.reply_text("📞 Пожалуйста, отправьте номер телефона (например 51234567).")
-        else:
-            await update.message.reply_text("📞 Please send your phone number (example 51234567).")
+        await update.message.reply_text(catalog.text("phone_example", lang))
         return PHONE
     
     # Remove all non-digit characters
@@ -156,12 +117,7 @@ async def phone_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     
     # Validate phone number (5-15 digits)
     if len(digits_only) < 5 or len(digits_only) > 15:
-        if lang == "ee":
-            await update.message.reply_text("Palun sisestage kehtiv telefoninumber (5-15 numbrit).")
-        elif lang == "ru":
-            await update.message.reply_text("Пожалуйста, введите действительный номер телефона (5-15 цифр).")
-        else:
-            await update.message.reply_text("Please enter a valid phone number (5-15 digits).")
+        await update.message.reply_text(catalog.text("phone_invalid", lang))
         return PHONE
     
     # Store the raw phone number as provided by user
@@ -170,96 +126,51 @@ async def phone_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> in
     
     # Check if we have session photos
     session_id = context.user_data.get('session_id')
-    if not session_id:
-        if context.user_data.get("language") == "ee":
-            msg = "📸 Palun laadi üles vähemalt üks pilt enne kui jätkad."
-        elif context.user_data.get("language") == "ru":
-            msg = "📸 Пожалуйста, отправьте хотя бы одно фото перед тем как продолжить."
-        else:
-            msg = "📸 Please upload at least one photo before continuing."
-        await update.message.reply_text(msg)
-        return PHOTOS
+    photos = []
     if session_id:
-        from database.models import get_session_photos, move_session_photos_to_lead
-        user_id = update.effective_user.id
-        photos = get_session_photos(user_id, session_id)
-        if not photos:
-            if context.user_data.get("language") == "ee":
-                msg = "📸 Palun laadi üles vähemalt üks pilt enne kui jätkad."
-            elif context.user_data.get("language") == "ru":
-                msg = "📸 Пожалуйста, отправьте хотя бы одно фото перед тем как продолжить."
-            else:
-                msg = "📸 Please upload at least one photo before continuing."
-            await update.message.reply_text(msg)
-            return PHOTOS
-        
-        # Create lead with all data
-        logger.info("Creating lead with %d session photos", len(photos))
-        user = update.effective_user
-        lead_id = save_lead(context.user_data, user.id, getattr(user, "username", None))
-        
-        # Move photos from session to permanent storage BEFORE notification
-        move_session_photos_to_lead(user_id, session_id, lead_id)
-        
-        #  STEP 4 - HARD FAIL IF PHOTOS ARE ZERO
-        photos = get_lead_photos(lead_id)
-        if not photos:
-            logger.error("Lead %s finalized without photos; continuing without crashing", lead_id)
-        
-        logger.info("ATTACHED %d PHOTOS to lead %d", len(photos), lead_id)
-        
-        # CRITICAL: Send live Lead Card to admin IMMEDIATELY after database commit
-        logger.info("Triggering live admin notification for lead %d", lead_id)
-        await send_lead_card(context, lead_id, phone_raw)
-        
-        if context.user_data.get("language") == "ee":
-            msg = "Aitäh! Võtame teiega ühendust pakkumisega."
-        elif context.user_data.get("language") == "ru":
-            msg = "Спасибо! Мы свяжемся с вами с предложением."
-        else:
-            msg = "Thank you! We'll contact you with an offer."
-        
-        await update.message.reply_text(msg, reply_markup=_new_inquiry_keyboard(lang))
-        context.user_data.clear()
-        return ConversationHandler.END
+        photos = await get_session_photos(update.effective_user.id, session_id)
+    # A redelivered update finds its photos already moved to the session's lead
+    if not photos and not (session_id and await get_lead_id_by_session(session_id)):
+        await update.message.reply_text(catalog.text("photos_required", lang))
+        return PHOTOS
 
-    # No photos, create lead now
+    # Create lead and move photos from session to permanent storage BEFORE notification
+    logger.info("Creating lead with %d session photos", len(photos))
     user = update.effective_user
-    lead_id = save_lead(context.user_data, user.id, getattr(user, "username", None))
-    context.user_data["lead_id"] = lead_id
-    logger.info("Saved lead with ID %s for user %s", lead_id, user.id)
+    lead, photos = await finalize_lead(context.user_data, user.id, getattr(user, "username", None), session_id)
+    lead_id = lead["id"]
     
-    # CRITICAL: Send live Lead Card to admin IMMEDIATELY after database commit
-    logger.info("Triggering live admin notification for lead %d (no photos)", lead_id)
+    #  STEP 4 - HARD FAIL IF PHOTOS ARE ZERO
+    if not photos:
+        logger.error("Lead %s finalized without photos; continuing without crashing", lead_id)
     
-    await send_lead_card(context, lead_id, phone_raw)
-
-    if context.user_data.get("language") == "ee":
-        msg = "Aitäh! Võtame teiega ühendust pakkumisega."
-    elif context.user_data.get("language") == "ru":
-        msg = "Спасибо! Мы свяжемся с вами с предложением."
-    else:
-        msg = "Thank you! We'll contact you with an offer."
-
-    await update.message.reply_text(msg, reply_markup=_new_inquiry_keyboard(context.user_data.get("language", "en")))
+    logger.info("ATTACHED %d PHOTOS to lead %d", len(photos), lead_id)
+    
+    # Answer the customer first; finalize_lead committed the lead card to the outbox
+    await update.message.reply_text(catalog.text("lead_thanks", lang), reply_markup=_new_inquiry_keyboard(lang))
     context.user_data.clear()
+
+    logger.info("Dispatching live admin notification for lead %d", lead_id)
+    await outbox.kick(context)
     return ConversationHandler.END
 
-async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone_number: str) -> None:
-    """Send professional Lead Card with media group and rich HTML caption"""
-    # 🔥 DEBUG: Find the real file
-    import inspect
-    logger.error("🔥 ADMIN NOTIFIER FILE: %s", inspect.getfile(inspect.currentframe()))
-    
-    # 🔥🔥🔥 send_lead_card ACTIVE — THIS MUST APPEAR 🔥🔥🔥
-    logger.error("🔥🔥🔥 send_lead_card ACTIVE — THIS MUST APPEAR 🔥🔥🔥")
-    print("🔥🔥🔥 send_lead_card ACTIVE — THIS MUST APPEAR 🔥🔥🔥")
-    
+async def send_lead_card(
+    context: ContextTypes.DEFAULT_TYPE,
+    lead_id: int,
+    phone_number: str,
+    lead: Optional[dict] = None,
+    photos: Optional[list] = None,
+) -> None:
+    """Send professional Lead Card with media group and rich HTML caption.
+
+    ``lead`` and ``photos`` as returned by finalize_lead skip the re-query.
+    """
     if not ADMIN_TELEGRAM_USER_ID or ADMIN_TELEGRAM_USER_ID <= 0:
         logger.warning("ADMIN_TELEGRAM_USER_ID not set or invalid")
         return
     
-    lead = get_lead_by_id(lead_id)
+    if lead is None:
+        lead = await get_lead_by_id(lead_id)
     if not lead:
         logger.error("Lead %d not found for admin notification", lead_id)
         return
@@ -268,15 +179,15 @@ async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone
     lang = lead.get("language") or "en"
     
     # 🔴 REQUIRED: Load photos for this lead
-    photos = get_lead_photos(lead_id)
-    logger.info(f"📸 DEBUG: Retrieved {len(photos)} photos for lead {lead_id}")
+    if photos is None:
+        photos = await get_lead_photos(lead_id)
+    logger.debug(f"📸 Retrieved {len(photos)} photos for lead {lead_id}")
     
-    # Debug: Log photo file_ids
     if photos:
         for i, photo in enumerate(photos):
-            logger.info(f"📸 DEBUG: Photo {i+1}: {photo['file_id']}")
+            logger.debug(f"📸 Photo {i+1}: {photo['file_id']}")
     else:
-        logger.warning(f"📸 DEBUG: No photos found for lead {lead_id}")
+        logger.warning(f"📸 No photos found for lead {lead_id}")
     
     # Build inquiry form with HTML formatting
     if lang == "ee":
@@ -337,11 +248,11 @@ async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone
         for i, photo_dict in enumerate(photos):
             # 🔴 PATCH 3: Safe photo access (BLOCKER #3 FIXED)
             file_id = photo_dict["file_id"] if isinstance(photo_dict, dict) else photo_dict[0]
-            logger.info(f"📸 CRITICAL: Processing photo {i+1}/{len(photos)}: {file_id}")
+            logger.debug(f"📸 Processing photo {i+1}/{len(photos)}: {file_id}")
             
             if i == 0:
                 # First photo gets caption
-                logger.info(f"📸 CRITICAL: Adding photo {i+1} with caption")
+                logger.debug(f"📸 Adding photo {i+1} with caption")
                 media.append(
                     InputMediaPhoto(
                         media=file_id,
@@ -351,20 +262,21 @@ async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone
                 )
             else:
                 # Remaining photos without caption
-                logger.info(f"📸 CRITICAL: Adding photo {i+1} without caption")
+                logger.debug(f"📸 Adding photo {i+1} without caption")
                 media.append(InputMediaPhoto(media=file_id))
         
-        logger.info(f"📸 CRITICAL: Media group built with {len(media)} items")
+        logger.debug(f"📸 Media group built with {len(media)} items")
         
         # 🔴 REQUIRED: Send the album to admin
         try:
-            logger.info(f"📸 CRITICAL: Sending media group to admin {ADMIN_TELEGRAM_USER_ID}")
+            logger.debug(f"📸 Sending media group to admin {ADMIN_TELEGRAM_USER_ID}")
             await context.bot.send_media_group(
                 chat_id=ADMIN_TELEGRAM_USER_ID,
                 media=media
             )
             logger.info(f"✅ SUCCESS: Media group sent with {len(photos)} photos for lead {lead_id}")
-        except Exception as e:
+        except BadRequest as e:
+            # RetryAfter/NetworkError propagate so the outbox retries the whole card
             logger.error(f"❌ FAILED: Media group failed for lead {lead_id}: {e}")
             logger.info(f"📸 FALLBACK: Sending text message instead")
             await context.bot.send_message(
@@ -382,7 +294,7 @@ async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone
         )
     
     # B4 RULE: Admin actions with plain text phone and correct buttons
-    logger.info(f"📸 CRITICAL: Sending action buttons as separate message for lead {lead_id}")
+    logger.debug(f"📸 Sending action buttons as separate message for lead {lead_id}")
     reply_markup = InlineKeyboardMarkup([
         [
             InlineKeyboardButton("💬 Vasta pakkumisega", callback_data=f"admin_reply:{lead_id}"),
@@ -397,32 +309,39 @@ async def send_lead_card(context: ContextTypes.DEFAULT_TYPE, lead_id: int, phone
     )
     logger.info(f"✅ SUCCESS: Action buttons sent for lead {lead_id}")
 
+async def deliver_lead_card(context: ContextTypes.DEFAULT_TYPE, payload: dict) -> None:
+    """Outbox sender for ``lead_card`` notifications queued by finalize_lead.
+
+    The payload carries the lead fields and photos read in finalize_lead's
+    transaction; rows queued before it did are re-read from the database.
+    """
+    lead_id = int(payload["lead_id"])
+    lead = payload.get("lead")
+    photos = payload.get("photos")
+    phone = payload.get("phone_number")
+    if lead is None:
+        lead = await get_lead_by_id(lead_id)
+        if lead is None:
+            logger.error("Lead %d not found for admin notification", lead_id)
+            return
+    if phone is None:
+        phone = lead.get("phone_number")
+    await send_lead_card(context, lead_id, phone, lead=lead, photos=photos)
+
 async def phone_country_code(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     choice = update.message.text.strip()
     logger.info("phone_country_code received: %s", choice)
     # Extract country code from button text
     match = re.search(r"\+([0-9]+)", choice)
+    lang = context.user_data.get("language", "en")
     if not match:
-        if context.user_data.get("language") == "ee":
-            msg = "Palun vali riigi kood nuppudest."
-        elif context.user_data.get("language") == "ru":
-            msg = "Пожалуйста, выберите код страны из кнопок."
-        else:
-            msg = "Please choose a country code from the buttons."
-        keyboard, _ = _phone_keyboard(context.user_data.get("language", "en"))
-        await update.message.reply_text(msg, reply_markup=keyboard)
+        keyboard, _ = _phone_keyboard(lang)
+        await update.message.reply_text(catalog.text("country_code_invalid", lang), reply_markup=keyboard)
         return PHONE
 
     country_code = "+" + match.group(1)
     context.user_data["phone_country_code"] = country_code
     logger.info("phone_country_code set to: %s", country_code)
 
-    if context.user_data.get("language") == "ee":
-        msg = f"Riikikood {country_code} valitud. Nüüd sisestage kohalik number (näiteks 51234567):"
-    elif context.user_data.get("language") == "ru":
-        msg = f"Код страны {country_code} выбран. Теперь введите местный номер (например 51234567):"
-    else:
-        msg = f"Country code {country_code} selected. Now enter your local number (example 51234567):"
-
-    await update.message.reply_text(msg)
+    await update.message.reply_text(catalog.text("country_code_selected", lang, country_code=country_code))
     return PHONE
@@ -0,0 +1,75 @@
+"""
+Upload-once cache of Telegram file_ids for static assets such as logo.jpg
+"""
+
+import hashlib
+import logging
+import os
+
+from telegram import Message
+from telegram.error import BadRequest
+
+from database.aio import get_media_file_id, set_media_file_id, delete_media_file_id
+
+logger = logging.getLogger(__name__)
+
+
+class MediaCache:
+    """Send static files by their Telegram file_id once they were uploaded.
+
+    The file_id returned by the first upload is stored in the media_cache
+    table under the file's SHA-256, so it survives restarts and a changed
+    file gets uploaded (and cached) again. The hash is recomputed only when
+    the file's size or mtime changes, so a cache hit costs one ``stat``.
+    """
+
+    def __init__(self):
+        self._digests = {}
+        self._file_ids = {}
+        self._stats = {"hits": 0, "uploads": 0, "stale": 0}
+
+    def _digest(self, path: str) -> str:
+        st = os.stat(path)
+        signature = (st.st_size, st.st_mtime_ns)
+        cached = self._digests.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        with open(path, "rb") as fh:
+            digest = hashlib.sha256(fh.read()).hexdigest()
+        self._digests[path] = (signature, digest)
+        return digest
+
+    async def _file_id(self, digest: str):
+        if digest not in self._file_ids:
+            self._file_ids[digest] = await get_media_file_id(digest)
+        return self._file_ids[digest]
+
+    async def reply_photo(self, message: Message, path: str, **kwargs) -> Message:
+        """``message.reply_photo`` for a local file, uploading it at most once"""
+        digest = self._digest(path)
+        file_id = await self._file_id(digest)
+        if file_id:
+            try:
+                sent = await message.reply_photo(photo=file_id, **kwargs)
+                self._stats["hits"] += 1
+                return sent
+            except BadRequest as exc:
+                # file_ids are per bot; a new token or a purged file needs a re-upload
+                logger.warning("Cached file_id for %s rejected (%s); uploading again", path, exc)
+                self._stats["stale"] += 1
+                self._file_ids[digest] = None
+                await delete_media_file_id(digest)
+
+        with open(path, "rb") as fh:
+            sent = await message.reply_photo(photo=fh, **kwargs)
+        self._stats["uploads"] += 1
+        if sent is not None and sent.photo:
+            self._file_ids[digest] = sent.photo[-1].file_id
+            await set_media_file_id(digest, path, self._file_ids[digest])
+        return sent
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+
+media_cache = MediaCache()
@@ -0,0 +1,148 @@
+"""
+Dispatcher for the durable outbox of admin notifications
+"""
+
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from telegram.error import BadRequest, Forbidden, RetryAfter
+from telegram.ext import ContextTypes
+
+from config import OUTBOX_BASE_DELAY, OUTBOX_MAX_DELAY, OUTBOX_MAX_ATTEMPTS
+from database.aio import (
+    enqueue_notification, get_due_notifications, mark_notification_sent, reschedule_notification,
+)
+from handlers.tasks import task_pipeline
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_after_seconds(exc: RetryAfter) -> float:
+    retry_after = exc.retry_after
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+class OutboxDispatcher:
+    """Deliver outbox rows at least once, retrying with exponential backoff.
+
+    Notifications are written to the outbox table first (lead cards in the
+    same transaction as the lead itself) and sent afterwards by the sender
+    registered for their kind. A row is marked sent only after its sender
+    returned, so a crash or a Telegram error leaves it pending for the next
+    ``drain``; a retry may therefore repeat messages that already went out.
+
+    ``RetryAfter`` postpones the row by the requested time and ends the
+    drain, since the flood limit applies to the whole bot. BadRequest and
+    Forbidden will not go away by retrying and fail the row at once; other
+    errors are retried after ``base_delay * 2**attempts`` seconds (capped
+    at ``max_delay``) until ``max_attempts``.
+    """
+
+    def __init__(self, base_delay: float = 5, max_delay: float = 900, max_attempts: int = 15, batch_size: int = 20):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_attempts = max(1, int(max_attempts))
+        self.batch_size = max(1, int(batch_size))
+        self._senders = {}
+        self._lock = asyncio.Lock()
+        self._again = False
+        self._stats = {
+            "sent": 0,
+            "retried": 0,
+            "rate_limited": 0,
+            "failed": 0,
+            "deduplicated": 0,
+            "send_ms_max": 0.0,
+        }
+
+    def register(self, kind: str, sender) -> None:
+        """Register ``async sender(context, payload)`` for notifications of ``kind``"""
+        if kind in self._senders:
+            raise ValueError(f"Outbox sender for {kind!r} already registered")
+        self._senders[kind] = sender
+
+    async def notify(self, context: ContextTypes.DEFAULT_TYPE, kind: str, dedupe_key: str, payload: dict) -> bool:
+        """Add a notification to the outbox and start delivering it"""
+        added = await enqueue_notification(kind, dedupe_key, payload)
+        if not added:
+            self._stats["deduplicated"] += 1
+        await self.kick(context)
+        return added
+
+    async def kick(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Drain the outbox on the background task pipeline"""
+        await task_pipeline.submit("outbox", self.drain, context)
+
+    def _backoff(self, attempts: int) -> float:
+        return min(self.max_delay, self.base_delay * (2 ** attempts))
+
+    async def drain(self, context: ContextTypes.DEFAULT_TYPE) -> int:
+        """Send every due notification; returns the number delivered"""
+        if self._lock.locked():
+            # The running drain picks up whatever was queued meanwhile
+            self._again = True
+            return 0
+
+        delivered = 0
+        async with self._lock:
+            while True:
+                self._again = False
+                rows = await get_due_notifications(self.batch_size)
+                if not rows:
+                    if self._again:
+                        continue
+                    break
+                for row in rows:
+                    outcome = await self._deliver(context, row)
+                    if outcome is None:
+                        return delivered
+                    delivered += outcome
+        return delivered
+
+    async def _deliver(self, context: ContextTypes.DEFAULT_TYPE, row: dict):
+        """Send one row: 1 if delivered, 0 if rescheduled or failed, None if rate limited"""
+        started = time.perf_counter()
+        try:
+            sender = self._senders.get(row["kind"])
+            if sender is None:
+                raise LookupError(f"no sender registered for {row['kind']!r}")
+            await sender(context, row["payload"])
+        except RetryAfter as exc:
+            delay = _retry_after_seconds(exc)
+            logger.warning("Outbox rate limited on %s; retrying in %.0fs", row["dedupe_key"], delay)
+            await reschedule_notification(row["id"], delay, str(exc), count_attempt=False)
+            self._stats["rate_limited"] += 1
+            return None
+        except (BadRequest, Forbidden) as exc:
+            logger.error("Outbox notification %s rejected: %s", row["dedupe_key"], exc)
+            await reschedule_notification(row["id"], 0, str(exc), give_up=True)
+            self._stats["failed"] += 1
+            return 0
+        except Exception as exc:
+            attempts = row["attempts"] + 1
+            give_up = attempts >= self.max_attempts
+            delay = self._backoff(row["attempts"])
+            if give_up:
+                logger.error("Outbox notification %s failed %d times; giving up: %s", row["dedupe_key"], attempts, exc)
+                self._stats["failed"] += 1
+            else:
+                logger.warning("Outbox notification %s failed (%s); retrying in %.0fs", row["dedupe_key"], exc, delay)
+                self._stats["retried"] += 1
+            await reschedule_notification(row["id"], delay, f"{type(exc).__name__}: {exc}", give_up=give_up)
+            return 0
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self._stats["send_ms_max"] = max(self._stats["send_ms_max"], elapsed)
+        await mark_notification_sent(row["id"])
+        self._stats["sent"] += 1
+        return 1
+
+    def stats(self) -> dict:
+        return dict(self._stats)
+
+
+outbox = OutboxDispatcher(OUTBOX_BASE_DELAY, OUTBOX_MAX_DELAY, OUTBOX_MAX_ATTEMPTS)
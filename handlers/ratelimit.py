@@ -0,0 +1,204 @@
+"""
+Outbound Bot API rate limiter: global and per-chat token buckets with priority classes
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Lower value is served first; pass as ``rate_limit_args`` to override the default
+PRIORITY_CUSTOMER = 0
+PRIORITY_ADMIN = 1
+PRIORITY_BULK = 2
+
+_PRIORITY_NAMES = {PRIORITY_CUSTOMER: "customer", PRIORITY_ADMIN: "admin", PRIORITY_BULK: "bulk"}
+
+
+def priority_kwargs(bot, priority: int) -> dict:
+    """``rate_limit_args`` for a call on ``bot``; empty when it has no rate limiter (ExtBot rejects it then)"""
+    return {"rate_limit_args": priority} if getattr(bot, "rate_limiter", None) is not None else {}
+
+# Idle per-chat buckets are dropped once there are more than this many
+_MAX_IDLE_BUCKETS = 1000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    def full(self) -> bool:
+        return self.tokens >= self.capacity
+
+
+class PriorityRateLimiter(BaseRateLimiter[int]):
+    """Throttle requests addressed to a chat so the bot stays under Telegram's limits.
+
+    Every request with a ``chat_id`` (messages, media, edits) needs a token
+    from the global bucket and from its chat's bucket. Waiting requests are
+    served by priority class, then in arrival order. A request blocked only
+    by its own chat's bucket does not hold up requests for other chats.
+    Requests without a chat (answerCallbackQuery, setMyCommands, ...) are
+    not throttled; getUpdates never reaches the rate limiter.
+
+    The priority is ``rate_limit_args`` when given. Otherwise requests to
+    ``admin_chat_id`` are PRIORITY_ADMIN and all others PRIORITY_CUSTOMER.
+    A RetryAfter from Telegram pauses all throttled sending for the
+    requested time. The request is then retried up to ``max_retries`` times
+    before the error is raised to the caller.
+    """
+
+    def __init__(
+        self,
+        overall_rate: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+        max_retries: int = 1,
+        admin_chat_id: int = 0,
+    ):
+        self.overall_rate = overall_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max(0, int(max_retries))
+        self.admin_chat_id = admin_chat_id
+        self._global = TokenBucket(overall_rate, overall_rate)
+        self._chats = {}
+        self._waiters = []
+        self._seq = itertools.count()
+        self._timer = None
+        self._paused_until = 0.0
+        self._stats = {
+            name: {"sent": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0} for name in _PRIORITY_NAMES.values()
+        }
+        self._queue_max = 0
+        self._retry_after = 0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            if len(self._chats) > _MAX_IDLE_BUCKETS:
+                now = time.monotonic()
+                for key in [key for key, b in self._chats.items() if b.wait_time(now) == 0 and b.full()]:
+                    del self._chats[key]
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _arm(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if self._timer is not None:
+            if self._timer.when() <= when:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._schedule)
+
+    def _schedule(self) -> None:
+        """Release every waiter that can send now, in priority order; re-arm for the rest"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        if now < self._paused_until:
+            self._arm(self._paused_until - now)
+            return
+
+        self._waiters.sort(key=lambda w: (w[0], w[1]))
+        remaining = []
+        next_wake = None
+        for waiter in self._waiters:
+            priority, _, chat_id, future, queued_at = waiter
+            if future.done():
+                continue
+            bucket = self._chat_bucket(chat_id)
+            wait = max(self._global.wait_time(now), bucket.wait_time(now))
+            if wait == 0:
+                self._global.take()
+                bucket.take()
+                stats = self._stats[_PRIORITY_NAMES.get(priority, "bulk")]
+                waited = (now - queued_at) * 1000
+                stats["sent"] += 1
+                stats["wait_ms_total"] += waited
+                stats["wait_ms_max"] = max(stats["wait_ms_max"], waited)
+                future.set_result(None)
+                continue
+            remaining.append(waiter)
+            next_wake = wait if next_wake is None else min(next_wake, wait)
+
+        self._waiters = remaining
+        if remaining:
+            self._arm(next_wake)
+
+    async def _acquire(self, chat_id, priority: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((priority, next(self._seq), chat_id, future, time.monotonic()))
+        self._queue_max = max(self._queue_max, len(self._waiters))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _pause(self, exc: RetryAfter) -> None:
+        retry_after = exc.retry_after
+        seconds = retry_after.total_seconds() if isinstance(retry_after, timedelta) else float(retry_after)
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._retry_after += 1
+        logger.warning("Telegram flood limit hit; pausing outbound messages for %.0fs", seconds)
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        chat_id = data.get("chat_id")
+        if chat_id is None:
+            return await callback(*args, **kwargs)
+
+        if rate_limit_args is not None:
+            priority = int(rate_limit_args)
+        elif self.admin_chat_id and str(chat_id) == str(self.admin_chat_id):
+            priority = PRIORITY_ADMIN
+        else:
+            priority = PRIORITY_CUSTOMER
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire(chat_id, priority)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as exc:
+                self._pause(exc)
+                if attempt == self.max_retries:
+                    raise
+
+    def stats(self) -> dict:
+        snapshot = {name: dict(stats) for name, stats in self._stats.items()}
+        snapshot["queue"] = {
+            "waiting": sum(1 for w in self._waiters if not w[3].done()),
+            "max_waiting": self._queue_max,
+            "retry_after": self._retry_after,
+            "chats": len(self._chats),
+        }
+        return snapshot
@@ -0,0 +1,66 @@
+"""
+Single entry point for inline-button callbacks, dispatched by payload prefix
+"""
+
+import logging
+import time
+
+from telegram import Update
+from telegram.ext import CallbackQueryHandler, ContextTypes
+
+logger = logging.getLogger(__name__)
+
+
+class CallbackRouter:
+    """Dispatch ``prefix:payload`` callback data through a dict.
+
+    Every button we send carries ``<action>:<args>`` callback data. The
+    router splits off the action once and looks its handler up directly,
+    so dispatch cost does not grow with the number of actions and one
+    action can never shadow another the way overlapping regexes did.
+    Presses of unknown actions are answered so the client stops spinning.
+    """
+
+    def __init__(self):
+        self._routes = {}
+        self._stats = {}
+
+    def register(self, action: str, callback) -> None:
+        if action in self._routes:
+            raise ValueError(f"Callback action {action!r} is already registered")
+        self._routes[action] = callback
+        self._stats[action] = {"calls": 0, "errors": 0, "ms_total": 0.0, "ms_max": 0.0}
+
+    def handler(self) -> CallbackQueryHandler:
+        return CallbackQueryHandler(self.dispatch)
+
+    async def dispatch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        q = update.callback_query
+        if q is None:
+            return
+
+        action = (q.data or "").split(":", 1)[0]
+        callback = self._routes.get(action)
+        if callback is None:
+            logger.warning("No callback route for %r", q.data)
+            await q.answer()
+            return
+
+        started = time.perf_counter()
+        stats = self._stats[action]
+        try:
+            await callback(update, context)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            stats["calls"] += 1
+            stats["ms_total"] += elapsed
+            stats["ms_max"] = max(stats["ms_max"], elapsed)
+
+    def stats(self) -> dict:
+        return {action: dict(stats) for action, stats in self._stats.items() if stats["calls"]}
+
+
+callback_router = CallbackRouter()
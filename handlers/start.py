@@ -2,53 +2,19 @@
 Start handler - Language selection and welcome message
 """
 
-from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove, KeyboardButton, BotCommand
+from telegram import Update, ReplyKeyboardRemove
 from telegram.constants import BotCommandScopeType
 from telegram import BotCommandScopeChat
 from telegram.ext import ContextTypes
 from states import LANGUAGE, VEHICLE_PLATE, WELCOME
 import logging
-import json
 from config import ADMIN_TELEGRAM_USER_ID
+from handlers.catalog import catalog
+from handlers.commands import bot_commands, command_registry
+from handlers.media import media_cache
 
 logger = logging.getLogger(__name__)
 
-def load_translations():
-    """Load translation files"""
-    translations = {}
-    try:
-        with open('locale/ee.json', 'r', encoding='utf-8') as f:
-            translations['ee'] = json.load(f)
-        with open('locale/en.json', 'r', encoding='utf-8') as f:
-            translations['en'] = json.load(f)
-        with open('locale/ru.json', 'r', encoding='utf-8') as f:
-            translations['ru'] = json.load(f)
-    except FileNotFoundError:
-        # Fallback translations if files don't exist
-        translations = {
-            'ee': {
-                'welcome': "Tere tulemast Romupunkti!\n\nMe aitame teie sõiduki kiirelt ja legaalselt lammutada. Valige keel:",
-                'language_selected': "Keel valitud: {lang}\n\nAlustame sõiduki andmete kogumisega.",
-                'start_button': "🇪🇪 Eesti",
-                'english_button': "🇬🇧 English"
-            },
-            'en': {
-                'welcome': "Welcome to Romupunkt!\n\nWe help you dismantle your vehicle quickly and legally. Choose your language:",
-                'language_selected': "Language selected: {lang}\n\nLet's start collecting your vehicle information.",
-                'start_button': "🇪🇪 Eesti",
-                'english_button': "🇬🇧 English"
-            },
-            'ru': {
-                'welcome': "Добро пожаловать в Romupunkt!\n\nМы поможем быстро и легально утилизировать ваш автомобиль.",
-                'language_selected': "Язык выбран: {lang}",
-                'start_button': "🇪🇪 Eesti",
-                'english_button': "🇬🇧 English"
-            }
-        }
-    return translations
-
-translations = load_translations()
-
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Start the bot - show logo and language selection"""
     user = update.effective_user
@@ -68,12 +34,8 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     # Show bot logo first
     branding_text = "💰 ROMUPUNKT\n\nOstame autosid igas seisukorras"
     try:
-        with open("logo.jpg", "rb") as photo_file:
-            logger.info("start: sending logo photo")
-            await update.message.reply_photo(
-                photo=photo_file,
-                caption=branding_text,
-            )
+        logger.info("start: sending logo photo")
+        await media_cache.reply_photo(update.message, "logo.jpg", caption=branding_text)
     except FileNotFoundError:
         logger.info("start: logo.jpg not found; sending branding text")
         await update.message.reply_text(branding_text)
@@ -82,14 +44,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         await update.message.reply_text(branding_text)
 
     # Show language selection
-    keyboard = [
-        [KeyboardButton("🇪🇪 Eesti"), KeyboardButton("🇬🇧 English"), KeyboardButton("🇷🇺 Русский")]
-    ]
-    reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, is_persistent=True)
     logger.info("start: sending language keyboard")
     await update.message.reply_text(
         "Vali keel:",
-        reply_markup=reply_markup,
+        reply_markup=catalog.keyboard("language", None),
     )
     return LANGUAGE
 
@@ -101,26 +59,17 @@ async def language_selection(update: Update, context: ContextTypes.DEFAULT_TYPE)
     if user_choice and ("Eesti" in user_choice or "eesti" in user_choice_l):
         lang = 'ee'
         lang_name = "Eesti"
-        start_text = "▶️ Alusta"
     elif user_choice and ("Рус" in user_choice or "russian" in user_choice_l or "ru" == user_choice_l):
         lang = 'ru'
         lang_name = "Русский"
-        start_text = "▶️ Начать"
     elif user_choice and ("English" in user_choice or "english" in user_choice_l or "en" == user_choice_l):
         lang = 'en'
         lang_name = "English"
-        start_text = "▶️ Start"
 
     else:
-        keyboard = [
-            [KeyboardButton("🇪🇪 Eesti")],
-            [KeyboardButton("🇷🇺 Русский")],
-            [KeyboardButton("🇬🇧 English")]
-        ]
-        reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, is_persistent=True)
         await update.message.reply_text(
             "Vali keel:",
-            reply_markup=reply_markup,
+            reply_markup=catalog.keyboard("language_list", None),
         )
         return LANGUAGE
 
@@ -130,39 +79,20 @@ async def language_selection(update: Update, context: ContextTypes.DEFAULT_TYPE)
         chat = update.effective_chat
         chat_id = chat.id if chat else None
         if chat_id is not None:
-            if lang == 'ee':
-                commands = [
-                    BotCommand('start', 'Start'),
-                    BotCommand('new', 'Alusta'),
-                ]
-                admin_desc = 'Admin: päringud'
-            elif lang == 'ru':
-                commands = [
-                    BotCommand('start', 'Старт'),
-                    BotCommand('new', 'Начать'),
-                ]
-                admin_desc = 'Админ: заявки'
-            else:
-                commands = [
-                    BotCommand('start', 'Start'),
-                    BotCommand('new', 'Start'),
-                ]
-                admin_desc = 'Admin: leads'
-
             user = update.effective_user
-            if (
+            is_admin = (
                 getattr(chat, "type", None) == "private"
                 and user is not None
                 and ADMIN_TELEGRAM_USER_ID > 0
                 and user.id == ADMIN_TELEGRAM_USER_ID
-            ):
-                commands.append(BotCommand('leads', admin_desc))
+            )
+            commands = bot_commands(lang, admin=is_admin)
 
-            await context.bot.set_my_commands(commands, scope=BotCommandScopeChat(chat_id))
+            await command_registry.set_commands(context.bot, commands, BotCommandScopeChat(chat_id))
     except Exception:
         pass
 
-    t = translations.get(lang, translations.get('en', {}))
+    t = catalog.translations(lang)
     welcome_msg = t.get('welcome', '')
     legal_note = t.get('legal_note', '')
     selected_msg_tpl = t.get('language_selected', "Language selected: {lang}")
@@ -173,17 +103,8 @@ async def language_selection(update: Update, context: ContextTypes.DEFAULT_TYPE)
         msg = f"{msg}\n\n{legal_note}"
 
     await update.message.reply_text(msg)
- 
-    keyboard = [[KeyboardButton(start_text)]]
-    reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, is_persistent=True)
-    if lang == 'ee':
-        msg = "Kui olete valmis, vajutage 'Alusta'."
-    elif lang == 'ru':
-        msg = "Когда будете готовы, нажмите 'Начать'."
-    else:
-        msg = "When you're ready, tap 'Start'."
 
-    await update.message.reply_text(msg, reply_markup=reply_markup)
+    await update.message.reply_text(catalog.text("begin_hint", lang), reply_markup=catalog.keyboard("begin", lang))
     return WELCOME
 
 
@@ -192,35 +113,13 @@ async def welcome_continue(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     text = update.message.text.strip()
     logger.info(f"WELCOME_CONTINUE text={text!r} lang={lang}")
 
-    if lang == 'ee':
-        start_text = "▶️ Alusta"
-    elif lang == 'ru':
-        start_text = "▶️ Начать"
-    else:
-        start_text = "▶️ Start"
-
-    keyboard = [[KeyboardButton(start_text)]]
-    reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True, is_persistent=True)
-
-    is_start = False
-    if lang == 'ee' and text == '▶️ Alusta':
-        is_start = True
-    elif lang == 'ru' and text == '▶️ Начать':
-        is_start = True
-    elif lang == 'en' and text == '▶️ Start':
-        is_start = True
+    is_start = lang in ('ee', 'ru', 'en') and text == catalog.text("begin_button", lang)
 
     if not is_start:
-        if lang == 'ee':
-            msg = "Vajutage 'Alusta', et jätkata."
-        elif lang == 'ru':
-            msg = "Нажмите 'Начать', чтобы продолжить."
-        else:
-            msg = "Tap 'Start' to continue."
-        await update.message.reply_text(msg, reply_markup=reply_markup)
+        await update.message.reply_text(catalog.text("begin_reminder", lang), reply_markup=catalog.keyboard("begin", lang))
         return WELCOME
 
-    t = translations.get(lang, translations.get('en', {}))
+    t = catalog.translations(lang)
     plate_msg = t.get('plate_prompt', "Please enter your vehicle's license plate number (example: 123 ABC):")
     await update.message.reply_text(plate_msg, reply_markup=ReplyKeyboardRemove())
     return VEHICLE_PLATE
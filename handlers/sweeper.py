@@ -0,0 +1,147 @@
+"""
+Periodic eviction of abandoned conversations, user_data and session photos
+"""
+
+import logging
+import pickle
+import time
+
+from telegram import Update
+from telegram.ext import Application, ContextTypes, ConversationHandler
+
+from database.aio import delete_stale_session_photos, get_persistence_last_seen
+
+logger = logging.getLogger(__name__)
+
+
+class _Conversations:
+    """The one place that reaches into ConversationHandler internals.
+
+    python-telegram-bot 20.7 has no public API to list or end conversations,
+    so this reads ``_conversations`` and ends them through ``_update_state``,
+    which also writes the change to persistence. Re-check on PTB upgrades.
+    """
+
+    def __init__(self, handler: ConversationHandler):
+        self._handler = handler
+
+    def keys(self) -> list:
+        return list(self._handler._conversations)
+
+    def end(self, key: tuple) -> None:
+        self._handler._update_state(ConversationHandler.END, key)
+
+
+class IdleSweeper:
+    """Evict per-user state of users who stopped mid-flow.
+
+    ``touch`` runs for every update (TypeHandler in group -1) and records
+    when each user was last seen. Before the first sweep, users restored
+    from persistence are seeded with the ``updated_at`` of their
+    bot_persistence records, so restarts do not reset their idle clock;
+    users with no record count as seen at startup. ``sweep`` runs from the JobQueue and, for at most
+    ``batch_size`` users idle longer than ``ttl`` seconds, ends their
+    conversation and drops their user_data and private chat_data. It then
+    deletes car_photos of sessions idle that long, ``batch_size`` rows per
+    transaction. Users in ``exempt_ids`` (the admin) are never evicted.
+    Each ``expirers`` entry is an ``async () -> int`` that evicts other
+    per-chat state with its own TTL and returns how many entries it dropped.
+    """
+
+    def __init__(self, conversation: ConversationHandler, ttl: float, batch_size: int = 500, exempt_ids=(),
+                 expirers=()):
+        self.conversation = conversation
+        self.ttl = ttl
+        self.batch_size = max(1, int(batch_size))
+        self.exempt_ids = {int(i) for i in exempt_ids if i}
+        self.expirers = list(expirers)
+        self._conversations = _Conversations(conversation)
+        self._started = time.time()
+        self._last_seen = {}
+        self._seeded = False
+        self._stats = {
+            "runs": 0,
+            "users_evicted": 0,
+            "conversations_ended": 0,
+            "bytes_reclaimed": 0,
+            "photo_rows_deleted": 0,
+            "expired": 0,
+            "last_run_ms": 0.0,
+        }
+
+    async def touch(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        user = update.effective_user
+        if user is not None:
+            self._last_seen[user.id] = time.time()
+
+    async def _seed_last_seen(self) -> None:
+        persisted = await get_persistence_last_seen()
+        for user_id, updated_at in persisted.items():
+            self._last_seen[user_id] = max(self._last_seen.get(user_id, 0), updated_at)
+        self._seeded = True
+
+    def _idle_users(self, application: Application, keys: list) -> list:
+        cutoff = time.time() - self.ttl
+        candidates = set(application.user_data)
+        candidates.update(key[-1] for key in keys)
+        idle = [
+            user_id for user_id in candidates
+            if user_id not in self.exempt_ids and self._last_seen.get(user_id, self._started) < cutoff
+        ]
+        return idle[:self.batch_size]
+
+    async def sweep(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        started = time.perf_counter()
+        application = context.application
+        if not self._seeded:
+            await self._seed_last_seen()
+        keys = self._conversations.keys()
+
+        idle = set(self._idle_users(application, keys))
+        reclaimed = 0
+        for user_id in idle:
+            user_data = application.user_data.get(user_id)
+            if user_data:
+                reclaimed += len(pickle.dumps(dict(user_data)))
+            application.drop_user_data(user_id)
+            chat_data = application.chat_data.get(user_id)
+            if chat_data is not None:
+                reclaimed += len(pickle.dumps(dict(chat_data))) if chat_data else 0
+                application.drop_chat_data(user_id)
+            self._last_seen.pop(user_id, None)
+
+        ended = 0
+        for key in [key for key in keys if key[-1] in idle]:
+            self._conversations.end(key)
+            ended += 1
+
+        photo_rows = 0
+        while True:
+            deleted = await delete_stale_session_photos(self.ttl, self.batch_size)
+            photo_rows += deleted
+            if deleted < self.batch_size:
+                break
+
+        expired = 0
+        for expirer in self.expirers:
+            expired += await expirer()
+
+        elapsed = (time.perf_counter() - started) * 1000
+        self._stats["runs"] += 1
+        self._stats["users_evicted"] += len(idle)
+        self._stats["conversations_ended"] += ended
+        self._stats["bytes_reclaimed"] += reclaimed
+        self._stats["photo_rows_deleted"] += photo_rows
+        self._stats["expired"] += expired
+        self._stats["last_run_ms"] = elapsed
+        if idle or photo_rows or expired:
+            logger.info(
+                "Idle sweep: evicted %d users (%d bytes), ended %d conversations, deleted %d session photos, "
+                "expired %d entries in %.1f ms",
+                len(idle), reclaimed, ended, photo_rows, expired, elapsed,
+            )
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot["tracked_users"] = len(self._last_seen)
+        return snapshot
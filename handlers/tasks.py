@@ -0,0 +1,111 @@
+"""
+Bounded background worker pool for side effects that should not delay the user's reply
+"""
+
+import asyncio
+import logging
+import time
+
+from config import TASK_WORKERS, TASK_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPipeline:
+    """Run named coroutines on a fixed number of asyncio workers.
+
+    Handlers ``submit`` work such as the admin lead card and answer the
+    user straight away. The queue is bounded, so when workers fall behind
+    ``submit`` waits for a free slot instead of piling up unbounded work.
+    Until ``start`` has been called (tests, scripts) submitted tasks run
+    inline. ``stop`` drains the queue before the bot is shut down.
+
+    Per task name ``stats()`` reports submitted/completed/failed counts,
+    queue wait and run time.
+    """
+
+    def __init__(self, workers: int = 4, maxsize: int = 1000):
+        self.workers = max(1, int(workers))
+        self.maxsize = max(1, int(maxsize))
+        self._queue = None
+        self._workers = []
+        self._stats = {}
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def _task_stats(self, name: str) -> dict:
+        if name not in self._stats:
+            self._stats[name] = {
+                "submitted": 0,
+                "completed": 0,
+                "failed": 0,
+                "wait_ms_max": 0.0,
+                "run_ms_total": 0.0,
+                "run_ms_max": 0.0,
+            }
+        return self._stats[name]
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"task_pipeline_{i}") for i in range(self.workers)
+        ]
+        logger.info("Task pipeline started with %d workers", self.workers)
+
+    async def stop(self, timeout: float = 30) -> None:
+        """Finish queued tasks (up to ``timeout`` seconds), then stop the workers"""
+        if not self.running:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error("Task pipeline stopped with %d tasks still queued", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(self, name: str, func, *args, **kwargs) -> None:
+        """Queue ``func(*args, **kwargs)`` under ``name``; runs it inline when not started"""
+        self._task_stats(name)["submitted"] += 1
+        item = (name, func, args, kwargs, time.perf_counter())
+        if not self.running:
+            await self._run(*item)
+            return
+        await self._queue.put(item)
+
+    async def _worker(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._run(*item)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, name: str, func, args: tuple, kwargs: dict, queued_at: float) -> None:
+        stats = self._task_stats(name)
+        started = time.perf_counter()
+        stats["wait_ms_max"] = max(stats["wait_ms_max"], (started - queued_at) * 1000)
+        try:
+            await func(*args, **kwargs)
+            stats["completed"] += 1
+        except Exception:
+            stats["failed"] += 1
+            logger.exception("Background task %s failed", name)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            stats["run_ms_total"] += elapsed
+            stats["run_ms_max"] = max(stats["run_ms_max"], elapsed)
+
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def stats(self) -> dict:
+        return {name: dict(stats) for name, stats in self._stats.items()}
+
+
+task_pipeline = TaskPipeline(TASK_WORKERS, TASK_QUEUE_SIZE)
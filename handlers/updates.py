@@ -0,0 +1,104 @@
+"""
+Concurrent update processing that keeps each chat's updates in order
+"""
+
+import asyncio
+import logging
+import time
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+logger = logging.getLogger(__name__)
+
+
+def _ordering_key(update: object):
+    """Chat id of the update (user id when it has no chat); None if it has neither"""
+    if not isinstance(update, Update):
+        return None
+    if update.effective_chat is not None:
+        return update.effective_chat.id
+    if update.effective_user is not None:
+        return update.effective_user.id
+    return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Process updates of different chats concurrently, one at a time per chat.
+
+    Updates of the same chat run strictly in arrival order, so
+    ConversationHandler state transitions never interleave. At most
+    ``max_concurrent_updates`` handlers run at once. Updates waiting behind
+    an earlier update of their own chat do not count against that limit;
+    ``max_pending`` caps how many updates are admitted in total.
+    """
+
+    def __init__(self, max_concurrent_updates: int = 16, max_pending: int = 256):
+        super().__init__(max(int(max_pending), int(max_concurrent_updates)))
+        self.max_running = max(1, int(max_concurrent_updates))
+        self._running = None
+        self._chats = {}
+        self._active = 0
+        self._stats = {
+            "processed": 0,
+            "failed": 0,
+            "running_max": 0,
+            "chat_queue_max": 0,
+            "wait_ms_max": 0.0,
+            "run_ms_total": 0.0,
+            "run_ms_max": 0.0,
+        }
+
+    async def initialize(self) -> None:
+        self._running = asyncio.Semaphore(self.max_running)
+
+    async def shutdown(self) -> None:
+        pass
+
+    async def do_process_update(self, update: object, coroutine) -> None:
+        if self._running is None:
+            await self.initialize()
+
+        key = _ordering_key(update)
+        queued_at = time.perf_counter()
+        if key is None:
+            async with self._running:
+                await self._run(coroutine, queued_at)
+            return
+
+        entry = self._chats.get(key)
+        if entry is None:
+            entry = self._chats[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        self._stats["chat_queue_max"] = max(self._stats["chat_queue_max"], entry[1])
+        try:
+            async with entry[0]:
+                async with self._running:
+                    await self._run(coroutine, queued_at)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._chats[key]
+
+    async def _run(self, coroutine, queued_at: float) -> None:
+        started = time.perf_counter()
+        self._active += 1
+        self._stats["running_max"] = max(self._stats["running_max"], self._active)
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], (started - queued_at) * 1000)
+        try:
+            await coroutine
+            self._stats["processed"] += 1
+        except Exception:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            self._active -= 1
+            elapsed = (time.perf_counter() - started) * 1000
+            self._stats["run_ms_total"] += elapsed
+            self._stats["run_ms_max"] = max(self._stats["run_ms_max"], elapsed)
+
+    def stats(self) -> dict:
+        snapshot = dict(self._stats)
+        snapshot["running"] = self._active
+        snapshot["chats_waiting"] = len(self._chats)
+        return snapshot
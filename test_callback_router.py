@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Callback Router Test
+Verifies that button presses are dispatched by action prefix without shadowing
+"""
+
+import sys
+import os
+import asyncio
+from unittest.mock import Mock, AsyncMock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from handlers.router import CallbackRouter
+
+def _press(data):
+    update = Mock()
+    update.callback_query = Mock(data=data)
+    update.callback_query.answer = AsyncMock()
+    return update
+
+async def run_router():
+    calls = []
+    router = CallbackRouter()
+
+    async def offer_response(update, context):
+        calls.append(("response", update.callback_query.data))
+
+    async def offer_counter(update, context):
+        calls.append(("counter", update.callback_query.data))
+
+    router.register("offer_accept", offer_response)
+    router.register("offer_reject", offer_response)
+    router.register("offer_counter", offer_counter)
+
+    await router.dispatch(_press("offer_counter:7"), Mock())
+    await router.dispatch(_press("offer_reject:7"), Mock())
+    unknown = _press("offer_unknown:7")
+    await router.dispatch(unknown, Mock())
+
+    duplicate_rejected = False
+    try:
+        router.register("offer_counter", offer_response)
+    except ValueError:
+        duplicate_rejected = True
+
+    return calls, unknown.callback_query.answer.await_count, duplicate_rejected, router.stats()
+
+def test_dispatch_by_prefix():
+    """Test offer_counter reaches its own handler and unknown actions are answered"""
+    print("🔍 Testing callback router...")
+    calls, unknown_answers, duplicate_rejected, stats = asyncio.run(run_router())
+
+    print(f"Calls: {calls}")
+    print(f"Stats: {stats}")
+    if (
+        calls == [("counter", "offer_counter:7"), ("response", "offer_reject:7")]
+        and unknown_answers == 1
+        and duplicate_rejected
+        and stats["offer_counter"]["calls"] == 1
+        and "offer_accept" not in stats
+    ):
+        print("✅ Callback router: PASSED")
+        return True
+    print("❌ Callback router: FAILED")
+    return False
+
+def main():
+    """Run all callback router tests"""
+    print("🚀 Starting Callback Router Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_dispatch_by_prefix,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Locale Catalog Test
+Verifies that keyboards are built once per language and that every locale has the same keys
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from handlers.catalog import LANGUAGES, catalog, load_catalog
+
+def test_keyboards_interned():
+    """Test repeated lookups return the same markup instance"""
+    print("🔍 Testing keyboard interning...")
+    same = all(
+        catalog.keyboard(name, lang) is catalog.keyboard(name, lang)
+        for name in ("done", "yes_no", "logistics", "new_inquiry", "share", "begin", "country_code")
+        for lang in LANGUAGES
+    )
+    shared = catalog.keyboard("country_code", "ee") is catalog.keyboard("country_code", "ru")
+    done_ru = catalog.keyboard("done", "ru").keyboard[0][0].text
+
+    print(f"Interned: {same}, static shared: {shared}, ru done button: {done_ru!r}")
+    if same and shared and done_ru == "✅ Готово":
+        print("✅ Keyboard interning: PASSED")
+        return True
+    print("❌ Keyboard interning: FAILED")
+    return False
+
+def test_unknown_language_fallback():
+    """Test unknown or missing languages fall back to English"""
+    print("🔍 Testing language fallback...")
+    fallback = (
+        catalog.keyboard("done", None) is catalog.keyboard("done", "en")
+        and catalog.text("plate_saved", "xx", plate="123 ABC") == catalog.text("plate_saved", "en", plate="123 ABC")
+    )
+    done_texts = catalog.texts("done_button")
+
+    print(f"Fallback: {fallback}, done texts: {sorted(done_texts)}")
+    if fallback and done_texts == {"✅ Valmis", "✅ Готово", "✅ Done"}:
+        print("✅ Language fallback: PASSED")
+        return True
+    print("❌ Language fallback: FAILED")
+    return False
+
+def test_offer_keyboard():
+    """Test the offer keyboard uses per-language labels and the given offer id"""
+    print("🔍 Testing offer keyboard...")
+    markup = catalog.inline_keyboard("offer", "ru", offer_id=42)
+    buttons = [button for row in markup.inline_keyboard for button in row]
+    labels = [button.text for button in buttons]
+    data = [button.callback_data for button in buttons]
+
+    print(f"Labels: {labels}, callback data: {data}")
+    if labels == ["✅ ДА", "❌ НЕТ", "💬 Моя цена"] and data == ["offer_accept:42", "offer_reject:42", "offer_counter:42"]:
+        print("✅ Offer keyboard: PASSED")
+        return True
+    print("❌ Offer keyboard: FAILED")
+    return False
+
+def test_locales_complete():
+    """Test every locale defines the same keys"""
+    print("🔍 Testing locale completeness...")
+    fresh = load_catalog()
+    keys = {lang: set(fresh.translations(lang)) for lang in LANGUAGES}
+    missing = {lang: sorted(set().union(*keys.values()) - k) for lang, k in keys.items() if set().union(*keys.values()) - k}
+
+    if not missing:
+        print("✅ Locale completeness: PASSED")
+        return True
+    print(f"❌ Locale completeness: FAILED (missing {missing})")
+    return False
+
+def main():
+    """Run all catalog tests"""
+    print("🚀 Starting Locale Catalog Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_keyboards_interned,
+        test_unknown_language_fallback,
+        test_offer_keyboard,
+        test_locales_complete,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
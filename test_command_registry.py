@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Command Registry Test
+Verifies that set_my_commands is only called when a scope's commands change
+"""
+
+import sys
+import os
+import asyncio
+import random
+from unittest.mock import AsyncMock, Mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram import BotCommand, BotCommandScopeChat
+
+from database.models import init_db, get_db_connection
+from handlers.commands import CommandRegistry, bot_commands
+
+async def run_registry(chat_id):
+    bot = Mock()
+    bot.set_my_commands = AsyncMock()
+    ee = [BotCommand("start", "Start"), BotCommand("new", "Alusta")]
+    ru = [BotCommand("start", "Старт"), BotCommand("new", "Начать")]
+
+    registry = CommandRegistry()
+    calls = []
+    calls.append(await registry.set_commands(bot, ee, BotCommandScopeChat(chat_id)))
+    calls.append(await registry.set_commands(bot, ee, BotCommandScopeChat(chat_id)))
+    calls.append(await registry.set_commands(bot, ru, BotCommandScopeChat(chat_id)))
+
+    # After a restart the applied set is read back from the database
+    restarted = CommandRegistry()
+    calls.append(await restarted.set_commands(bot, ru, BotCommandScopeChat(chat_id)))
+    calls.append(await restarted.set_commands(bot, ru, BotCommandScopeChat(chat_id + 1)))
+    return calls, bot.set_my_commands.await_count
+
+def test_memoized_commands():
+    """Test unchanged command lists skip the Bot API call"""
+    print("🔍 Testing command registry...")
+    init_db()
+    chat_id = random.randint(10**9, 2 * 10**9)
+    calls, api_calls = asyncio.run(run_registry(chat_id))
+
+    print(f"Applied per call: {calls}")
+    if calls == [True, False, True, False, True] and api_calls == 3:
+        print("✅ Command registry: PASSED")
+        return True
+    print(f"❌ Command registry: FAILED ({api_calls} API calls)")
+    return False
+
+async def run_bounded(chat_id):
+    bot = Mock()
+    bot.set_my_commands = AsyncMock()
+    commands = [BotCommand("start", "Start")]
+    registry = CommandRegistry(maxsize=2, ttl=3600)
+    for offset in range(3):
+        await registry.set_commands(bot, commands, BotCommandScopeChat(chat_id + offset))
+    cached = registry.stats()["cached"]
+
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE bot_command_scopes SET updated_at = datetime('now', '-2 hours') WHERE scope = ?",
+            (f'{{"chat_id":{chat_id},"type":"chat"}}',),
+        )
+    expired = await registry.expire()
+    reapplied = await registry.set_commands(bot, commands, BotCommandScopeChat(chat_id))
+    kept = await registry.set_commands(bot, commands, BotCommandScopeChat(chat_id + 1))
+    return cached, expired, reapplied, kept
+
+def test_bounded_and_swept():
+    """Test the in-memory digests are bounded and stale per-chat scopes are deleted"""
+    print("🔍 Testing command registry bounds...")
+    init_db()
+    chat_id = random.randint(10**9, 2 * 10**9)
+    cached, expired, reapplied, kept = asyncio.run(run_bounded(chat_id))
+
+    print(f"Cached: {cached}, expired: {expired}, reapplied: {reapplied}, kept: {kept}")
+    # Stale scopes left by earlier runs in the shared database are swept too
+    if cached == 2 and expired >= 1 and reapplied and not kept:
+        print("✅ Command registry bounds: PASSED")
+        return True
+    print("❌ Command registry bounds: FAILED")
+    return False
+
+def test_admin_commands():
+    """Test the admin menu extends the user menu with every admin command"""
+    print("🔍 Testing admin command list...")
+    user = [c.command for c in bot_commands("ee")]
+    admin = [c.command for c in bot_commands("ee", admin=True)]
+
+    print(f"User: {user}, admin: {admin}")
+    if user == ["start", "new"] and admin == ["start", "new", "leads", "dbstats"]:
+        print("✅ Admin command list: PASSED")
+        return True
+    print("❌ Admin command list: FAILED")
+    return False
+
+def main():
+    """Run all command registry tests"""
+    print("🚀 Starting Command Registry Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_memoized_commands,
+        test_bounded_and_swept,
+        test_admin_commands,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Connection Pool Test
+Verifies pooled connection reuse, pragmas, health checks and transaction scopes
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config import DB_POOL_TIMEOUT
+from database.pool import ConnectionPool, PoolTimeout
+from database.models import init_db, get_db_connection, get_pool_stats, get_db_diagnostics, save_lead, get_lead_by_id
+
+def test_connection_reuse():
+    """Test that connections are reused instead of reopened"""
+    print("🔍 Testing connection reuse...")
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    pool = ConnectionPool(path, size=2, pragmas={"busy_timeout": 1234})
+
+    for _ in range(50):
+        with pool.connection() as conn:
+            conn.execute("SELECT 1").fetchone()
+
+    stats = pool.stats()
+    with pool.connection() as conn:
+        busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+    pool.close()
+
+    print(f"Pool stats: {stats}")
+    if stats["created"] == 1 and stats["checkouts"] == 50 and busy_timeout == 1234:
+        print("✅ Connection reuse: PASSED")
+        return True
+    print("❌ Connection reuse: FAILED")
+    return False
+
+def test_pool_bound():
+    """Test that the pool never opens more than its size and times out when exhausted"""
+    print("🔍 Testing pool bound...")
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    pool = ConnectionPool(path, size=1, timeout=0.05)
+
+    timed_out = False
+    with pool.connection():
+        try:
+            with pool.connection():
+                pass
+        except PoolTimeout:
+            timed_out = True
+
+    stats = pool.stats()
+    pool.close()
+    if timed_out and stats["open"] == 1 and stats["timeouts"] == 1:
+        print("✅ Pool bound: PASSED")
+        return True
+    print(f"❌ Pool bound: FAILED (timed_out={timed_out}, stats={stats})")
+    return False
+
+def test_health_check_replaces_broken_connection():
+    """Test that a dead idle connection is replaced on checkout"""
+    print("🔍 Testing health check...")
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    pool = ConnectionPool(path, size=1, health_check_interval=0)
+
+    with pool.connection() as conn:
+        conn.close()
+    with pool.connection() as conn:
+        ok = conn.execute("SELECT 1").fetchone()[0] == 1
+
+    stats = pool.stats()
+    pool.close()
+    if ok and stats["discarded"] == 1 and stats["created"] == 2:
+        print("✅ Health check: PASSED")
+        return True
+    print(f"❌ Health check: FAILED ({stats})")
+    return False
+
+def test_failed_reconnect_frees_slot():
+    """Test that a failed reconnect after a health check does not leak a pool slot"""
+    print("🔍 Testing failed reconnect...")
+    path = os.path.join(tempfile.mkdtemp(), "pool.db")
+    pool = ConnectionPool(path, size=1, timeout=0.05, health_check_interval=0)
+
+    with pool.connection():
+        pass
+    failed = False
+    with patch.object(pool, "_is_healthy", return_value=False), \
+            patch.object(pool, "_connect", side_effect=OSError("disk gone")):
+        try:
+            with pool.connection():
+                pass
+        except OSError:
+            failed = True
+    open_after_failure = pool.stats()["open"]
+    try:
+        with pool.connection() as conn:
+            ok = conn.execute("SELECT 1").fetchone()[0] == 1
+    except PoolTimeout:
+        ok = False
+    pool.close()
+
+    print(f"Failed: {failed}, open after failure: {open_after_failure}, recovered: {ok}")
+    if failed and open_after_failure == 0 and ok:
+        print("✅ Failed reconnect: PASSED")
+        return True
+    print("❌ Failed reconnect: FAILED")
+    return False
+
+def test_transaction_scope():
+    """Test that nested scopes share one connection and roll back on error"""
+    print("🔍 Testing transaction scope...")
+    init_db()
+
+    with get_db_connection() as outer:
+        with get_db_connection() as inner:
+            same_connection = outer is inner
+
+    user_data = {'plate_number': 'POOL1', 'owner_name': 'Pool', 'curb_weight': 1000, 'language': 'en'}
+    lead_id = None
+    try:
+        with get_db_connection():
+            lead_id = save_lead(user_data, 4242, 'pool')
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    rolled_back = get_lead_by_id(lead_id) is None
+
+    results = []
+    def worker():
+        results.append(get_lead_by_id(1))
+    threads = [threading.Thread(target=worker) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"Pool stats: {get_pool_stats()}")
+    if same_connection and rolled_back and len(results) == 10:
+        print("✅ Transaction scope: PASSED")
+        return True
+    print(f"❌ Transaction scope: FAILED (same={same_connection}, rolled_back={rolled_back})")
+    return False
+
+def test_wal_profile():
+    """Test that the configured pragma profile is active and readers don't block on writers"""
+    print("🔍 Testing WAL pragma profile...")
+    init_db()
+    diag = get_db_diagnostics()
+    print(f"Active pragmas: {diag['pragmas']}")
+
+    # A reader on another thread must not wait for an open write transaction
+    read_done = threading.Event()
+    with get_db_connection() as conn:
+        conn.execute("UPDATE leads SET updated_at = updated_at WHERE id = -1")
+        reader = threading.Thread(target=lambda: (get_lead_by_id(1), read_done.set()))
+        reader.start()
+        reader_finished = read_done.wait(2)
+    reader.join()
+
+    if (
+        str(diag["pragmas"]["journal_mode"]).lower() == "wal" and diag["pragmas"]["synchronous"] == 1
+        and diag["pragmas"]["busy_timeout"] == int(DB_POOL_TIMEOUT * 1000) and reader_finished
+    ):
+        print("✅ WAL pragma profile: PASSED")
+        return True
+    print(f"❌ WAL pragma profile: FAILED (reader_finished={reader_finished})")
+    return False
+
+def main():
+    """Run all connection pool tests"""
+    print("🚀 Starting Connection Pool Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_connection_reuse,
+        test_pool_bound,
+        test_health_check_replaces_broken_connection,
+        test_failed_reconnect_frees_slot,
+        test_transaction_scope,
+        test_wal_profile,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Counter-Offer Filter Test
+Verifies that only chats awaiting a counter-offer reach counter_offer_message
+"""
+
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import Mock, AsyncMock, patch
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram import Chat, Message, Update, User
+from telegram.ext import filters
+
+from database import models
+from database.models import init_db, get_counter_offer_waits, get_db_connection
+import handlers.admin as admin
+
+def _text_update(chat_id, text, update_id=1):
+    user = User(id=chat_id, first_name="Test", is_bot=False)
+    chat = Chat(id=chat_id, type=Chat.PRIVATE)
+    message = Message(message_id=update_id, date=None, chat=chat, from_user=user, text=text)
+    return Update(update_id=update_id, message=message)
+
+def test_filter_skips_other_chats():
+    """Test the filter only matches chats with a pending counter-offer"""
+    print("🔍 Testing counter-offer filter...")
+    waits = admin.CounterOfferWaits(3600)
+    waits.set(5001, 11, 22)
+    handler_filter = filters.TEXT & ~filters.COMMAND & waits
+
+    waiting = handler_filter.check_update(_text_update(5001, "250"))
+    other = handler_filter.check_update(_text_update(5002, "hello"))
+    waits.discard(5001)
+    cleared = handler_filter.check_update(_text_update(5001, "250"))
+
+    if waiting and not other and not cleared:
+        print("✅ Counter-offer filter: PASSED")
+        return True
+    print(f"❌ Counter-offer filter: FAILED (waiting={waiting}, other={other}, cleared={cleared})")
+    return False
+
+async def _run_counter_offer(chat_id, lead_id, offer_id):
+    await admin._await_counter_offer(chat_id, offer_id, lead_id)
+    persisted = dict(get_counter_offer_waits())
+
+    # A restarted process rebuilds the index from the table
+    admin.awaiting_counter_offer.load({})
+    admin.awaiting_counter_offer.load(get_counter_offer_waits())
+
+    update = Mock()
+    update.effective_chat = Mock(id=chat_id)
+    update.effective_user = Mock(id=chat_id)
+    update.message.text = "300€"
+    update.message.reply_text = AsyncMock()
+    context = Mock()
+    context.chat_data = {}
+    context.bot.send_message = AsyncMock()
+    await admin.counter_offer_message(update, context)
+    return persisted, update.message.reply_text.call_count
+
+def test_wait_persisted_and_cleared():
+    """Test a wait survives a reload and is cleared once the price arrives"""
+    print("🔍 Testing persisted counter-offer waits...")
+    init_db()
+    chat_id = 5003
+    lead_id = models.save_lead(
+        {'plate_number': 'CNT001', 'owner_name': 'Counter', 'curb_weight': 1000, 'language': 'en'},
+        chat_id,
+    )
+    offer_id = models.create_offer(lead_id, 200)
+
+    persisted, replies = asyncio.run(_run_counter_offer(chat_id, lead_id, offer_id))
+    remaining = get_counter_offer_waits()
+
+    if (
+        persisted.get(chat_id, ())[:2] == (offer_id, lead_id)
+        and replies == 1
+        and chat_id not in remaining
+        and admin.awaiting_counter_offer.get(chat_id) is None
+    ):
+        print("✅ Persisted counter-offer waits: PASSED")
+        return True
+    print(f"❌ Persisted counter-offer waits: FAILED (persisted={persisted}, remaining={remaining})")
+    return False
+
+async def _run_expiry(stale_chat, fresh_chat):
+    waits = admin.CounterOfferWaits(3600)
+    with patch.object(admin, "awaiting_counter_offer", waits):
+        await admin._await_counter_offer(stale_chat, 31, 41)
+        await admin._await_counter_offer(fresh_chat, 32, 42)
+    with get_db_connection() as conn:
+        conn.execute(
+            "UPDATE counter_offer_waits SET created_at = datetime('now', '-2 hours') WHERE chat_id = ?", (stale_chat,)
+        )
+    # The in-memory entry ages too; a reload from the table drops the stale wait
+    waits._waits[stale_chat] = (31, 41, time.time() - 7200)
+    matches_stale = waits.filter(_text_update(stale_chat, "hello").message)
+
+    reloaded = admin.CounterOfferWaits(3600)
+    reloaded.load(get_counter_offer_waits())
+    loaded = (stale_chat in reloaded._waits, fresh_chat in reloaded._waits)
+
+    expired = await waits.expire()
+    remaining = get_counter_offer_waits()
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM counter_offer_waits WHERE chat_id IN (?, ?)", (stale_chat, fresh_chat))
+    return matches_stale, loaded, expired, stale_chat in remaining, fresh_chat in remaining, len(waits)
+
+def test_stale_waits_expire():
+    """Test a wait nobody answered stops matching and is dropped from memory and the table"""
+    print("🔍 Testing counter-offer wait expiry...")
+    init_db()
+    matches_stale, loaded, expired, stale_kept, fresh_kept, in_memory = asyncio.run(_run_expiry(5004, 5005))
+
+    print(f"Stale matches: {matches_stale}, loaded: {loaded}, expired: {expired}, in memory: {in_memory}")
+    if not matches_stale and loaded == (False, True) and expired == 1 and not stale_kept and fresh_kept and in_memory == 1:
+        print("✅ Counter-offer wait expiry: PASSED")
+        return True
+    print("❌ Counter-offer wait expiry: FAILED")
+    return False
+
+def main():
+    """Run all counter-offer filter tests"""
+    print("🚀 Starting Counter-Offer Filter Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_filter_skips_other_chats,
+        test_wait_persisted_and_cleared,
+        test_stale_waits_expire,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
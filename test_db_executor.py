@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Async Database Executor Test
+Verifies that models.py calls run off the event loop and queued writes are batched
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.models import init_db
+from database.executor import DatabaseExecutor
+from database import aio
+
+def test_async_facade_roundtrip():
+    """Test that the async facade returns the same data as models.py"""
+    print("🔍 Testing async facade roundtrip...")
+    init_db()
+
+    async def flow():
+        user_data = {'plate_number': 'AIO1', 'owner_name': 'Async', 'curb_weight': 1200, 'language': 'en'}
+        lead_id = await aio.save_lead(user_data, 5151, 'async')
+        session_id = uuid.uuid4().hex
+        await asyncio.gather(*(aio.save_session_photo(5151, session_id, f"aio_{i}") for i in range(5)))
+        await aio.move_session_photos_to_lead(5151, session_id, lead_id)
+        lead = await aio.get_lead_by_id(lead_id)
+        photos = await aio.get_lead_photos(lead_id)
+        return lead, photos
+
+    lead, photos = asyncio.run(flow())
+    if lead and lead['plate_number'] == 'AIO1' and len(photos) == 5:
+        print("✅ Async facade roundtrip: PASSED")
+        return True
+    print(f"❌ Async facade roundtrip: FAILED ({lead}, {photos})")
+    return False
+
+def test_event_loop_not_blocked():
+    """Test that a slow database call does not stall other coroutines"""
+    print("🔍 Testing event loop responsiveness...")
+    executor = DatabaseExecutor()
+
+    async def flow():
+        ticks = 0
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        task = asyncio.create_task(ticker())
+        await executor.submit(time.sleep, 0.3, write=True)
+        task.cancel()
+        return ticks
+
+    ticks = asyncio.run(flow())
+    executor.stop()
+    if ticks >= 10:
+        print(f"✅ Event loop responsiveness: PASSED ({ticks} ticks during slow write)")
+        return True
+    print(f"❌ Event loop responsiveness: FAILED ({ticks} ticks)")
+    return False
+
+def test_write_batching():
+    """Test that queued writes share a transaction and failures stay isolated"""
+    print("🔍 Testing write batching...")
+    init_db()
+    executor = DatabaseExecutor()
+    gate = threading.Event()
+
+    def fail():
+        raise ValueError("boom")
+
+    async def flow():
+        blocker = asyncio.ensure_future(executor.submit(gate.wait, write=True))
+        await asyncio.sleep(0.05)
+        session_id = uuid.uuid4().hex
+        writes = [
+            asyncio.ensure_future(executor.submit(aio.models.save_session_photo, 6161, session_id, f"batch_{i}", write=True))
+            for i in range(10)
+        ]
+        failing = asyncio.ensure_future(executor.submit(fail, write=True))
+        await asyncio.sleep(0.05)
+        gate.set()
+        await blocker
+        await asyncio.gather(*writes)
+        try:
+            await failing
+            failed_properly = False
+        except ValueError:
+            failed_properly = True
+        photos = await executor.submit(aio.models.get_session_photos, 6161, session_id)
+        return failed_properly, photos
+
+    failed_properly, photos = asyncio.run(flow())
+    stats = executor.stats()
+    executor.stop()
+
+    print(f"Executor stats: {stats}")
+    if failed_properly and len(photos) == 10 and stats["max_batch"] == 11:
+        print("✅ Write batching: PASSED")
+        return True
+    print(f"❌ Write batching: FAILED (failed_properly={failed_properly}, photos={len(photos)})")
+    return False
+
+def main():
+    """Run all executor tests"""
+    print("🚀 Starting Async Database Executor Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_async_facade_roundtrip,
+        test_event_loop_not_blocked,
+        test_write_batching,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
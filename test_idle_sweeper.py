@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Idle Sweeper Test
+Verifies that abandoned conversations, user_data and session photos are evicted
+"""
+
+import sys
+import os
+import asyncio
+import time
+import uuid
+from unittest.mock import Mock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.ext import Application, CommandHandler, ConversationHandler
+
+from database import models
+from database.models import init_db, get_db_connection
+from handlers.sweeper import IdleSweeper
+from states import PHOTOS
+
+async def _noop(update, context):
+    return None
+
+async def run_sweep(stale_session, fresh_session):
+    application = Application.builder().token("123:TEST").build()
+    conv = ConversationHandler(entry_points=[CommandHandler("start", _noop)], states={PHOTOS: []}, fallbacks=[])
+    sweeper = IdleSweeper(conv, ttl=3600, batch_size=2, exempt_ids=[1])
+
+    for user_id in (1, 2, 3, 4):
+        application.user_data[user_id]["session_id"] = uuid.uuid4().hex
+        conv._conversations[(user_id, user_id)] = PHOTOS
+    application.chat_data[2]["note"] = "x"
+
+    # Users 1-3 were last seen two hours ago, user 4 just now
+    for user_id in (1, 2, 3):
+        sweeper._last_seen[user_id] = time.time() - 7200
+    sweeper._last_seen[4] = time.time()
+
+    context = Mock()
+    context.application = application
+    await sweeper.sweep(context)
+    await sweeper.sweep(context)
+
+    with get_db_connection() as conn:
+        remaining = {
+            row[0]: row[1] for row in conn.execute(
+                "SELECT session_id, COUNT(*) FROM car_photos WHERE session_id IN (?, ?) GROUP BY session_id",
+                (stale_session, fresh_session),
+            )
+        }
+    return sorted(application.user_data), sorted(conv._conversations), 2 in application.chat_data, remaining, sweeper.stats()
+
+def test_sweep_evicts_idle_state():
+    """Test idle users are evicted in batches while active and exempt users stay"""
+    print("🔍 Testing idle sweeper...")
+    init_db()
+
+    stale_session, fresh_session = uuid.uuid4().hex, uuid.uuid4().hex
+    with get_db_connection() as conn:
+        for i in range(3):
+            conn.execute(
+                "INSERT INTO car_photos (user_id, session_id, file_id, created_at) VALUES (?, ?, ?, datetime('now', '-3 hours'))",
+                (3, stale_session, f"stale_{i}"),
+            )
+        conn.execute(
+            "INSERT INTO car_photos (user_id, session_id, file_id, created_at) VALUES (?, ?, ?, datetime('now', '-3 hours'))",
+            (4, fresh_session, "fresh_old"),
+        )
+    models.save_session_photo(4, fresh_session, "fresh_new")
+    models.flush_session_photos()
+
+    users, conversations, chat_kept, remaining, stats = asyncio.run(run_sweep(stale_session, fresh_session))
+
+    print(f"Remaining users: {users}, conversations: {conversations}")
+    print(f"Stats: {stats}")
+    if (
+        users == [1, 4]
+        and conversations == [(1, 1), (4, 4)]
+        and not chat_kept
+        and remaining == {fresh_session: 2}
+        and stats["users_evicted"] == 2
+        and stats["conversations_ended"] == 2
+    ):
+        print("✅ Idle sweeper: PASSED")
+        return True
+    print(f"❌ Idle sweeper: FAILED (remaining photos={remaining})")
+    return False
+
+async def run_restarted_sweep():
+    application = Application.builder().token("123:TEST").build()
+    conv = ConversationHandler(entry_points=[CommandHandler("start", _noop)], states={PHOTOS: []}, fallbacks=[])
+    # A sweeper created by a restart: nothing touched yet
+    sweeper = IdleSweeper(conv, ttl=3600)
+    for user_id in (501, 502, 503):
+        application.user_data[user_id]["session_id"] = uuid.uuid4().hex
+    conv._conversations[(501, 501)] = PHOTOS
+
+    context = Mock()
+    context.application = application
+    await sweeper.sweep(context)
+    return sorted(application.user_data), sorted(conv._conversations)
+
+def test_idle_clock_survives_restart():
+    """Test users idle before a restart are evicted using their persisted updated_at"""
+    print("🔍 Testing idle clock across restarts...")
+    init_db()
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM bot_persistence WHERE key IN ('501', '502', '[501, 501]')")
+        conn.execute(
+            "INSERT INTO bot_persistence (namespace, key, data, updated_at) VALUES ('user_data', '501', x'00', datetime('now', '-2 hours'))"
+        )
+        conn.execute(
+            "INSERT INTO bot_persistence (namespace, key, data, updated_at) VALUES ('conversation:test', '[501, 501]', x'00', datetime('now', '-3 hours'))"
+        )
+        conn.execute("INSERT INTO bot_persistence (namespace, key, data) VALUES ('user_data', '502', x'00')")
+
+    users, conversations = asyncio.run(run_restarted_sweep())
+    with get_db_connection() as conn:
+        conn.execute("DELETE FROM bot_persistence WHERE key IN ('501', '502', '[501, 501]')")
+
+    print(f"Remaining users: {users}, conversations: {conversations}")
+    if users == [502, 503] and conversations == []:
+        print("✅ Idle clock across restarts: PASSED")
+        return True
+    print("❌ Idle clock across restarts: FAILED")
+    return False
+
+def main():
+    """Run all idle sweeper tests"""
+    print("🚀 Starting Idle Sweeper Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_sweep_evicts_idle_state,
+        test_idle_clock_survives_restart,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Query Plan Test
+Runs the hot queries in database/models.py and checks with EXPLAIN QUERY PLAN
+that none of them falls back to a full table scan or a temp sort
+"""
+
+import sys
+import os
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import models
+from database.models import init_db, get_db_connection
+
+TABLES = ("leads", "photos", "car_photos", "offers")
+
+def _capture(fn, *args):
+    """Call a models.py helper and return the statements it executed"""
+    statements = []
+    with get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            fn(*args)
+        finally:
+            conn.set_trace_callback(None)
+    return [
+        sql for sql in statements
+        if sql.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+        and "WHERE" in sql.upper()
+        and any(table in sql for table in TABLES)
+    ]
+
+def _plan_problems(sql):
+    with get_db_connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    details = [row[3] for row in plan]
+    return [d for d in details if d.startswith("SCAN ") or "TEMP B-TREE" in d]
+
+def test_hot_queries_use_indexes():
+    """Test that every hot lookup in models.py is served by an index"""
+    print("🔍 Testing query plans of hot lookups...")
+    init_db()
+
+    user_id = 770077
+    session_id = uuid.uuid4().hex
+    user_data = {
+        'plate_number': 'IDX001',
+        'owner_name': 'Index',
+        'curb_weight': 1400,
+        'language': 'en',
+        'phone_number': '+37255500000',
+    }
+    models.save_session_photo(user_id, session_id, "idx_photo")
+    lead_id = models.save_lead(user_data, user_id, 'index')
+    offer_id = models.create_offer(lead_id, 100)
+
+    hot_calls = [
+        ("get_lead_by_id", models.get_lead_by_id, lead_id),
+        ("get_offer_by_id", models.get_offer_by_id, offer_id),
+        ("get_session_photos", models.get_session_photos, user_id, session_id),
+        ("get_lead_photos", models.get_lead_photos, lead_id),
+        ("update_lead_status", models.update_lead_status, lead_id, "pending"),
+        ("update_offer_status", models.update_offer_status, offer_id, "sent"),
+        ("move_session_photos_to_lead", models.move_session_photos_to_lead, user_id, session_id, lead_id),
+        ("get_latest_leads (status page)", models.get_latest_leads, 10, lead_id + 1, None, "pending"),
+        ("get_latest_leads (date range)", models.get_latest_leads, 10, None, None, None, "2020-01-01", "2100-01-01"),
+        ("get_lead_summaries (status page)", models.get_lead_summaries, 10, lead_id + 1, None, "pending"),
+        ("delete_lead_by_id", models.delete_lead_by_id, lead_id),
+    ]
+
+    all_ok = True
+    for name, fn, *args in hot_calls:
+        statements = _capture(fn, *args)
+        if not statements:
+            print(f"❌ {name}: no indexed statement captured")
+            all_ok = False
+            continue
+        for sql in statements:
+            problems = _plan_problems(sql)
+            if problems:
+                print(f"❌ {name}: {problems} for {' '.join(sql.split())}")
+                all_ok = False
+        if all_ok:
+            print(f"✅ {name}: {len(statements)} statement(s) use indexes")
+
+    if all_ok:
+        print("✅ Query plans: PASSED")
+        return True
+    print("❌ Query plans: FAILED")
+    return False
+
+def main():
+    """Run all query plan tests"""
+    print("🚀 Starting Query Plan Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_hot_queries_use_indexes,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -6,9 +6,18 @@ Tests media group functionality and admin notification triggers
 
 import sys
 import os
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from telegram.ext import ConversationHandler
+
 from database.models import save_lead, get_lead_photos, get_lead_by_id, init_db, save_session_photo, move_session_photos_to_lead
+from database.models import finalize_lead, get_db_connection, get_pool_stats
+from handlers import finalize
+from states import PHOTOS
+from testing_db import temporary_database
 
 def test_lead_creation_and_notification():
     """Test complete lead creation flow with photos"""
@@ -115,6 +124,129 @@ def test_photo_storage_and_retrieval():
     print("✅ Photo storage test: PASSED")
     return True
 
+def test_finalize_lead_single_transaction():
+    """Test finalize_lead returns the lead and its photos from one checkout"""
+    print("🔍 Testing atomic finalize_lead...")
+    init_db()
+
+    user_id = 61616
+    session_id = uuid.uuid4().hex
+    user_data = {
+        'language': 'en',
+        'plate_number': uuid.uuid4().hex[:6],
+        'owner_name': 'Finalize',
+        'curb_weight': 1300,
+        'phone_number': '+372500600',
+    }
+    for i in range(3):
+        save_session_photo(user_id, session_id, f"finalize_{session_id}_{i}")
+
+    statements = []
+    checkouts = get_pool_stats()["checkouts"]
+    with get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            lead, photos = finalize_lead(user_data, user_id, 'finalize', session_id)
+        finally:
+            conn.set_trace_callback(None)
+    checkouts = get_pool_stats()["checkouts"] - checkouts
+
+    # A repeated submission returns the same lead with the photos already attached
+    again, again_photos = finalize_lead(user_data, user_id, 'finalize', session_id)
+
+    begins = [sql for sql in statements if sql.strip().upper().startswith("BEGIN")]
+    if (
+        lead["plate_number"] == user_data["plate_number"]
+        and [p["file_id"] for p in photos] == [f"finalize_{session_id}_{i}" for i in range(3)]
+        and photos == get_lead_photos(lead["id"])
+        and again["id"] == lead["id"]
+        and len(again_photos) == 3
+        and checkouts == 1
+        and not begins
+    ):
+        print("✅ Atomic finalize_lead: PASSED")
+        return True
+    print(f"❌ Atomic finalize_lead: FAILED (checkouts={checkouts}, photos={photos})")
+    return False
+
+def test_lead_idempotent_per_session():
+    """Test concurrent saves of one conversation create exactly one lead"""
+    print("🔍 Testing session idempotency key...")
+    init_db()
+
+    import threading
+    session_id = uuid.uuid4().hex
+    user_data = {
+        'language': 'en',
+        'plate_number': 'IDEM01',
+        'owner_name': 'Idempotent',
+        'curb_weight': 1000,
+        'phone_number': '+372500700',
+    }
+
+    ids = []
+    threads = [
+        threading.Thread(target=lambda: ids.append(save_lead(user_data, 71717, 'idem', session_id)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Without a key every save is a new lead
+    plain = {save_lead(user_data, 71717, 'idem') for _ in range(2)}
+
+    if len(ids) == 8 and len(set(ids)) == 1 and len(plain) == 2:
+        print("✅ Session idempotency key: PASSED")
+        return True
+    print(f"❌ Session idempotency key: FAILED (ids={ids}, plain={plain})")
+    return False
+
+async def _submit_phone(user_data):
+    update = Mock()
+    update.effective_user = Mock(id=72727, username="redeliver")
+    update.message.text = "+372 5000 7272"
+    update.message.reply_text = AsyncMock()
+    context = Mock()
+    context.user_data = user_data
+    with patch.object(finalize.outbox, "kick", AsyncMock()):
+        state = await finalize.phone_number(update, context)
+    return state, update.message.reply_text.call_args.args[0]
+
+def test_phone_redelivery_after_move():
+    """Test a redelivered phone update returns to the session's lead instead of asking for photos"""
+    print("🔍 Testing phone number redelivery...")
+    session_id = uuid.uuid4().hex
+    user_data = {
+        'language': 'en',
+        'plate_number': 'REDEL1',
+        'owner_name': 'Redelivered',
+        'curb_weight': 1100,
+        'session_id': session_id,
+    }
+
+    with temporary_database():
+        for i in range(2):
+            save_session_photo(72727, session_id, f"redeliver_{session_id}_{i}")
+        # The conversation state is lost, so the same update runs again from the saved user_data
+        first = asyncio.run(_submit_phone(dict(user_data)))
+        second = asyncio.run(_submit_phone(dict(user_data)))
+        with get_db_connection() as conn:
+            leads = conn.execute("SELECT id FROM leads WHERE session_id = ?", (session_id,)).fetchall()
+            cards = conn.execute("SELECT COUNT(*) FROM outbox WHERE kind = 'lead_card'").fetchone()[0]
+        photos = get_lead_photos(leads[0][0]) if leads else []
+
+    print(f"First: {first}, second: {second}, leads: {len(leads)}, photos: {len(photos)}, cards: {cards}")
+    if (
+        first[0] == ConversationHandler.END and second == first and second[0] != PHOTOS
+        and len(leads) == 1 and len(photos) == 2 and cards == 1
+    ):
+        print("✅ Phone number redelivery: PASSED")
+        return True
+    print("❌ Phone number redelivery: FAILED")
+    return False
+
 def test_media_group_structure():
     """Test media group structure creation"""
     print("🔍 Testing media group structure...")
@@ -257,6 +389,9 @@ def main():
     tests = [
         test_lead_creation_and_notification,
         test_photo_storage_and_retrieval,
+        test_finalize_lead_single_transaction,
+        test_lead_idempotent_per_session,
+        test_phone_redelivery_after_move,
         test_media_group_structure,
         test_html_caption_formatting
     ]
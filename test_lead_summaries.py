@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Lead Summary Test
+Verifies that /leads rendering data comes from a single aggregated query
+"""
+
+import sys
+import os
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import models
+from database.models import init_db, get_db_connection
+from handlers.admin import _format_lead
+
+def test_summaries_single_statement():
+    """Test photo counts and latest offer are returned by one statement"""
+    print("🔍 Testing aggregated lead summaries...")
+    init_db()
+
+    user_id = 880088
+    session_id = uuid.uuid4().hex
+    for i in range(3):
+        models.save_session_photo(user_id, session_id, f"summary_{i}")
+    lead_id = models.save_lead(
+        {'plate_number': uuid.uuid4().hex[:6], 'owner_name': 'Summary', 'curb_weight': 1100, 'language': 'en'},
+        user_id,
+        'summary',
+    )
+    models.move_session_photos_to_lead(user_id, session_id, lead_id)
+    models.create_offer(lead_id, 150)
+    latest_offer_id = models.create_offer(lead_id, 175)
+    models.update_offer_status(latest_offer_id, "rejected")
+
+    statements = []
+    with get_db_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            summaries = models.get_lead_summaries(30)
+        finally:
+            conn.set_trace_callback(None)
+
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")]
+    lead = next((row for row in summaries if row["id"] == lead_id), None)
+    if lead is None:
+        print("❌ Aggregated lead summaries: FAILED (lead missing)")
+        return False
+
+    line = _format_lead(lead, compact=True)
+    print(f"Rendered: {line}")
+    if (
+        len(selects) == 1
+        and lead["photo_count"] == 3
+        and lead["offer_id"] == latest_offer_id
+        and lead["offer_status"] == "rejected"
+        and "(3📷)" in line
+    ):
+        print("✅ Aggregated lead summaries: PASSED")
+        return True
+    print(f"❌ Aggregated lead summaries: FAILED ({len(selects)} selects, {lead})")
+    return False
+
+def test_latest_leads_keyset():
+    """Test cursor, status and date filters of get_latest_leads"""
+    print("🔍 Testing keyset pagination of get_latest_leads...")
+    init_db()
+
+    ids = [
+        models.save_lead({'plate_number': f'KEY{i:03d}', 'owner_name': 'Keyset', 'curb_weight': 900, 'language': 'en'}, 8200 + i)
+        for i in range(6)
+    ]
+    models.update_lead_status(ids[1], "archived")
+    models.update_lead_status(ids[3], "archived")
+
+    newest = models.get_latest_leads(2, before_id=ids[-1] + 1)
+    older = models.get_latest_leads(2, before_id=newest[-1]["id"])
+    newer = models.get_latest_leads(2, after_id=older[0]["id"])
+    archived = models.get_latest_leads(10, before_id=ids[-1] + 1, after_id=ids[0] - 1, status="archived")
+    in_range = models.get_latest_leads(100, created_from="2000-01-01", created_to="2999-01-01")
+    out_of_range = models.get_latest_leads(10, created_from="2999-01-01")
+
+    checks = [
+        [r["id"] for r in newest] == [ids[5], ids[4]],
+        [r["id"] for r in older] == [ids[3], ids[2]],
+        [r["id"] for r in newer] == [ids[5], ids[4]],
+        [r["id"] for r in archived] == [ids[3], ids[1]],
+        all(i in {r["id"] for r in in_range} for i in ids[-1:]),
+        out_of_range == [],
+    ]
+    if all(checks):
+        print("✅ Keyset pagination: PASSED")
+        return True
+    print(f"❌ Keyset pagination: FAILED ({checks})")
+    return False
+
+def main():
+    """Run all lead summary tests"""
+    print("🚀 Starting Lead Summary Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_summaries_single_statement,
+        test_latest_leads_keyset,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Lead Browser Test
+Verifies that /leads renders one message and pages through leads in place
+"""
+
+import sys
+import os
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import Mock, AsyncMock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram import CallbackQuery, Chat, Message, User
+from telegram.ext import ExtBot
+from telegram.request import BaseRequest
+
+from database.models import init_db, save_lead
+from handlers.ratelimit import PriorityRateLimiter
+import handlers.admin as admin
+from testing_db import temporary_database
+
+ADMIN_ID = 424242
+
+def _ids_from_keyboard(markup):
+    ids = []
+    for row in markup.inline_keyboard:
+        data = row[0].callback_data or ""
+        if data.startswith("admin_reply:"):
+            ids.append(int(data.split(":", 1)[1]))
+    return ids
+
+def _nav_data(markup, label):
+    for row in markup.inline_keyboard:
+        for button in row:
+            if label in button.text:
+                return button.callback_data
+    return None
+
+async def _press(context, data, message_id):
+    update = Mock()
+    update.effective_user = Mock(id=ADMIN_ID)
+    q = Mock()
+    q.data = data
+    q.message = Mock(message_id=message_id)
+    q.answer = AsyncMock()
+    update.callback_query = q
+    await admin.leads_page_callback(update, context)
+    return context.bot.edit_message_text.call_args[1]
+
+async def run_browser():
+    admin.ADMIN_TELEGRAM_USER_ID = ADMIN_ID
+    for i in range(12):
+        save_lead({'plate_number': f'BRW{i:03d}', 'owner_name': 'Browser', 'curb_weight': 1000, 'language': 'ee'}, 9100 + i)
+
+    context = Mock()
+    context.chat_data = {}
+    context.args = ["5"]
+    context.bot.send_message = AsyncMock(return_value=Mock(message_id=77))
+    context.bot.edit_message_text = AsyncMock()
+    update = Mock()
+    update.effective_user = Mock(id=ADMIN_ID)
+    update.effective_chat = Mock(type="private")
+
+    await admin.leads_command(update, context)
+    first_markup = context.bot.send_message.call_args[1]["reply_markup"]
+    first_ids = _ids_from_keyboard(first_markup)
+
+    older = await _press(context, _nav_data(first_markup, "Vanemad"), 77)
+    older_ids = _ids_from_keyboard(older["reply_markup"])
+
+    newer = await _press(context, _nav_data(older["reply_markup"], "Uuemad"), 77)
+    newer_ids = _ids_from_keyboard(newer["reply_markup"])
+
+    return context.bot.send_message.call_count, first_ids, older_ids, newer_ids
+
+def test_paginated_browser():
+    """Test keyset paging through leads in a single message"""
+    print("🔍 Testing paginated lead browser...")
+    init_db()
+    sent, first_ids, older_ids, newer_ids = asyncio.run(run_browser())
+
+    print(f"First page: {first_ids}")
+    print(f"Older page: {older_ids}")
+    print(f"Back to newer: {newer_ids}")
+    if (
+        sent == 1
+        and len(first_ids) == 5
+        and len(older_ids) == 5
+        and max(older_ids) < min(first_ids)
+        and newer_ids == first_ids
+    ):
+        print("✅ Paginated lead browser: PASSED")
+        return True
+    print("❌ Paginated lead browser: FAILED")
+    return False
+
+class _RecordingRequest(BaseRequest):
+    """Answers every Bot API call with a message so ExtBot runs its real argument handling"""
+
+    def __init__(self):
+        self.calls = []
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def do_request(self, url, method, request_data=None, **timeouts):
+        self.calls.append(url.rsplit("/", 1)[-1])
+        message = {"message_id": 77, "date": 0, "chat": {"id": ADMIN_ID, "type": "private"}, "text": "ok"}
+        return 200, json.dumps({"ok": True, "result": message}).encode()
+
+async def run_real_bot(rate_limiter):
+    admin.ADMIN_TELEGRAM_USER_ID = ADMIN_ID
+    for i in range(7):
+        save_lead({'plate_number': f'RBT{i:03d}', 'owner_name': 'Real', 'curb_weight': 1000, 'language': 'ee'}, 9300 + i)
+
+    request = _RecordingRequest()
+    bot = ExtBot("123:TEST", request=request, rate_limiter=rate_limiter)
+    user = User(ADMIN_ID, "Admin", False)
+    chat = Chat(ADMIN_ID, Chat.PRIVATE)
+    command = Message(1, datetime.now(timezone.utc), chat, from_user=user, text="/leads 5")
+    command.set_bot(bot)
+
+    context = Mock()
+    context.bot = bot
+    context.chat_data = {}
+    context.args = ["5"]
+    update = Mock()
+    update.effective_user = user
+    update.effective_chat = chat
+    update.message = command
+    await admin.leads_command(update, context)
+
+    browser = Message(77, datetime.now(timezone.utc), chat, from_user=user, text="leads")
+    browser.set_bot(bot)
+    q = CallbackQuery("1", user, "instance", message=browser, data="leads_page:all:0")
+    q.set_bot(bot)
+    update.callback_query = q
+    await admin.leads_page_callback(update, context)
+    return request.calls, context.chat_data["leads_browser"]["message_id"]
+
+def test_real_bot_arguments():
+    """Test /leads and page flips go through ExtBot with and without a rate limiter"""
+    print("🔍 Testing lead browser against a real ExtBot...")
+    runs = {}
+    for name, rate_limiter in (("limited", PriorityRateLimiter()), ("unlimited", None)):
+        with temporary_database():
+            runs[name] = asyncio.run(run_real_bot(rate_limiter))
+
+    print(f"Bot API calls: {runs}")
+    expected = (["sendMessage", "answerCallbackQuery", "editMessageText"], 77)
+    if runs == {"limited": expected, "unlimited": expected}:
+        print("✅ Real ExtBot arguments: PASSED")
+        return True
+    print("❌ Real ExtBot arguments: FAILED")
+    return False
+
+def main():
+    """Run all lead browser tests"""
+    print("🚀 Starting Lead Browser Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_paginated_browser,
+        test_real_bot_arguments,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
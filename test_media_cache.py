@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Media Cache Test
+Verifies that static assets are uploaded once and then sent by file_id
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import uuid
+from unittest.mock import Mock, AsyncMock
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.error import BadRequest
+
+from database.models import init_db
+from handlers.media import MediaCache
+
+def _message(file_id):
+    message = Mock()
+    sent = Mock()
+    sent.photo = [Mock(file_id="small"), Mock(file_id=file_id)]
+    message.reply_photo = AsyncMock(return_value=sent)
+    return message
+
+async def run_cache(path):
+    cache = MediaCache()
+    first = _message("logo_v1")
+    await cache.reply_photo(first, path, caption="hi")
+    second = _message("unused")
+    await cache.reply_photo(second, path, caption="hi")
+
+    # A fresh process reuses the persisted file_id
+    restarted = MediaCache()
+    third = _message("unused")
+    await restarted.reply_photo(third, path)
+
+    # Changing the file invalidates the cached id
+    with open(path, "wb") as fh:
+        fh.write(uuid.uuid4().bytes * 12)
+    fourth = _message("logo_v2")
+    await restarted.reply_photo(fourth, path)
+
+    # A file_id Telegram no longer accepts falls back to an upload
+    rejected = _message("logo_v3")
+    rejected.reply_photo.side_effect = [BadRequest("Wrong file identifier"), rejected.reply_photo.return_value]
+    await restarted.reply_photo(rejected, path)
+
+    return [
+        first.reply_photo.call_args[1]["photo"],
+        second.reply_photo.call_args[1]["photo"],
+        third.reply_photo.call_args[1]["photo"],
+        fourth.reply_photo.call_args[1]["photo"],
+        rejected.reply_photo.call_args[1]["photo"],
+    ], restarted.stats()
+
+def test_upload_once():
+    """Test the logo is uploaded once per content hash and reused afterwards"""
+    print("🔍 Testing media file_id cache...")
+    init_db()
+    path = os.path.join(tempfile.mkdtemp(), "logo.jpg")
+    with open(path, "wb") as fh:
+        fh.write(uuid.uuid4().bytes * 10)
+
+    sent, stats = asyncio.run(run_cache(path))
+    print(f"Stats: {stats}")
+    uploaded = [not isinstance(photo, str) for photo in sent]
+    if (
+        uploaded == [True, False, False, True, True]
+        and sent[1] == "logo_v1"
+        and sent[2] == "logo_v1"
+        and stats == {"hits": 1, "uploads": 2, "stale": 1}
+    ):
+        print("✅ Media file_id cache: PASSED")
+        return True
+    print(f"❌ Media file_id cache: FAILED ({sent})")
+    return False
+
+def main():
+    """Run all media cache tests"""
+    print("🚀 Starting Media Cache Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_upload_once,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
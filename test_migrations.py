@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Schema Migration Test
+Verifies the user_version based migration runner on fresh and legacy databases
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.migrations import migrate, get_schema_version, LATEST_VERSION
+
+def _connect(path):
+    return sqlite3.connect(path, isolation_level=None)
+
+def test_fresh_database():
+    """Test that a fresh database is migrated to the latest version"""
+    print("🔍 Testing fresh database migration...")
+    conn = _connect(os.path.join(tempfile.mkdtemp(), "fresh.db"))
+    version = migrate(conn)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    conn.close()
+
+    expected = {"leads", "car_photos", "photos", "offers"}
+    if version == LATEST_VERSION and expected <= tables and "idx_leads_user_plate_phone" not in indexes:
+        print(f"✅ Fresh database migration: PASSED (version {version})")
+        return True
+    print(f"❌ Fresh database migration: FAILED (version {version}, tables {tables})")
+    return False
+
+def test_legacy_database():
+    """Test that a pre-migration database gets its missing columns without losing rows"""
+    print("🔍 Testing legacy database upgrade...")
+    conn = _connect(os.path.join(tempfile.mkdtemp(), "legacy.db"))
+    conn.execute('''
+        CREATE TABLE leads (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            telegram_username TEXT,
+            language TEXT NOT NULL,
+            plate_number TEXT NOT NULL,
+            owner_name TEXT NOT NULL,
+            curb_weight INTEGER NOT NULL,
+            completeness TEXT,
+            transport_method TEXT,
+            needs_tow BOOLEAN,
+            location_latitude REAL,
+            location_longitude REAL,
+            photos TEXT,
+            phone_number TEXT,
+            status TEXT DEFAULT 'pending',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    conn.execute(
+        "INSERT INTO leads (user_id, language, plate_number, owner_name, curb_weight) VALUES (1, 'ee', '123ABC', 'Old', 1000)"
+    )
+
+    migrate(conn)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(leads)")}
+    count = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+    conn.close()
+
+    if {"is_owner", "missing_parts", "tow_address"} <= columns and count == 1:
+        print("✅ Legacy database upgrade: PASSED")
+        return True
+    print(f"❌ Legacy database upgrade: FAILED (columns {columns}, rows {count})")
+    return False
+
+def test_fast_path():
+    """Test that a current schema costs a single pragma read"""
+    print("🔍 Testing migration fast path...")
+    conn = _connect(os.path.join(tempfile.mkdtemp(), "current.db"))
+    migrate(conn)
+
+    statements = []
+    conn.set_trace_callback(statements.append)
+    version = migrate(conn)
+    conn.set_trace_callback(None)
+    conn.close()
+
+    if version == LATEST_VERSION and statements == ["PRAGMA user_version"]:
+        print("✅ Migration fast path: PASSED")
+        return True
+    print(f"❌ Migration fast path: FAILED ({statements})")
+    return False
+
+def test_failed_migration_rolls_back():
+    """Test that a failing migration leaves the version and schema untouched"""
+    print("🔍 Testing failed migration rollback...")
+    from database import migrations
+
+    conn = _connect(os.path.join(tempfile.mkdtemp(), "broken.db"))
+    migrate(conn)
+    before = get_schema_version(conn)
+
+    broken = migrations.Migration(before + 1, "broken", [
+        "CREATE TABLE should_not_exist (id INTEGER)",
+        "THIS IS NOT SQL",
+    ])
+    original = list(migrations.MIGRATIONS), migrations.LATEST_VERSION
+    migrations.MIGRATIONS.append(broken)
+    migrations.LATEST_VERSION = broken.version
+    try:
+        migrations.migrate(conn)
+        raised = False
+    except sqlite3.Error:
+        raised = True
+    finally:
+        migrations.MIGRATIONS[:] = original[0]
+        migrations.LATEST_VERSION = original[1]
+
+    after = get_schema_version(conn)
+    leftover = conn.execute("SELECT name FROM sqlite_master WHERE name='should_not_exist'").fetchone()
+    conn.close()
+
+    if raised and after == before and leftover is None:
+        print("✅ Failed migration rollback: PASSED")
+        return True
+    print(f"❌ Failed migration rollback: FAILED (raised={raised}, version {before}->{after})")
+    return False
+
+def main():
+    """Run all migration tests"""
+    print("🚀 Starting Schema Migration Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_fresh_database,
+        test_legacy_database,
+        test_fast_path,
+        test_failed_migration_rolls_back,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Notification Outbox Test
+Verifies dedupe, retry backoff, RetryAfter handling and delivery after a restart
+"""
+
+import sys
+import os
+import asyncio
+import json
+import random
+import time
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError
+
+from database.models import get_db_connection, enqueue_notification, finalize_lead, save_session_photo
+from handlers import finalize
+from handlers.outbox import OutboxDispatcher
+from testing_db import temporary_database
+
+KIND = "outbox_test"
+
+def _outbox_rows():
+    with get_db_connection() as conn:
+        return [tuple(row) for row in conn.execute("SELECT dedupe_key, status, attempts FROM outbox ORDER BY id")]
+
+def _row(dedupe_key):
+    with get_db_connection() as conn:
+        return tuple(conn.execute(
+            "SELECT status, attempts, next_attempt_at FROM outbox WHERE dedupe_key = ?", (dedupe_key,)
+        ).fetchone())
+
+def _make_due(dedupe_key):
+    with get_db_connection() as conn:
+        conn.execute("UPDATE outbox SET next_attempt_at = 0 WHERE dedupe_key = ?", (dedupe_key,))
+
+async def run_retries(dedupe_key):
+    outcomes = [RetryAfter(30), NetworkError("connection reset"), None]
+    calls = []
+
+    async def flaky(context, payload):
+        calls.append(payload["n"])
+        outcome = outcomes[len(calls) - 1]
+        if outcome is not None:
+            raise outcome
+
+    dispatcher = OutboxDispatcher(base_delay=5, max_delay=60)
+    dispatcher.register(KIND, flaky)
+    context = Mock()
+
+    added = await dispatcher.notify(context, KIND, dedupe_key, {"n": 1})
+    duplicate = await dispatcher.notify(context, KIND, dedupe_key, {"n": 2})
+    after_rate_limit = _row(dedupe_key)
+
+    _make_due(dedupe_key)
+    await dispatcher.drain(context)
+    after_error = _row(dedupe_key)
+
+    _make_due(dedupe_key)
+    await dispatcher.drain(context)
+    return added, duplicate, after_rate_limit, after_error, _outbox_rows(), calls, dispatcher.stats()
+
+def test_retry_and_dedupe():
+    """Test RetryAfter postpones without counting, errors back off and the row is sent once"""
+    print("🔍 Testing outbox retries and dedupe...")
+    dedupe_key = f"{KIND}:{uuid.uuid4().hex}"
+    now = time.time()
+    with temporary_database():
+        added, duplicate, rate_limited, errored, rows, calls, stats = asyncio.run(run_retries(dedupe_key))
+
+    print(f"Rate limited: {rate_limited}, errored: {errored}, rows: {rows}, calls: {calls}")
+    print(f"Stats: {stats}")
+    if (
+        added and not duplicate
+        and rate_limited[0] == "pending" and rate_limited[1] == 0 and now + 29 <= rate_limited[2] <= now + 31
+        and errored[0] == "pending" and errored[1] == 1 and now + 4 <= errored[2] <= now + 6
+        and rows == [(dedupe_key, "sent", 2)] and calls == [1, 1, 1]
+        and stats == {"sent": 1, "retried": 1, "rate_limited": 1, "failed": 0, "deduplicated": 1,
+                      "send_ms_max": stats["send_ms_max"]}
+    ):
+        print("✅ Outbox retries and dedupe: PASSED")
+        return True
+    print("❌ Outbox retries and dedupe: FAILED")
+    return False
+
+def test_delivery_after_restart():
+    """Test a notification committed before a crash is sent by a fresh dispatcher"""
+    print("🔍 Testing outbox delivery after restart...")
+    dedupe_key = f"{KIND}:{uuid.uuid4().hex}"
+    delivered = []
+
+    async def sender(context, payload):
+        delivered.append(payload["n"])
+
+    with temporary_database():
+        enqueue_notification(KIND, dedupe_key, {"n": 7})
+        dispatcher = OutboxDispatcher()
+        dispatcher.register(KIND, sender)
+        asyncio.run(dispatcher.drain(Mock()))
+        rows = _outbox_rows()
+
+    print(f"Delivered: {delivered}, rows: {rows}")
+    if delivered == [7] and rows == [(dedupe_key, "sent", 1)]:
+        print("✅ Outbox delivery after restart: PASSED")
+        return True
+    print("❌ Outbox delivery after restart: FAILED")
+    return False
+
+def _finalize_for_card():
+    user_id = random.randint(10**9, 2 * 10**9)
+    session_id = uuid.uuid4().hex
+    for i in range(2):
+        save_session_photo(user_id, session_id, f"card_{session_id}_{i}")
+    user_data = {
+        "language": "en",
+        "plate_number": "777 CRD",
+        "owner_name": "Card Test",
+        "curb_weight": 1300,
+        "phone_number": "+37255555555",
+    }
+    lead, _ = finalize_lead(user_data, user_id, "cardtest", session_id)
+    with get_db_connection() as conn:
+        payload = json.loads(conn.execute(
+            "SELECT payload FROM outbox WHERE dedupe_key = ?", (f"lead_card:{lead['id']}",)
+        ).fetchone()[0])
+    return payload
+
+def test_lead_card_from_payload():
+    """Test the lead card is sent from the outbox payload without re-reading the lead"""
+    print("🔍 Testing lead card delivery from the payload...")
+    with temporary_database():
+        payload = _finalize_for_card()
+
+    context = Mock()
+    context.bot.send_media_group = AsyncMock()
+    context.bot.send_message = AsyncMock()
+    reads = AsyncMock(side_effect=AssertionError("lead re-read"))
+    with patch.object(finalize, "ADMIN_TELEGRAM_USER_ID", 42), \
+            patch.object(finalize, "get_lead_by_id", reads), patch.object(finalize, "get_lead_photos", reads):
+        asyncio.run(finalize.deliver_lead_card(context, payload))
+
+    media = context.bot.send_media_group.call_args.kwargs["media"]
+    caption = media[0].caption
+    phone_text = context.bot.send_message.call_args.kwargs["text"]
+    print(f"Media: {len(media)}, re-reads: {reads.await_count}, buttons: {phone_text!r}")
+    if (
+        len(media) == 2 and reads.await_count == 0
+        and "777 CRD" in caption and "Card Test" in caption and phone_text.endswith("+37255555555")
+    ):
+        print("✅ Lead card from payload: PASSED")
+        return True
+    print("❌ Lead card from payload: FAILED")
+    return False
+
+async def _send_card(payload, media_error):
+    context = Mock()
+    context.bot.send_media_group = AsyncMock(side_effect=media_error)
+    context.bot.send_message = AsyncMock()
+    try:
+        await finalize.deliver_lead_card(context, payload)
+    except TelegramError as exc:
+        return type(exc).__name__, context.bot.send_message.await_count
+    return None, context.bot.send_message.await_count
+
+def test_lead_card_media_errors():
+    """Test transient media group errors reach the outbox and only BadRequest falls back to text"""
+    print("🔍 Testing lead card media group errors...")
+    with temporary_database():
+        payload = _finalize_for_card()
+
+    outcomes = {}
+    with patch.object(finalize, "ADMIN_TELEGRAM_USER_ID", 42):
+        for error in (RetryAfter(5), NetworkError("connection reset"), BadRequest("Wrong file identifier")):
+            outcomes[type(error).__name__] = asyncio.run(_send_card(payload, error))
+
+    print(f"Outcomes: {outcomes}")
+    if outcomes == {
+        "RetryAfter": ("RetryAfter", 0),
+        "NetworkError": ("NetworkError", 0),
+        "BadRequest": (None, 2),
+    }:
+        print("✅ Lead card media errors: PASSED")
+        return True
+    print("❌ Lead card media errors: FAILED")
+    return False
+
+def main():
+    """Run all outbox tests"""
+    print("🚀 Starting Notification Outbox Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_retry_and_dedupe,
+        test_delivery_after_restart,
+        test_lead_card_from_payload,
+        test_lead_card_media_errors,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
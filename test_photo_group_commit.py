@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Photo Group Commit Test
+Verifies that a burst of session photos is committed in one transaction
+"""
+
+import sys
+import os
+import time
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import models
+from database.executor import get_executor
+from database.models import init_db, get_db_connection, save_session_photo, get_session_photos, get_photo_write_stats
+
+def _count_committed(user_id, session_id):
+    with get_db_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM car_photos WHERE user_id = ? AND session_id = ?",
+            (user_id, session_id),
+        ).fetchone()[0]
+
+def test_album_single_commit():
+    """Test that a 10-photo album costs one flush"""
+    print("🔍 Testing album group commit...")
+    init_db()
+    user_id = 990099
+    session_id = uuid.uuid4().hex
+    before = get_photo_write_stats()
+    jobs_before = get_executor().stats()["jobs"]
+
+    for i in range(10):
+        save_session_photo(user_id, session_id, f"album_{i}")
+    time.sleep(models._photo_buffer.window * 4)
+
+    after = get_photo_write_stats()
+    flushes = after["flushes"] - before["flushes"]
+    committed = _count_committed(user_id, session_id)
+    executor_jobs = get_executor().stats()["jobs"] - jobs_before
+    print(f"Flushes: {flushes}, committed rows: {committed}, executor jobs: {executor_jobs}")
+    if flushes == 1 and committed == 10 and after["pending"] == 0 and executor_jobs == 1:
+        print("✅ Album group commit: PASSED")
+        return True
+    print(f"❌ Album group commit: FAILED ({after})")
+    return False
+
+def test_flush_before_read():
+    """Test that reads see photos still waiting in the buffer"""
+    print("🔍 Testing flush-on-read guarantee...")
+    init_db()
+    user_id = 990100
+    session_id = uuid.uuid4().hex
+
+    for i in range(3):
+        save_session_photo(user_id, session_id, f"pending_{i}")
+    photos = get_session_photos(user_id, session_id)
+    save_session_photo(user_id, session_id, "pending_0")  # duplicate delivery
+    models.flush_session_photos()
+
+    if photos == ["pending_0", "pending_1", "pending_2"] and _count_committed(user_id, session_id) == 3:
+        print("✅ Flush-on-read guarantee: PASSED")
+        return True
+    print(f"❌ Flush-on-read guarantee: FAILED ({photos})")
+    return False
+
+def test_rollback_restores_rows():
+    """Test that photos flushed inside a rolled-back transaction stay buffered"""
+    print("🔍 Testing flush inside a rolled-back transaction...")
+    init_db()
+    user_id = 990101
+    session_id = uuid.uuid4().hex
+
+    for i in range(3):
+        save_session_photo(user_id, session_id, f"rollback_{i}")
+    try:
+        with get_db_connection() as conn:
+            models.flush_session_photos()
+            conn.execute("DELETE FROM car_photos WHERE user_id = ? AND session_id = ?", (user_id, session_id))
+            raise RuntimeError("finalize failed")
+    except RuntimeError:
+        pass
+    pending = get_photo_write_stats()["pending"]
+    photos = get_session_photos(user_id, session_id)
+
+    print(f"Pending after rollback: {pending}, photos: {photos}")
+    if pending >= 3 and photos == ["rollback_0", "rollback_1", "rollback_2"]:
+        print("✅ Rollback keeps photos buffered: PASSED")
+        return True
+    print("❌ Rollback keeps photos buffered: FAILED")
+    return False
+
+def test_sibling_rollback_keeps_flush():
+    """Test a failing savepoint does not re-queue photos flushed by a sibling that succeeded"""
+    print("🔍 Testing flush next to a failing sibling savepoint...")
+    init_db()
+    user_id = 990102
+    session_id = uuid.uuid4().hex
+    before = get_photo_write_stats()
+
+    save_session_photo(user_id, session_id, "sibling_0")
+    # Same shape as an executor batch: [flush job, failing job]
+    with get_db_connection():
+        with get_db_connection():
+            models.flush_session_photos()
+        try:
+            with get_db_connection() as conn:
+                conn.execute("SELECT 1")
+                raise RuntimeError("failing job")
+        except RuntimeError:
+            pass
+    after = get_photo_write_stats()
+    committed = _count_committed(user_id, session_id)
+
+    print(f"Committed: {committed}, pending: {after['pending']}, restored: {after['restored'] - before['restored']}")
+    if committed == 1 and after["pending"] == 0 and after["restored"] == before["restored"]:
+        print("✅ Sibling savepoint rollback: PASSED")
+        return True
+    print("❌ Sibling savepoint rollback: FAILED")
+    return False
+
+def main():
+    """Run all photo group commit tests"""
+    print("🚀 Starting Photo Group Commit Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_album_single_commit,
+        test_flush_before_read,
+        test_rollback_restores_rows,
+        test_sibling_rollback_keeps_flush,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Outbound Rate Limiter Test
+Verifies priority ordering, per-chat throttling and RetryAfter handling
+"""
+
+import sys
+import os
+import asyncio
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram.error import RetryAfter
+
+from handlers.ratelimit import PriorityRateLimiter, PRIORITY_ADMIN, PRIORITY_BULK
+
+async def _send(limiter, order, label, chat_id, priority=None):
+    async def callback(endpoint, data):
+        order.append(label)
+        return True
+    data = {"chat_id": chat_id, "text": label}
+    return await limiter.process_request(callback, ("sendMessage", data), {}, "sendMessage", data, priority)
+
+async def run_priorities():
+    limiter = PriorityRateLimiter(overall_rate=4, chat_rate=100, chat_burst=100, admin_chat_id=999)
+    order = []
+    # Use up the global burst, then queue bulk, admin and customer messages
+    await asyncio.gather(*(_send(limiter, order, f"warmup{i}", 1000 + i) for i in range(4)))
+    tasks = [asyncio.create_task(_send(limiter, order, f"bulk{i}", 999, PRIORITY_BULK)) for i in range(2)]
+    tasks.append(asyncio.create_task(_send(limiter, order, "admin", 999)))
+    tasks += [asyncio.create_task(_send(limiter, order, f"customer{i}", 2000 + i)) for i in range(2)]
+    await asyncio.gather(*tasks)
+    return order[4:], limiter.stats()
+
+def test_priority_order():
+    """Test customer replies go before admin cards, which go before bulk listings"""
+    print("🔍 Testing priority classes...")
+    order, stats = asyncio.run(run_priorities())
+
+    print(f"Order: {order}")
+    print(f"Queue: {stats['queue']}")
+    if order == ["customer0", "customer1", "admin", "bulk0", "bulk1"] and stats["bulk"]["sent"] == 2:
+        print("✅ Priority classes: PASSED")
+        return True
+    print("❌ Priority classes: FAILED")
+    return False
+
+async def run_per_chat():
+    limiter = PriorityRateLimiter(overall_rate=100, chat_rate=10, chat_burst=1)
+    order = []
+    started = time.monotonic()
+    busy = [asyncio.create_task(_send(limiter, order, f"busy{i}", 1, PRIORITY_ADMIN)) for i in range(4)]
+    await asyncio.sleep(0)
+    other_started = time.monotonic()
+    await _send(limiter, order, "other", 2)
+    other_elapsed = time.monotonic() - other_started
+    await asyncio.gather(*busy)
+    return time.monotonic() - started, other_elapsed
+
+def test_per_chat_bucket():
+    """Test one busy chat is spread out without holding up other chats"""
+    print("🔍 Testing per-chat bucket...")
+    busy_elapsed, other_elapsed = asyncio.run(run_per_chat())
+
+    print(f"Busy chat: {busy_elapsed * 1000:.0f} ms for 4 messages, other chat waited {other_elapsed * 1000:.0f} ms")
+    if busy_elapsed >= 0.28 and other_elapsed < 0.05:
+        print("✅ Per-chat bucket: PASSED")
+        return True
+    print("❌ Per-chat bucket: FAILED")
+    return False
+
+async def run_retry_after():
+    limiter = PriorityRateLimiter(max_retries=1)
+    calls = []
+
+    async def callback(endpoint, data):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            raise RetryAfter(1)
+        return True
+
+    data = {"chat_id": 1, "text": "hi"}
+    result = await limiter.process_request(callback, ("sendMessage", data), {}, "sendMessage", data, None)
+    unthrottled = await limiter.process_request(callback, ("answerCallbackQuery", {}), {}, "answerCallbackQuery", {}, None)
+    return result, unthrottled, calls, limiter.stats()
+
+def test_retry_after():
+    """Test RetryAfter pauses sending and the request is retried"""
+    print("🔍 Testing RetryAfter handling...")
+    result, unthrottled, calls, stats = asyncio.run(run_retry_after())
+    gap = calls[1] - calls[0] if len(calls) > 1 else 0
+
+    print(f"Calls: {len(calls)}, retry gap: {gap:.2f}s, queue: {stats['queue']}")
+    if result is True and unthrottled is True and len(calls) == 3 and gap >= 0.95 and stats["queue"]["retry_after"] == 1:
+        print("✅ RetryAfter handling: PASSED")
+        return True
+    print("❌ RetryAfter handling: FAILED")
+    return False
+
+def main():
+    """Run all rate limiter tests"""
+    print("🚀 Starting Outbound Rate Limiter Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_priority_order,
+        test_per_chat_bucket,
+        test_retry_after,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
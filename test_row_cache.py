@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Row Cache Test
+Verifies the read-through lead/offer cache, its invalidation and its bounds
+"""
+
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database import models
+from database.cache import RowCache
+from database.models import init_db, get_db_connection, get_cache_stats
+
+def _lead(plate):
+    return {'plate_number': plate, 'owner_name': 'Cache', 'curb_weight': 1000, 'language': 'en'}
+
+def test_read_through_and_invalidation():
+    """Test repeated lookups hit the cache and writes invalidate it"""
+    print("🔍 Testing read-through cache...")
+    init_db()
+
+    lead_id = models.save_lead(_lead('CACHE1'), 6060)
+    offer_id = models.create_offer(lead_id, 120)
+
+    before = get_cache_stats()
+    for _ in range(5):
+        models.get_lead_by_id(lead_id)
+        models.get_offer_by_id(offer_id)
+    after = get_cache_stats()
+    lead_hits = after["leads"]["hits"] - before["leads"]["hits"]
+    offer_hits = after["offers"]["hits"] - before["offers"]["hits"]
+
+    models.update_offer_status(offer_id, "accepted")
+    status_after_update = models.get_offer_by_id(offer_id)["status"]
+
+    models.delete_lead_by_id(lead_id)
+    gone = models.get_lead_by_id(lead_id) is None and models.get_offer_by_id(offer_id) is None
+
+    print(f"Cache stats: {get_cache_stats()}")
+    if lead_hits == 4 and offer_hits == 4 and status_after_update == "accepted" and gone:
+        print("✅ Read-through cache: PASSED")
+        return True
+    print(f"❌ Read-through cache: FAILED (lead_hits={lead_hits}, offer_hits={offer_hits})")
+    return False
+
+def test_rollback_does_not_poison_cache():
+    """Test rows written by a rolled back transaction never reach the cache"""
+    print("🔍 Testing cache under rollback...")
+    init_db()
+
+    lead_id = models.save_lead(_lead('CACHE2'), 6061)
+    offer_id = models.create_offer(lead_id, 90)
+    models.get_offer_by_id(offer_id)
+
+    phantom_id = None
+    try:
+        with get_db_connection():
+            models.update_offer_status(offer_id, "rejected")
+            models.get_offer_by_id(offer_id)
+            phantom_id = models.save_lead(_lead('CACHE3'), 6062)
+            models.get_lead_by_id(phantom_id)
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    status = models.get_offer_by_id(offer_id)["status"]
+    phantom = models.get_lead_by_id(phantom_id)
+    if status == "sent" and phantom is None:
+        print("✅ Cache under rollback: PASSED")
+        return True
+    print(f"❌ Cache under rollback: FAILED (status={status}, phantom={phantom})")
+    return False
+
+def test_lru_and_ttl_bounds():
+    """Test the cache evicts least recently used rows and expires old ones"""
+    print("🔍 Testing cache bounds...")
+    cache = RowCache(maxsize=2, ttl=0.05)
+    cache.put(1, {"id": 1})
+    cache.put(2, {"id": 2})
+    cache.get(1)
+    cache.put(3, {"id": 3})
+    evicted = cache.get(2) is None and cache.get(1) is not None
+
+    time.sleep(0.06)
+    expired = cache.get(3) is None
+
+    stats = cache.stats()
+    if evicted and expired and stats["evictions"] == 1 and stats["expired"] == 1:
+        print("✅ Cache bounds: PASSED")
+        return True
+    print(f"❌ Cache bounds: FAILED ({stats})")
+    return False
+
+def main():
+    """Run all row cache tests"""
+    print("🚀 Starting Row Cache Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_read_through_and_invalidation,
+        test_rollback_does_not_poison_cache,
+        test_lru_and_ttl_bounds,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+SQLite Persistence Test
+Verifies per-record bot persistence, dirty-only writes and the pickle import
+"""
+
+import sys
+import os
+import asyncio
+import pickle
+import tempfile
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.models import init_db, get_persistence_rows
+from database.persistence import SQLitePersistence, import_pickle_persistence
+
+async def run_round_trip(name):
+    persistence = SQLitePersistence()
+    await asyncio.gather(
+        persistence.update_user_data(101, {"language": "ee"}),
+        persistence.update_user_data(102, {"language": "en"}),
+        persistence.update_chat_data(101, {"awaiting_price_lead_id": "5"}),
+        persistence.update_conversation(name, (101, 101), 3),
+    )
+    # Unchanged records are not written again
+    await persistence.update_user_data(101, {"language": "ee"})
+    await persistence.update_user_data(102, {"language": "ru"})
+    await persistence.drop_chat_data(101)
+    await persistence.update_conversation(name, (101, 101), None)
+    writer_stats = persistence.stats()
+
+    reloaded = SQLitePersistence()
+    user_data = await reloaded.get_user_data()
+    chat_data = await reloaded.get_chat_data()
+    conversations = await reloaded.get_conversations(name)
+    return writer_stats, user_data, chat_data, conversations
+
+def test_round_trip_and_dirty_writes():
+    """Test records survive a reload and only changed records are written"""
+    print("🔍 Testing SQLite persistence round trip...")
+    init_db()
+    name = f"conv_{uuid.uuid4().hex[:8]}"
+    stats, user_data, chat_data, conversations = asyncio.run(run_round_trip(name))
+
+    print(f"Stats: {stats}")
+    if (
+        user_data.get(101) == {"language": "ee"}
+        and user_data.get(102) == {"language": "ru"}
+        and 101 not in chat_data
+        and conversations == {}
+        and stats["written"] == 5
+        and stats["unchanged"] == 1
+        and stats["deleted"] == 2
+    ):
+        print("✅ SQLite persistence round trip: PASSED")
+        return True
+    print(f"❌ SQLite persistence round trip: FAILED ({user_data}, {chat_data}, {conversations})")
+    return False
+
+def test_pickle_import():
+    """Test a legacy PicklePersistence file is imported once"""
+    print("🔍 Testing PicklePersistence import...")
+    init_db()
+    path = os.path.join(tempfile.mkdtemp(), "bot_data.pkl")
+    name = f"conv_{uuid.uuid4().hex[:8]}"
+    with open(path, "wb") as fh:
+        pickle.dump({
+            "user_data": {201: {"language": "ru"}},
+            "chat_data": {},
+            "bot_data": {},
+            "callback_data": None,
+            "conversations": {name: {(201, 201): 7}},
+        }, fh)
+
+    # Only imports into an empty table, which the other tests may have filled
+    imported = import_pickle_persistence(path)
+    if imported == 0:
+        print("✅ PicklePersistence import: SKIPPED (table not empty)")
+        return True
+
+    rows = get_persistence_rows(f"conversation:{name}")
+    if imported == 2 and list(rows) == ["[201, 201]"] and os.path.exists(path + ".migrated"):
+        print("✅ PicklePersistence import: PASSED")
+        return True
+    print(f"❌ PicklePersistence import: FAILED (imported={imported}, rows={rows})")
+    return False
+
+def main():
+    """Run all SQLite persistence tests"""
+    print("🚀 Starting SQLite Persistence Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_pickle_import,
+        test_round_trip_and_dirty_writes,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
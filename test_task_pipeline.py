@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Task Pipeline Test
+Verifies that the customer is answered before the admin lead card is sent
+and that background task failures are counted, not raised
+"""
+
+import sys
+import os
+import asyncio
+import random
+import uuid
+from unittest.mock import AsyncMock, Mock, patch
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.models import save_session_photo, get_db_connection
+from handlers import finalize, outbox
+from handlers.catalog import catalog
+from handlers.outbox import OutboxDispatcher
+from handlers.tasks import TaskPipeline
+from testing_db import temporary_database
+
+async def run_finalize_flow():
+    events = []
+    pipeline = TaskPipeline(workers=2, maxsize=10)
+    await pipeline.start()
+
+    async def slow_lead_card(context, payload):
+        await asyncio.sleep(0.2)
+        events.append(("lead_card", payload["lead_id"]))
+
+    async def reply_text(text, **kwargs):
+        events.append(("reply", text))
+
+    user_id = random.randint(10**9, 2 * 10**9)
+    session_id = uuid.uuid4().hex
+    save_session_photo(user_id, session_id, f"file_{session_id}")
+
+    update = Mock()
+    update.effective_user = Mock(id=user_id, username="pipeline_test")
+    update.message.text = "+37251234567"
+    update.message.reply_text = AsyncMock(side_effect=reply_text)
+    context = Mock()
+    context.user_data = {
+        "language": "en",
+        "session_id": session_id,
+        "plate_number": "123 ABC",
+        "owner_name": "Pipeline Test",
+        "curb_weight": 1200,
+    }
+
+    dispatcher = OutboxDispatcher()
+    dispatcher.register("lead_card", slow_lead_card)
+    with patch.object(outbox, "task_pipeline", pipeline), patch.object(finalize, "outbox", dispatcher):
+        await finalize.phone_number(update, context)
+        answered_first = [e[0] for e in events] == ["reply"]
+        await pipeline.stop()
+    with get_db_connection() as conn:
+        lead_id = conn.execute("SELECT id FROM leads WHERE session_id = ?", (session_id,)).fetchone()[0]
+    return answered_first, events, lead_id, pipeline.stats()
+
+def test_reply_before_lead_card():
+    """Test phone_number replies to the user before the lead card is sent"""
+    print("🔍 Testing reply ordering...")
+    with temporary_database():
+        answered_first, events, lead_id, stats = asyncio.run(run_finalize_flow())
+
+    expected = [("reply", catalog.text("lead_thanks", "en")), ("lead_card", lead_id)]
+    print(f"Events: {events}, stats: {stats.get('outbox')}")
+    if answered_first and events == expected and stats["outbox"]["completed"] == 1:
+        print("✅ Reply ordering: PASSED")
+        return True
+    print("❌ Reply ordering: FAILED")
+    return False
+
+async def run_failures():
+    pipeline = TaskPipeline(workers=1, maxsize=2)
+    await pipeline.start()
+    done = []
+
+    async def ok(i):
+        await asyncio.sleep(0.01)
+        done.append(i)
+
+    async def broken():
+        raise RuntimeError("admin chat unreachable")
+
+    for i in range(5):
+        await pipeline.submit("ok", ok, i)
+    await pipeline.submit("broken", broken)
+    await pipeline.stop()
+    return done, pipeline.stats()
+
+def test_failures_and_drain():
+    """Test failures are counted and stop() drains the bounded queue"""
+    print("🔍 Testing failure metrics and drain...")
+    done, stats = asyncio.run(run_failures())
+
+    print(f"Done: {done}, stats: {stats}")
+    if done == [0, 1, 2, 3, 4] and stats["ok"]["completed"] == 5 and stats["broken"]["failed"] == 1:
+        print("✅ Failure metrics and drain: PASSED")
+        return True
+    print("❌ Failure metrics and drain: FAILED")
+    return False
+
+def main():
+    """Run all task pipeline tests"""
+    print("🚀 Starting Task Pipeline Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_reply_before_lead_card,
+        test_failures_and_drain,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
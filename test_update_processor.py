@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Update Processor Load Test
+Verifies per-chat ordering under concurrency and measures throughput against sequential processing
+"""
+
+import sys
+import os
+import asyncio
+import random
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from telegram import Chat, Message, Update, User
+from telegram.ext import SimpleUpdateProcessor
+
+from handlers.updates import ChatOrderedUpdateProcessor
+
+CHATS = 40
+UPDATES_PER_CHAT = 5
+HANDLER_SECONDS = 0.02
+
+def _make_updates():
+    updates = []
+    update_id = 0
+    for seq in range(UPDATES_PER_CHAT):
+        for chat_id in range(1, CHATS + 1):
+            update_id += 1
+            user = User(id=chat_id, first_name="Load", is_bot=False)
+            message = Message(
+                message_id=seq,
+                date=datetime.now(),
+                chat=Chat(id=chat_id, type=Chat.PRIVATE),
+                from_user=user,
+                text=str(seq),
+            )
+            updates.append(Update(update_id, message=message))
+    return updates
+
+async def run_load(processor):
+    """Feed updates the way Application does: one task per update"""
+    seen = {}
+    in_flight = set()
+    overlaps = []
+
+    async def handle(update):
+        chat_id = update.effective_chat.id
+        if chat_id in in_flight:
+            overlaps.append(chat_id)
+        in_flight.add(chat_id)
+        # Jitter so a later update of the same chat would overtake an earlier one if unordered
+        await asyncio.sleep(HANDLER_SECONDS * random.uniform(0.5, 1.5))
+        seen.setdefault(chat_id, []).append(int(update.message.text))
+        in_flight.discard(chat_id)
+
+    await processor.initialize()
+    started = time.perf_counter()
+    await asyncio.gather(*(processor.process_update(u, handle(u)) for u in _make_updates()))
+    elapsed = time.perf_counter() - started
+    await processor.shutdown()
+
+    ordered = all(seq == list(range(UPDATES_PER_CHAT)) for seq in seen.values()) and len(seen) == CHATS
+    return elapsed, ordered, overlaps
+
+def test_per_chat_ordering_and_throughput():
+    """Test chats are processed concurrently, each in order, and faster than sequentially"""
+    print("🔍 Testing update processor under load...")
+    total = CHATS * UPDATES_PER_CHAT
+
+    sequential, seq_ordered, _ = asyncio.run(run_load(SimpleUpdateProcessor(1)))
+    print(f"Sequential:   {total} updates in {sequential * 1000:.0f} ms ({total / sequential:.0f} updates/s)")
+
+    results = {}
+    processor = None
+    for limit in (4, 16):
+        processor = ChatOrderedUpdateProcessor(limit, max_pending=total)
+        elapsed, ordered, overlaps = asyncio.run(run_load(processor))
+        results[limit] = (elapsed, ordered, overlaps)
+        print(f"Concurrent {limit:>2}: {total} updates in {elapsed * 1000:.0f} ms "
+              f"({total / elapsed:.0f} updates/s, x{sequential / elapsed:.1f}), ordered={ordered}, overlaps={len(overlaps)}")
+
+    stats = processor.stats()
+    print(f"Stats: {stats}")
+    ok = (
+        seq_ordered
+        and all(ordered and not overlaps for _, ordered, overlaps in results.values())
+        and sequential / results[4][0] > 2.5
+        and results[4][0] / results[16][0] > 2.0
+        and stats["running_max"] <= 16
+        and stats["processed"] == total
+    )
+    if ok:
+        print("✅ Update processor load test: PASSED")
+        return True
+    print("❌ Update processor load test: FAILED")
+    return False
+
+def main():
+    """Run all update processor tests"""
+    print("🚀 Starting Update Processor Load Tests...")
+    print("=" * 60)
+
+    tests = [
+        test_per_chat_ordering_and_throughput,
+    ]
+
+    results = []
+    for test in tests:
+        results.append(test())
+        print()
+
+    print("=" * 60)
+    passed = sum(results)
+    total = len(results)
+    print(f"📊 RESULTS: {passed}/{total} tests passed")
+    return passed == total
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
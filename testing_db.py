@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for tests that need their own database
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from database import models
+
+@contextmanager
+def temporary_database():
+    """Point database/models.py at a throwaway database file for one test"""
+    models.flush_session_photos()
+    models.close_pool()
+    path = os.path.join(tempfile.mkdtemp(), "test.db")
+    try:
+        with patch.object(models, "DATABASE_PATH", path):
+            models.init_db()
+            yield path
+            models.flush_session_photos()
+    finally:
+        models.close_pool()
+        models._lead_cache.clear()
+        models._offer_cache.clear()